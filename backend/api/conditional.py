@@ -0,0 +1,109 @@
+"""
+Conditional GET (ETag / Last-Modified) for frequently polled endpoints.
+
+Views describe a response by a cheap version stamp instead of its body: row
+counts and max(updated_at) from one aggregate query, plus database counters
+for related data without its own timestamp (e.g. player names). When the
+client's validator still matches, a bare 304 is returned before anything is
+serialized.
+"""
+
+import hashlib
+
+from django.db.models import Count, F, Max, Sum
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+
+from .models import VersionCounter
+
+# Counters bumped by writes that change serialized output without touching
+# updated_at on the listed rows
+PLAYERS = 'players'          # player names (availability, lineups)
+TEAM_CONFIG = 'team_config'  # teams, seasons, team-seasons and match formats
+
+
+def bump_version(namespace):
+    """Atomically increments a namespace counter (as part of the current transaction, if any)"""
+    VersionCounter.objects.get_or_create(namespace=namespace)
+    VersionCounter.objects.filter(namespace=namespace).update(version=F('version') + 1)
+
+
+def namespace_versions(*namespaces):
+    """Current counters for several namespaces in one query (0 if never bumped)"""
+    versions = dict(VersionCounter.objects.filter(namespace__in=namespaces).values_list('namespace', 'version'))
+    return tuple(versions.get(namespace, 0) for namespace in namespaces)
+
+
+def namespace_version(namespace):
+    return namespace_versions(namespace)[0]
+
+
+def queryset_stamp(queryset, field='updated_at'):
+    """
+    (row count, id sum, latest `field`) for a queryset in one aggregate query.
+    Count and id sum catch deletions that leave the latest timestamp unchanged.
+    """
+    stamp = queryset.order_by().aggregate(count=Count('pk'), ids=Sum('pk'), latest=Max(field))
+    return stamp['count'], stamp['ids'], stamp['latest']
+
+
+class ResourceVersion:
+    """
+    Validators for one response. `parts` is anything that changes when the
+    payload does; the user and full path (query string included) are mixed in
+    so per-user or ?fields= variants never share an ETag.
+    """
+
+    def __init__(self, request, *parts, last_modified=None):
+        key = repr((request.user.pk, request.get_full_path(), parts))
+        self.etag = quote_etag(hashlib.sha256(key.encode('utf-8')).hexdigest()[:32])
+        self.last_modified = last_modified
+
+    def is_fresh(self, request):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or self.etag in tags or f"W/{self.etag}" in tags
+
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+        if if_modified_since is not None and self.last_modified is not None:
+            # Coarser than the ETag (misses deletions), so only used on its own
+            return int(self.last_modified.timestamp()) <= if_modified_since
+        return False
+
+    def apply(self, response):
+        response['ETag'] = self.etag
+        if self.last_modified is not None:
+            response['Last-Modified'] = http_date(self.last_modified.timestamp())
+        # Let the browser keep the body but revalidate every time
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Cookie'])
+        return response
+
+    def not_modified(self):
+        return self.apply(Response(status=304))
+
+
+class BumpsVersionMixin:
+    """ModelViewSet mixin: bumps `version_namespace` after every write"""
+    version_namespace = None
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        bump_version(self.version_namespace)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_version(self.version_namespace)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        bump_version(self.version_namespace)
+
+
+def latest(*timestamps):
+    """Most recent of several optional timestamps"""
+    present = [ts for ts in timestamps if ts is not None]
+    return max(present) if present else None
@@ -0,0 +1,27 @@
+# Generated by Django 6.1.2 on 2026-10-17 06:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_match_featured_label_match_team_sheet_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetRangeDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('range_key', models.CharField(max_length=150)),
+                ('digest', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team_season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sheet_digests', to='api.teamseason')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('team_season', 'range_key'), name='unique_sheet_range_digest')],
+            },
+        ),
+    ]
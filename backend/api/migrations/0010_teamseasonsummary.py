@@ -0,0 +1,39 @@
+# Generated by Django 6.1.2 on 2026-10-17 06:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_syncjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamSeasonSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.IntegerField(default=0)),
+                ('won', models.IntegerField(default=0)),
+                ('lost', models.IntegerField(default=0)),
+                ('drawn', models.IntegerField(default=0)),
+                ('points_for', models.IntegerField(default=0)),
+                ('points_against', models.IntegerField(default=0)),
+                ('tries_for', models.IntegerField(default=0)),
+                ('tries_against', models.IntegerField(default=0)),
+                ('cons_for', models.IntegerField(default=0)),
+                ('cons_against', models.IntegerField(default=0)),
+                ('pens_for', models.IntegerField(default=0)),
+                ('pens_against', models.IntegerField(default=0)),
+                ('drop_for', models.IntegerField(default=0)),
+                ('drop_against', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team_season', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='api.teamseason')),
+            ],
+            options={
+                'verbose_name_plural': 'Team season summaries',
+            },
+        ),
+    ]
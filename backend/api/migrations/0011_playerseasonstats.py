@@ -0,0 +1,37 @@
+# Generated by Django 6.1.2 on 2026-10-17 06:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_teamseasonsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('appearances', models.IntegerField(default=0)),
+                ('starts', models.IntegerField(default=0)),
+                ('finishes', models.IntegerField(default=0)),
+                ('availability_responses', models.IntegerField(default=0)),
+                ('available', models.IntegerField(default=0)),
+                ('tries', models.IntegerField(default=0)),
+                ('cons', models.IntegerField(default=0)),
+                ('pens', models.IntegerField(default=0)),
+                ('drops', models.IntegerField(default=0)),
+                ('kicks_attempts', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='api.player')),
+                ('team_season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='api.teamseason')),
+            ],
+            options={
+                'verbose_name_plural': 'Player season stats',
+                'constraints': [models.UniqueConstraint(fields=('player', 'team_season'), name='unique_player_season_stats')],
+            },
+        ),
+    ]
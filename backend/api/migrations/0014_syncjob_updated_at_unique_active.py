@@ -0,0 +1,37 @@
+# Generated by Django 6.1.2 on 2026-10-17 07:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fail_duplicate_active_jobs(apps, schema_editor):
+    """Keeps the oldest queued/running job per TeamSeason so the constraint can be added"""
+    SyncJob = apps.get_model('api', 'SyncJob')
+    seen = set()
+    duplicates = []
+    for job_id, team_season_id in SyncJob.objects.filter(status__in=['queued', 'running']).order_by('id').values_list('id', 'team_season_id'):
+        if team_season_id in seen:
+            duplicates.append(job_id)
+        seen.add(team_season_id)
+    SyncJob.objects.filter(id__in=duplicates).update(status='failed', error='Superseded by an earlier job')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_versioncounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncjob',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(fail_duplicate_active_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='syncjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('team_season',), name='unique_active_sync_job'),
+        ),
+    ]
@@ -1,7 +1,22 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+
+def bulk_update_touched(model, objs, fields):
+    """
+    bulk_update() for models with an auto_now `updated_at`, which bulk writes
+    skip: stamps it on every object and adds it to the written fields, so
+    conditional GETs keyed on updated_at see the change.
+    """
+    objs = list(objs)
+    if not objs:
+        return 0
+    now = timezone.now()
+    for obj in objs:
+        obj.updated_at = now
+    return model.objects.bulk_update(objs, [*fields, 'updated_at'])
+
 class Team(models.Model):
     """Represents a rugby team category (e.g. U15s, Men's 1st XV)"""
     name = models.CharField(max_length=100)
@@ -50,6 +65,82 @@ class Season(models.Model):
     def __str__(self):
         return self.name
 
+# Season stats keys, in the order they are reported by the API
+SEASON_STAT_FIELDS = [
+    'played', 'won', 'lost', 'drawn',
+    'points_for', 'points_against',
+    'tries_for', 'tries_against',
+    'cons_for', 'cons_against',
+    'pens_for', 'pens_against',
+    'drop_for', 'drop_against',
+]
+
+class TeamSeasonQuerySet(models.QuerySet):
+    def with_stats(self):
+        """
+        Annotates each TeamSeason with its season stats (`stat_<name>` for every
+        SEASON_STAT_FIELDS entry), computed from its matches in a single query.
+        Only non-cancelled matches with a result count as played; "for" and
+        "against" follow the match's home/away side (blank counts as Home).
+        Must agree with Match.stat_contribution(), which TeamSeasonSummary
+        uses for incremental updates.
+        """
+        from django.db.models import Case, Count, F, Q, Sum, When
+        from django.db.models.functions import Coalesce
+
+        played = Q(matches__is_cancelled=False, matches__result__isnull=False) & ~Q(matches__result='')
+        is_home = (
+            Q(matches__home_away__isnull=True) | Q(matches__home_away='') |
+            Q(matches__home_away__iexact='home') | Q(matches__home_away__iexact='h')
+        )
+
+        def side_sum(home_field, away_field):
+            # Sum of home_field when we are Home, away_field when we are Away
+            return Coalesce(Sum(
+                Case(
+                    When(is_home, then=Coalesce(F(f'matches__{home_field}'), 0)),
+                    default=Coalesce(F(f'matches__{away_field}'), 0),
+                ),
+                filter=played,
+            ), 0)
+
+        return self.annotate(
+            stat_played=Count('matches', filter=played),
+            stat_won=Count('matches', filter=played & Q(matches__result='W')),
+            stat_lost=Count('matches', filter=played & Q(matches__result='L')),
+            stat_drawn=Count('matches', filter=played & Q(matches__result='D')),
+            stat_points_for=side_sum('result_home_score', 'result_away_score'),
+            stat_points_against=side_sum('result_away_score', 'result_home_score'),
+            stat_tries_for=side_sum('home_tries', 'away_tries'),
+            stat_tries_against=side_sum('away_tries', 'home_tries'),
+            stat_cons_for=side_sum('home_cons', 'away_cons'),
+            stat_cons_against=side_sum('away_cons', 'home_cons'),
+            stat_pens_for=side_sum('home_pens', 'away_pens'),
+            stat_pens_against=side_sum('away_pens', 'home_pens'),
+            stat_drop_for=side_sum('home_drop_goals', 'away_drop_goals'),
+            stat_drop_against=side_sum('away_drop_goals', 'home_drop_goals'),
+        )
+
+    def with_next_fixture(self):
+        """Annotates `next_fixture` ({id, name, date, kickoff_time, location} or None)"""
+        from django.db.models import OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce, JSONObject, NullIf
+
+        today = timezone.now().date()
+        next_fixture = Match.objects.filter(
+            team_season=OuterRef('pk'),
+            date__gte=today,
+            is_cancelled=False
+        ).order_by('date', 'kickoff_time').values(data=JSONObject(
+            id='id',
+            name=Coalesce(NullIf('opponent_name', Value('')), 'name'),
+            date='date',
+            kickoff_time='kickoff_time',
+            location='location',
+        ))[:1]
+
+        return self.annotate(next_fixture=Subquery(next_fixture, output_field=models.JSONField()))
+
 class TeamSeason(models.Model):
     """Links a Team to a Season and a specific Google Sheet"""
     SCORING_CHOICES = [
@@ -62,6 +153,8 @@ class TeamSeason(models.Model):
     sheet_name = models.CharField(max_length=100, null=True, blank=True)
     scoring_type = models.CharField(max_length=20, choices=SCORING_CHOICES, default='standard')
 
+    objects = TeamSeasonQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.team.name} {self.season.name}"
 
@@ -145,6 +238,9 @@ class Match(models.Model):
     featured_label = models.CharField(max_length=50, null=True, blank=True)
     team_sheet_title = models.CharField(max_length=100, null=True, blank=True)
 
+    # Version stamp for conditional GETs; bulk_update() callers must set it themselves
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         verbose_name_plural = "Matches"
 
@@ -197,13 +293,212 @@ class Match(models.Model):
         # Let's assume if scores are entered (or non-zero), we calculate.
         # For now, always calculate. Users can leave as 0-0.
 
+    # Fields stat_contribution() reads
+    STAT_SOURCE_FIELDS = {
+        'team_season_id', 'is_cancelled', 'result', 'home_away', 'result_home_score', 'result_away_score',
+        'home_tries', 'home_cons', 'home_pens', 'home_drop_goals',
+        'away_tries', 'away_cons', 'away_pens', 'away_drop_goals',
+    }
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this match contributed to its season's summary as loaded
+        instance._loaded_stats = instance._stats_state()
+        instance._loaded_rollup_key = instance._rollup_key()
+        return instance
+
+    def stat_contribution(self):
+        """This match's share of the SEASON_STAT_FIELDS totals (see TeamSeasonQuerySet.with_stats)"""
+        contribution = dict.fromkeys(SEASON_STAT_FIELDS, 0)
+        if self.is_cancelled or not self.result:
+            return contribution
+
+        if (self.home_away or 'Home').lower() in ['home', 'h']:
+            ours, theirs = 'home', 'away'
+        else:
+            ours, theirs = 'away', 'home'
+
+        contribution['played'] = 1
+        contribution[{'W': 'won', 'L': 'lost', 'D': 'drawn'}[self.result]] = 1
+        for stat, field in [('points', 'result_{}_score'), ('tries', '{}_tries'), ('cons', '{}_cons'),
+                            ('pens', '{}_pens'), ('drop', '{}_drop_goals')]:
+            contribution[f'{stat}_for'] = getattr(self, field.format(ours)) or 0
+            contribution[f'{stat}_against'] = getattr(self, field.format(theirs)) or 0
+        return contribution
+
+    def _rollup_key(self):
+        """(team_season_id, is_cancelled): what PlayerSeasonStats depends on, or None if deferred"""
+        if self.get_deferred_fields() & {'team_season_id', 'is_cancelled'}:
+            return None
+        return (self.team_season_id, self.is_cancelled)
+
+    def _stats_state(self):
+        """(team_season_id, stat_contribution()), or None if stat fields were deferred"""
+        if self.get_deferred_fields() & self.STAT_SOURCE_FIELDS:
+            return None
+        return (self.team_season_id, self.stat_contribution())
+
+    def _stored(self):
+        """
+        The stat fields of this match's row as currently stored, locked for the
+        rest of the transaction (None if there is no row). Deltas are taken from
+        this rather than from what this instance loaded, which a concurrent save
+        may have changed since.
+        """
+        if self.pk is None:
+            return None
+        fields = [field.removesuffix('_id') for field in self.STAT_SOURCE_FIELDS]
+        return Match.objects.select_for_update().only(*fields).filter(pk=self.pk).first()
+
     def save(self, *args, **kwargs):
         self.calculate_score()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            stored = None if self._state.adding else self._stored()
+            adding = stored is None
+            super().save(*args, **kwargs)
+
+            # Keep TeamSeasonSummary current: apply the change in this match's contribution.
+            # Anything we can't diff reliably (deferred fields, partial saves) triggers a rebuild.
+            before = (None, None) if adding else stored._loaded_stats
+            after = self._stats_state()
+            if after is None or kwargs.get('update_fields') is not None:
+                TeamSeasonSummary.rebuild({self.team_season_id, before[0]})
+            elif before != after:
+                if before[0] is not None:
+                    TeamSeasonSummary.apply_delta(before[0], before[1], -1)
+                if after[0] is not None:
+                    TeamSeasonSummary.apply_delta(after[0], after[1], +1)
+            self._loaded_stats = self._stats_state()
+
+            # Cancelling a match or moving it between seasons changes every selected player's totals
+            # (a new match has no selections, availability or scores yet)
+            before_key = None if adding else stored._loaded_rollup_key
+            after_key = self._rollup_key()
+            if not adding and before_key != after_key:
+                for team_season_id in {before_key[0], self.team_season_id} - {None}:
+                    PlayerSeasonStats.refresh(team_season_id)
+            self._loaded_rollup_key = after_key
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            stored = self._stored()
+            result = super().delete(*args, **kwargs)
+            if stored is None:
+                return result
+            team_season_id, contribution = stored._loaded_stats
+            if team_season_id is not None:
+                TeamSeasonSummary.apply_delta(team_season_id, contribution, -1)
+                # Selections, availability and scores went with the match
+                PlayerSeasonStats.refresh(team_season_id)
+        return result
 
     def __str__(self):
         return self.name
 
+class TeamSeasonSummary(models.Model):
+    """
+    Materialized season totals (SEASON_STAT_FIELDS) for a TeamSeason.
+    Match.save()/delete() apply incremental deltas; bulk writes (e.g. the
+    sheet sync) call rebuild(). `manage.py rebuild_season_summaries` rebuilds
+    and verifies every season.
+    """
+    team_season = models.OneToOneField(TeamSeason, on_delete=models.CASCADE, related_name='summary')
+
+    played = models.IntegerField(default=0)
+    won = models.IntegerField(default=0)
+    lost = models.IntegerField(default=0)
+    drawn = models.IntegerField(default=0)
+    points_for = models.IntegerField(default=0)
+    points_against = models.IntegerField(default=0)
+    tries_for = models.IntegerField(default=0)
+    tries_against = models.IntegerField(default=0)
+    cons_for = models.IntegerField(default=0)
+    cons_against = models.IntegerField(default=0)
+    pens_for = models.IntegerField(default=0)
+    pens_against = models.IntegerField(default=0)
+    drop_for = models.IntegerField(default=0)
+    drop_against = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Team season summaries"
+
+    @classmethod
+    def apply_delta(cls, team_season_id, contribution, sign):
+        """Adds (sign=+1) or removes (sign=-1) a match contribution from a season's totals"""
+        from django.db.models import F
+        changes = {field: F(field) + sign * value for field, value in contribution.items() if value}
+        if not changes:
+            return
+        updated = cls.objects.filter(team_season_id=team_season_id).update(updated_at=timezone.now(), **changes)
+        if not updated:
+            # No summary yet: build it from the matches (already includes this change)
+            cls.rebuild([team_season_id])
+
+    @classmethod
+    def rebuild(cls, team_season_ids=None):
+        """Recomputes summaries from matches (all seasons if ids is None). Returns the number written."""
+        seasons = TeamSeason.objects.all()
+        if team_season_ids is not None:
+            seasons = seasons.filter(id__in=[i for i in team_season_ids if i is not None])
+
+        summaries = [
+            cls(team_season_id=row['id'], **{field: row[f'stat_{field}'] for field in SEASON_STAT_FIELDS})
+            for row in seasons.with_stats().values('id', *[f'stat_{field}' for field in SEASON_STAT_FIELDS])
+        ]
+        if summaries:
+            cls.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=['team_season'],
+                update_fields=SEASON_STAT_FIELDS + ['updated_at'],
+            )
+        return len(summaries)
+
+    @classmethod
+    def for_team_season(cls, team_season):
+        """The summary for a TeamSeason, building it if it doesn't exist yet"""
+        summary = cls.objects.filter(team_season=team_season).first()
+        if summary is None:
+            cls.rebuild([team_season.pk])
+            summary = cls.objects.get(team_season=team_season)
+        return summary
+
+    @classmethod
+    def find_drift(cls, team_season_ids=None):
+        """
+        Compares stored summaries with totals recomputed from matches.
+        Returns {team_season_id: {field: (stored, actual)}} for seasons that differ
+        (a missing summary is reported with stored values of None).
+        """
+        seasons = TeamSeason.objects.all()
+        if team_season_ids is not None:
+            seasons = seasons.filter(id__in=team_season_ids)
+
+        stored = {
+            row['team_season_id']: row
+            for row in cls.objects.filter(team_season__in=seasons).values('team_season_id', *SEASON_STAT_FIELDS)
+        }
+        drift = {}
+        for row in seasons.with_stats().values('id', *[f'stat_{field}' for field in SEASON_STAT_FIELDS]):
+            summary = stored.get(row['id'], {})
+            diffs = {
+                field: (summary.get(field), row[f'stat_{field}'])
+                for field in SEASON_STAT_FIELDS
+                if summary.get(field) != row[f'stat_{field}']
+            }
+            if diffs:
+                drift[row['id']] = diffs
+        return drift
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in SEASON_STAT_FIELDS}
+
+    def __str__(self):
+        return f"{self.team_season} summary"
+
 class Availability(models.Model):
     """Stores a player's availability/status for a specific match"""
     match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='availabilities')
@@ -227,10 +522,56 @@ class TeamSelection(models.Model):
     position_number = models.IntegerField(null=True, blank=True)
     role = models.CharField(max_length=20, null=True, blank=True) # Starter/Finisher
     period = models.IntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.match.name} P{self.period} - {self.player.name}"
 
+# Points per score type for each TeamSeason.scoring_type
+SCORING_WEIGHTS = {
+    'standard': {'try': 5, 'con': 2, 'pen': 3, 'drop': 3},
+    'tries_only': {'try': 1, 'con': 0, 'pen': 0, 'drop': 0},
+}
+
+def score_points(scoring_type, tries, cons, pens, drops):
+    weights = SCORING_WEIGHTS.get(scoring_type, SCORING_WEIGHTS['standard'])
+    return tries * weights['try'] + cons * weights['con'] + pens * weights['pen'] + drops * weights['drop']
+
+class PlayerScoreQuerySet(models.QuerySet):
+    def player_totals(self, scoring_type='standard'):
+        """
+        Groups scores by player (values: player_id, player__name) with tries,
+        cons, pens, drops, kicks_attempts, kicks_success and points.
+        score_type/outcome match case-insensitively, accepting the long names too;
+        drop goals count as scored when no outcome is recorded.
+        """
+        from django.db.models import Count, F, Q, Value
+        from django.db.models.functions import Coalesce, Lower
+
+        weights = SCORING_WEIGHTS.get(scoring_type, SCORING_WEIGHTS['standard'])
+        is_try = Q(kind='try')
+        is_con = Q(kind__in=['conversion', 'con'])
+        is_pen = Q(kind__in=['penalty', 'pen'])
+        is_drop = Q(kind__in=['drop goal', 'drop'])
+        scored = Q(outcome_lower='scored')
+
+        return self.annotate(
+            kind=Lower('score_type'),
+            outcome_lower=Lower(Coalesce('outcome', Value('')))
+        ).values('player_id', 'player__name').annotate(
+            tries=Count('id', filter=is_try),
+            cons=Count('id', filter=is_con & scored),
+            pens=Count('id', filter=is_pen & scored),
+            drops=Count('id', filter=is_drop & (scored | Q(outcome_lower=''))),
+            kicks_attempts=Count('id', filter=is_con | is_pen),
+        ).annotate(
+            kicks_success=F('cons') + F('pens'),
+            points=(
+                F('tries') * weights['try'] + F('cons') * weights['con'] +
+                F('pens') * weights['pen'] + F('drops') * weights['drop']
+            ),
+        )
+
 class PlayerScore(models.Model):
     """Tracks individual scoring events by players in a match"""
     SCORE_TYPES = [
@@ -248,9 +589,181 @@ class PlayerScore(models.Model):
     # We could store points, but it's derived from rules. For now, assume standard.
     # Actually, rules might vary (tries only). 
     # But for a "Scorer Report", we usually just want "Tries Scored". Total points is secondary.
+
+    objects = PlayerScoreQuerySet.as_manager()
     
     class Meta:
         verbose_name_plural = "Player Scores"
 
     def __str__(self):
         return f"{self.player.name} - {self.get_score_type_display()} ({self.get_outcome_display()})"
+
+class SheetRangeDigest(models.Model):
+    """Content hash of a Google Sheets range as last synced, used to skip unchanged data on resync"""
+    team_season = models.ForeignKey(TeamSeason, on_delete=models.CASCADE, related_name='sheet_digests')
+    range_key = models.CharField(max_length=150) # 'Selection' or 'match:<id>'
+    digest = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['team_season', 'range_key'], name='unique_sheet_range_digest'),
+        ]
+
+    def __str__(self):
+        return f"{self.team_season} {self.range_key}: {self.digest[:8]}"
+
+class SyncJob(models.Model):
+    """A Google Sheets sync for a TeamSeason, queued by the API and run off the request path"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    team_season = models.ForeignKey(TeamSeason, on_delete=models.CASCADE, related_name='sync_jobs')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='sync_jobs')
+    force = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    stage = models.CharField(max_length=50, null=True, blank=True) # Stage currently running
+    stages = models.JSONField(default=list, blank=True) # [{name, status, started_at, duration_ms}]
+    error = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True) # Runner heartbeat (saved with every stage change)
+
+    class Meta:
+        constraints = [
+            # At most one active sync per TeamSeason
+            models.UniqueConstraint(
+                fields=['team_season'], condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_sync_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Sync {self.team_season} #{self.id} ({self.status})"
+
+class PlayerSeasonStats(models.Model):
+    """
+    Per-player rollup for a TeamSeason (non-cancelled matches only): appearances
+    and starts/finishes from TeamSelection, availability responses from
+    Availability, and scoring counts from PlayerScore. Points are derived from
+    the counts at read time, so a scoring_type change needs no rebuild.
+    Write paths call refresh() with the players they touched.
+    """
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='season_stats')
+    team_season = models.ForeignKey(TeamSeason, on_delete=models.CASCADE, related_name='player_stats')
+
+    appearances = models.IntegerField(default=0) # Matches selected in (any period)
+    starts = models.IntegerField(default=0)
+    finishes = models.IntegerField(default=0)
+
+    availability_responses = models.IntegerField(default=0) # Matches with a known status
+    available = models.IntegerField(default=0) # ...of which available (incl. selected / not selected)
+
+    tries = models.IntegerField(default=0)
+    cons = models.IntegerField(default=0)
+    pens = models.IntegerField(default=0)
+    drops = models.IntegerField(default=0)
+    kicks_attempts = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNT_FIELDS = [
+        'appearances', 'starts', 'finishes', 'availability_responses', 'available',
+        'tries', 'cons', 'pens', 'drops', 'kicks_attempts',
+    ]
+
+    class Meta:
+        verbose_name_plural = "Player season stats"
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'team_season'], name='unique_player_season_stats'),
+        ]
+
+    @classmethod
+    def refresh(cls, team_season_id, player_ids=None):
+        """
+        Recomputes the rollup for some players (all players if None) in one
+        TeamSeason with three grouped queries, and upserts/removes their rows.
+        """
+        from django.db.models import Count, Q
+
+        if player_ids is not None:
+            player_ids = {pid for pid in player_ids if pid is not None}
+            if not player_ids:
+                return 0
+
+        def scoped(queryset):
+            queryset = queryset.filter(match__team_season_id=team_season_id, match__is_cancelled=False)
+            if player_ids is not None:
+                queryset = queryset.filter(player_id__in=player_ids)
+            return queryset
+
+        rows = {}
+        def row(player_id):
+            return rows.setdefault(player_id, dict.fromkeys(cls.COUNT_FIELDS, 0))
+
+        for r in scoped(TeamSelection.objects.all()).values('player_id').annotate(
+            appearances=Count('match', distinct=True),
+            starts=Count('match', distinct=True, filter=Q(role__iexact='starter')),
+            finishes=Count('match', distinct=True, filter=Q(role__iexact='finisher')),
+        ):
+            row(r['player_id']).update(appearances=r['appearances'], starts=r['starts'], finishes=r['finishes'])
+
+        # Same wording the availability tab uses: "Selected"/"Not Selected" imply available
+        unknown = Q(status__isnull=True) | Q(status='') | Q(status__iexact='unknown') | \
+            Q(status__icontains='no answer') | Q(status__icontains='checking')
+        available = Q(status__icontains='selected') | (
+            Q(status__icontains='available') & ~Q(status__icontains='unavailable') & ~Q(status__icontains='not available')
+        )
+        for r in scoped(Availability.objects.all()).values('player_id').annotate(
+            responses=Count('match', distinct=True, filter=~unknown),
+            available=Count('match', distinct=True, filter=available),
+        ):
+            row(r['player_id']).update(availability_responses=r['responses'], available=r['available'])
+
+        for r in scoped(PlayerScore.objects.all()).player_totals():
+            row(r['player_id']).update({key: r[key] for key in ['tries', 'cons', 'pens', 'drops', 'kicks_attempts']})
+
+        rows = {pid: counts for pid, counts in rows.items() if any(counts.values())}
+
+        stale = cls.objects.filter(team_season_id=team_season_id).exclude(player_id__in=list(rows))
+        if player_ids is not None:
+            stale = stale.filter(player_id__in=player_ids)
+        stale.delete()
+
+        if rows:
+            cls.objects.bulk_create(
+                [cls(team_season_id=team_season_id, player_id=pid, **counts) for pid, counts in rows.items()],
+                update_conflicts=True,
+                unique_fields=['player', 'team_season'],
+                update_fields=cls.COUNT_FIELDS + ['updated_at'],
+            )
+        return len(rows)
+
+    @property
+    def kicks_success(self):
+        return self.cons + self.pens
+
+    @property
+    def points(self):
+        return score_points(self.team_season.scoring_type, self.tries, self.cons, self.pens, self.drops)
+
+    def __str__(self):
+        return f"{self.player} - {self.team_season}"
+
+class VersionCounter(models.Model):
+    """
+    Counter for a group of data without its own timestamps (e.g. player names),
+    mixed into ETags and cache keys. Kept in the database rather than the cache
+    so it is never evicted and increments are atomic across processes.
+    """
+    namespace = models.CharField(max_length=50, unique=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.namespace}: {self.version}"
@@ -1,6 +1,20 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Team, TeamPermission, Season, TeamSeason, Player, Match, Availability, TeamSelection, MatchFormat, PlayerScore
+from .models import Team, TeamPermission, Season, TeamSeason, Player, Match, Availability, TeamSelection, MatchFormat, PlayerScore, SyncJob, TeamSeasonSummary, PlayerSeasonStats
+
+class DynamicFieldsMixin:
+    """
+    Lets callers pass `fields=[...]` to a ModelSerializer to serialize only a
+    subset of its declared fields (e.g. a slim fixture list via ?fields=).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -40,89 +54,17 @@ class TeamSeasonSerializer(serializers.ModelSerializer):
         fields = ['id', 'team', 'season', 'team_id', 'season_id', 'spreadsheet_id', 'sheet_name', 'scoring_type', 'stats']
 
     def get_stats(self, obj):
-        from django.utils import timezone
-        
-        # Next Fixture
-        today = timezone.now().date()
-        next_match = Match.objects.filter(
-            team_season=obj,
-            date__gte=today,
-            is_cancelled=False
-        ).order_by('date', 'kickoff_time').first()
-        
-        next_fixture_data = None
-        if next_match:
-             next_fixture_data = {
-                 'id': next_match.id,
-                 'name': next_match.opponent_name or next_match.name,
-                 'date': next_match.date,
-                 'kickoff_time': next_match.kickoff_time,
-                 'location': next_match.location
-             }
-
-        # Calculate Season Stats
-        matches = Match.objects.filter(team_season=obj, is_cancelled=False)
-        
-        stats = {
-            'played': 0,
-            'won': 0,
-            'lost': 0,
-            'drawn': 0,
-            'points_for': 0,
-            'points_against': 0,
-            'tries_for': 0,
-            'tries_against': 0,
-            'cons_for': 0,
-            'cons_against': 0,
-            'pens_for': 0,
-            'pens_against': 0,
-            'drop_for': 0,
-            'drop_against': 0
-        }
-        
-        for m in matches:
-            if m.result: # Only count if result is set (played)
-                stats['played'] += 1
-                if m.result == 'W': stats['won'] += 1
-                elif m.result == 'L': stats['lost'] += 1
-                elif m.result == 'D': stats['drawn'] += 1
-                
-                # Check home/away for correct stats mapping
-                is_home = (m.home_away or 'Home').lower() in ['home', 'h']
-                
-                if is_home:
-                    # Our Team is Home
-                    stats['points_for'] += (m.result_home_score or 0)
-                    stats['points_against'] += (m.result_away_score or 0)
-                    
-                    stats['tries_for'] += (m.home_tries or 0)
-                    stats['cons_for'] += (m.home_cons or 0)
-                    stats['pens_for'] += (m.home_pens or 0)
-                    stats['drop_for'] += (m.home_drop_goals or 0)
-                    
-                    stats['tries_against'] += (m.away_tries or 0)
-                    stats['cons_against'] += (m.away_cons or 0)
-                    stats['pens_against'] += (m.away_pens or 0)
-                    stats['drop_against'] += (m.away_drop_goals or 0)
-                else:
-                    # Our Team is Away
-                    stats['points_for'] += (m.result_away_score or 0)
-                    stats['points_against'] += (m.result_home_score or 0)
-                    
-                    stats['tries_for'] += (m.away_tries or 0)
-                    stats['cons_for'] += (m.away_cons or 0)
-                    stats['pens_for'] += (m.away_pens or 0)
-                    stats['drop_for'] += (m.away_drop_goals or 0)
-                    
-                    stats['tries_against'] += (m.home_tries or 0)
-                    stats['cons_against'] += (m.home_cons or 0)
-                    stats['pens_against'] += (m.home_pens or 0)
-                    stats['drop_against'] += (m.home_drop_goals or 0)
+        # Totals come from the materialized TeamSeasonSummary and next_fixture is
+        # annotated on the queryset (see TeamSeasonViewSet.get_queryset); fall back
+        # to looking them up for objects loaded elsewhere, e.g. after create/update.
+        summary = getattr(obj, 'summary', None) or TeamSeasonSummary.for_team_season(obj)
+        if not hasattr(obj, 'next_fixture'):
+            obj = TeamSeason.objects.with_next_fixture().get(pk=obj.pk)
 
         return {
-            'next_fixture': next_fixture_data,
+            'next_fixture': obj.next_fixture,
             'player_count': 0,
-            **stats
+            **summary.to_dict()
         }
 
 class PlayerScoreSerializer(serializers.ModelSerializer):
@@ -145,7 +87,7 @@ class MatchFormatSerializer(serializers.ModelSerializer):
         model = MatchFormat
         fields = '__all__'
 
-class MatchSerializer(serializers.ModelSerializer):
+class MatchSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     format = MatchFormatSerializer(read_only=True)
     format_id = serializers.PrimaryKeyRelatedField(queryset=MatchFormat.objects.all(), source='format', write_only=True, required=False, allow_null=True)
     
@@ -182,3 +124,39 @@ class TeamSelectionSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamSelection
         fields = ['id', 'match', 'player', 'player_id', 'position_number', 'role', 'period']
+
+class SyncJobSerializer(serializers.ModelSerializer):
+    team_season_id = serializers.PrimaryKeyRelatedField(source='team_season', read_only=True)
+
+    class Meta:
+        model = SyncJob
+        fields = ['id', 'team_season_id', 'force', 'status', 'stage', 'stages', 'error', 'created_at', 'started_at', 'finished_at']
+
+class PlayerSeasonStatsSerializer(serializers.ModelSerializer):
+    team_season_id = serializers.PrimaryKeyRelatedField(source='team_season', read_only=True)
+    team_season_name = serializers.CharField(source='team_season.__str__', read_only=True)
+    kicks_success = serializers.IntegerField(read_only=True)
+    kick_percentage = serializers.SerializerMethodField()
+    availability_rate = serializers.SerializerMethodField()
+    points = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = PlayerSeasonStats
+        fields = [
+            'team_season_id', 'team_season_name',
+            'appearances', 'starts', 'finishes',
+            'availability_responses', 'available', 'availability_rate',
+            'tries', 'cons', 'pens', 'drops', 'points',
+            'kicks_attempts', 'kicks_success', 'kick_percentage',
+            'updated_at',
+        ]
+
+    def get_kick_percentage(self, obj):
+        if not obj.kicks_attempts:
+            return None
+        return round((obj.kicks_success / obj.kicks_attempts) * 100, 1)
+
+    def get_availability_rate(self, obj):
+        if not obj.availability_responses:
+            return None
+        return round((obj.available / obj.availability_responses) * 100, 1)
@@ -1,11 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views.auth import AuthStatusView, LoginView, LogoutView, auth_login_oauth, oauth_callback, auth_logout_oauth, DataView
-from .views.teams import TeamViewSet, SeasonViewSet, TeamSeasonViewSet, PlayerViewSet
-from .views.matches import MatchViewSet, MatchFormatViewSet, PlayerScoreViewSet
-from .views.spond import SpondGroupsView, SpondEventsView, SpondMembersView
+from .views.teams import TeamViewSet, SeasonViewSet, TeamSeasonViewSet, PlayerViewSet, SyncJobViewSet
+from .views.matches import MatchViewSet, MatchFormatViewSet, PlayerScoreViewSet, SheetContentNegotiation
+from .views.spond import SpondGroupsView, SpondEventsView, SpondMembersView, SpondStatusView
 from .views.availability import AvailabilityViewSet
-from .views.images import PlayerImageView, StaticProxyView
+from .views.images import PlayerImageView, PlayerImageBatchView, StaticProxyView, ThumbnailView
 
 router = DefaultRouter()
 router.register(r'teams', TeamViewSet, basename='team')
@@ -16,6 +16,7 @@ router.register(r'matches', MatchViewSet)
 router.register(r'match-formats', MatchFormatViewSet)
 router.register(r'player-scores', PlayerScoreViewSet)
 router.register(r'availabilities', AvailabilityViewSet)
+router.register(r'sync-jobs', SyncJobViewSet, basename='sync-job')
 
 urlpatterns = [
     # Auth Endpoints
@@ -30,13 +31,19 @@ urlpatterns = [
     
     # Player Images
     path('player-image/<str:player_name>/', PlayerImageView.as_view(), name='player-image'),
+    path('player-images/', PlayerImageBatchView.as_view(), name='player-images'),
     path('static-proxy/<path:filepath>', StaticProxyView.as_view(), name='static-proxy'),
+    path('thumbnails/<path:filepath>', ThumbnailView.as_view(), name='thumbnail'),
 
     # Spond Endpoints
     path('spond/groups/', SpondGroupsView.as_view(), name='spond-groups'),
     path('spond/events/', SpondEventsView.as_view(), name='spond-events'),
     path('spond/members/', SpondMembersView.as_view(), name='spond-members'),
+    path('spond/status/', SpondStatusView.as_view(), name='spond-status'),
     
+    # Explicit route: the trailing-slash middleware leaves dotted paths alone
+    path('matches/<int:pk>/sheet.png', MatchViewSet.as_view({'get': 'sheet'}, content_negotiation_class=SheetContentNegotiation), name='match-sheet-png'),
+
     # ViewSets
     path('', include(router.urls)),
 ]
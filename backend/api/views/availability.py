@@ -1,8 +1,9 @@
 from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from ..models import Availability
+from ..models import Availability, PlayerSeasonStats
 from ..serializers import AvailabilitySerializer
+from ..conditional import ResourceVersion, queryset_stamp, namespace_version, PLAYERS
 
 class AvailabilityViewSet(viewsets.ModelViewSet):
     queryset = Availability.objects.all()
@@ -18,5 +19,33 @@ class AvailabilityViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+
+        # player_name is serialized too, so player renames count as a change
+        count, ids, last = queryset_stamp(queryset)
+        version = ResourceVersion(request, count, ids, last, namespace_version(PLAYERS), last_modified=last)
+        if version.is_fresh(request):
+            return version.not_modified()
+
         serializer = self.get_serializer(queryset, many=True)
-        return Response({'availability': serializer.data})
+        return version.apply(Response({'availability': serializer.data}))
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._refresh_player_stats([serializer.instance])
+
+    def perform_update(self, serializer):
+        before = Availability(match=serializer.instance.match, player_id=serializer.instance.player_id)
+        super().perform_update(serializer)
+        self._refresh_player_stats([before, serializer.instance])
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self._refresh_player_stats([instance])
+
+    def _refresh_player_stats(self, availabilities):
+        by_season = {}
+        for availability in availabilities:
+            by_season.setdefault(availability.match.team_season_id, set()).add(availability.player_id)
+        for team_season_id, player_ids in by_season.items():
+            if team_season_id:
+                PlayerSeasonStats.refresh(team_season_id, player_ids)
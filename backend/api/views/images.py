@@ -1,10 +1,25 @@
 import os
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from django.views.static import serve
 from django.urls import reverse
+from core.services.player_images import player_image_index, SILHOUETTE_PATH
+from core.services.thumbnails import get_thumbnail, thumbnail_digest, ThumbnailError, DEFAULT_FORMAT
+
+# Thumbnail URLs carry their content digest, so a matching response never changes
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# More than any squad needs; the endpoint is public
+MAX_BATCH_NAMES = 100
+
+
+def thumbnail_url(request, filepath, size, fmt=DEFAULT_FORMAT):
+    """Absolute, content-addressed URL for a resized static image"""
+    digest = thumbnail_digest(filepath, size, fmt)
+    url = reverse('thumbnail', kwargs={'filepath': filepath})
+    return request.build_absolute_uri(f"{url}?size={size}&fmt={fmt}&v={digest}")
 
 class StaticProxyView(APIView):
     permission_classes = [AllowAny]
@@ -14,45 +29,78 @@ class StaticProxyView(APIView):
         static_dir = os.path.join(settings.BASE_DIR, 'static')
         return serve(request, filepath, document_root=static_dir)
 
+class ThumbnailView(APIView):
+    """
+    Serves a size-bucketed WebP/PNG variant of a static image:
+    GET /thumbnails/<path>?size=128&fmt=webp&v=<digest>
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, filepath):
+        fmt = request.query_params.get('fmt', DEFAULT_FORMAT)
+        try:
+            path, digest, content_type = get_thumbnail(filepath, request.query_params.get('size', 128), fmt)
+        except ThumbnailError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=404)
+
+        etag = f'"{digest}"'
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponse(status=304)
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        response['ETag'] = etag
+        # Only a URL pinned to the current digest may be cached forever
+        if request.query_params.get('v') == digest:
+            response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response['Cache-Control'] = 'no-cache'
+        return response
+
 class PlayerImageView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, player_name):
-        clean_name = player_name.lower().replace("'", "")
-        parts = clean_name.split()
-        
-        # Define base directory: backend/static/players
-        base_dir = os.path.join(settings.BASE_DIR, 'static', 'players')
-        
-        candidates = []
-        
-        # Strategy 1: Subdirectories
-        if len(parts) >= 2:
-            surname = parts[-1]
-            forename = parts[0]
-            candidates.append(f"{surname}-{forename}/head.png")
-            candidates.append(f"{forename}-{surname}/head.png")
-
-        # Strategy 2: Flat file
-        slugified = clean_name.replace(' ', '-')
-        candidates.append(f"{slugified}.png")
-        
-        found_path = None
-        
-        for rel_path in candidates:
-            full_path = os.path.join(base_dir, rel_path)
-            if os.path.exists(full_path):
-                found_path = f"players/{rel_path}"
-                break
-        
-        if found_path:
-            # Return URL to StaticProxyView
-            # We construct the URL manually or use reverse if properly registered
-            # Assuming route name 'static-proxy' taking 'filepath'
-            proxy_url = request.build_absolute_uri(reverse('static-proxy', kwargs={'filepath': found_path}))
-            return JsonResponse({'success': True, 'image_url': proxy_url})
-        
-        # Fallback
-        fallback_path = "pitch-assets/player-silhouette.png"
-        fallback_url = request.build_absolute_uri(reverse('static-proxy', kwargs={'filepath': fallback_path}))
-        return JsonResponse({'success': True, 'image_url': fallback_url})
+        found_path = player_image_index.resolve(player_name) or SILHOUETTE_PATH
+        # Return URL to StaticProxyView (falls back to the silhouette)
+        proxy_url = request.build_absolute_uri(reverse('static-proxy', kwargs={'filepath': found_path}))
+        data = {'success': True, 'image_url': proxy_url}
+        size = request.query_params.get('size')
+        if size:
+            try:
+                data['thumb_url'] = thumbnail_url(request, found_path, size)
+            except ThumbnailError:
+                pass
+        return JsonResponse(data)
+
+class PlayerImageBatchView(APIView):
+    """
+    Resolves a whole squad's image URLs in one call: POST {names: [...], size: 128}
+    With a size, found images also get a `thumb_url` for a resized variant.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        names = request.data.get('names')
+        if not isinstance(names, list):
+            return JsonResponse({'success': False, 'error': 'names must be a list'}, status=400)
+        if len(names) > MAX_BATCH_NAMES:
+            return JsonResponse({'success': False, 'error': f'At most {MAX_BATCH_NAMES} names per request'}, status=400)
+
+        names = [name for name in names if isinstance(name, str) and name.strip()]
+        size = request.data.get('size')
+        resolved = player_image_index.resolve_many(names)
+
+        images = {}
+        for name, found_path in resolved.items():
+            images[name] = {
+                'image_url': request.build_absolute_uri(
+                    reverse('static-proxy', kwargs={'filepath': found_path or SILHOUETTE_PATH})
+                ),
+                'found': found_path is not None
+            }
+            if size and found_path:
+                try:
+                    images[name]['thumb_url'] = thumbnail_url(request, found_path, size)
+                except ThumbnailError:
+                    pass
+        return JsonResponse({'success': True, 'images': images})
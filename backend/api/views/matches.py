@@ -1,12 +1,28 @@
+import re
+from django.db import transaction
+from django.http import FileResponse, HttpResponse
 from rest_framework import viewsets, status
+from rest_framework.negotiation import DefaultContentNegotiation
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from ..models import Match, MatchFormat, TeamSelection, Player, PlayerAlias, PlayerScore
+from ..models import Match, MatchFormat, TeamSelection, Player, PlayerAlias, PlayerScore, PlayerSeasonStats, bulk_update_touched
 from ..serializers import MatchSerializer, TeamSelectionSerializer, MatchFormatSerializer, PlayerScoreSerializer
 from ..permissions import HasTeamAccess
+from ..conditional import ResourceVersion, BumpsVersionMixin, queryset_stamp, namespace_versions, latest, PLAYERS, TEAM_CONFIG
 from core.services.sync_service import SyncService
 from core.services.sheets_service import SheetsService
+from core.services.sheet_renderer import LAYOUTS, SCALES, NAME_FORMATS
+from core.services.team_sheets import team_sheet_payload, match_sheet, sheet_inputs, invalidate_sheets
+
+class SheetContentNegotiation(DefaultContentNegotiation):
+    """
+    The sheet endpoint uses ?format= for the layout, which DRF would otherwise
+    read as a renderer override (and 404 on). Errors still render as JSON.
+    """
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
 
 class MatchViewSet(viewsets.ModelViewSet):
     queryset = Match.objects.all()
@@ -14,12 +30,41 @@ class MatchViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, HasTeamAccess]
 
     def get_queryset(self):
-        queryset = Match.objects.all().order_by('date')
+        # Join everything MatchSerializer reads so a fixture list is a single query
+        queryset = Match.objects.select_related('format', 'team_season__team').order_by('date')
         team_season_id = self.request.query_params.get('team_season_id')
         if team_season_id:
             queryset = queryset.filter(team_season_id=team_season_id)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # Fixture lists are polled constantly; answer unchanged ones with a 304
+        count, ids, last = queryset_stamp(self.filter_queryset(self.get_queryset()))
+        # Deleting or merging a player clears featured_player without touching updated_at
+        version = ResourceVersion(request, count, ids, last, namespace_versions(PLAYERS, TEAM_CONFIG), last_modified=last)
+        if version.is_fresh(request):
+            return version.not_modified()
+        return version.apply(super().list(request, *args, **kwargs))
+
+    def get_serializer(self, *args, **kwargs):
+        # ?fields=id,name,date lets list views ask for a slim payload
+        if self.action == 'list':
+            fields = self.request.query_params.get('fields')
+            if fields:
+                kwargs['fields'] = [f.strip() for f in fields.split(',') if f.strip()]
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_update(self, serializer):
+        before = sheet_inputs(serializer.instance)
+        super().perform_update(serializer)
+        if sheet_inputs(serializer.instance) != before:
+            invalidate_sheets([serializer.instance.id])
+
+    def perform_destroy(self, instance):
+        match_id = instance.id
+        super().perform_destroy(instance)
+        invalidate_sheets([match_id])
+
     @action(detail=True, methods=['post'])
     def refresh(self, request, pk=None):
         match = self.get_object()
@@ -38,101 +83,15 @@ class MatchViewSet(viewsets.ModelViewSet):
         match = self.get_object()
         
         if request.method == 'GET':
-            # Identify current selections
-            selections = TeamSelection.objects.filter(match=match).select_related('player')
-            
-            # Use serializer for raw data access if needed, but we can access obj directly
-            # Frontend expects: { periods: { <pNum>: { starters: [{id: 1...}, ...], finishers: [...] } } }
-            
-            formatted_periods = {}
-            
-            # Group by Period
-            for sel in selections:
-                p_num = str(sel.period)
-                if p_num not in formatted_periods:
-                    formatted_periods[p_num] = {'starters': [], 'finishers': []}
-                
-                # We need to reconstruct the array where index matches position-1 effectively
-                # But frontend LineupBuilder iterates array: array[index] corresponds to position index+1
-                
-                # Determine target array
-                target_key = 'starters' if sel.role == 'Starter' else 'finishers'
-                target_list = formatted_periods[p_num][target_key]
-                
-                # Position Number (1-based)
-                # Map to 0-based index
-                # Starters: 1-15 -> 0-14
-                # Finishers: 16+ -> 0+ ?
-                # LineupBuilder.jsx:
-                # pData.starters.forEach((player, index) => newGrid[pNum][index + 1] = player.id)
-                # This implies index 0 -> Pos 1.
-                
-                if sel.role == 'Starter':
-                     idx = sel.position_number - 1
-                else:
-                     idx = sel.position_number - 16 # Assuming finishers start at 16
-                
-                # Ensure list is big enough
-                if idx < 0: idx = 0 # Safety
-                while len(target_list) <= idx:
-                    target_list.append(None)
-                
-                # Store simple player dict or just id? Frontend expects object with .id
-                # LineupBuilder: if (player && player.id) -> assumes object
-                target_list[idx] = {'id': sel.player.id, 'name': sel.player.name}
-                
-            # Populate flattened starters/finishers for Period 1 (Legacy/Preview support)
-            period_1 = formatted_periods.get('1', {'starters': [], 'finishers': []})
-            starters = period_1.get('starters', [])
-            finishers = period_1.get('finishers', [])
-            
-            # Ensure starters array is padded to 15 for specific UI consumers if needed, 
-            # though the loop above creates sparse arrays or dicts?
-            # actually strict list with None is safer?
-            # The loop above does: target_list.append(None) so it's a list.
-            
-            # Helper to safely format time
-            def format_time(t):
-                if not t: return ''
-                if isinstance(t, str):
-                    # Should be HH:MM:SS or HH:MM
-                    return t[:5] 
-                return t.strftime('%H:%M')
-            
-            fixture_info = {
-                'match_date': match.date.strftime('%Y-%m-%d') if match.date else '',
-                'kickoff': format_time(match.kickoff_time),
-                'meet_time': format_time(match.meet_time),
-                'location': match.location,
-                'opponent_name': match.opponent_name,
-                'home_away': match.home_away,
-                'team_name': match.team_season.team.name if match.team_season else 'Team',
-                'notes': match.notes,
-                'featured_player_id': match.featured_player_id,
-                'featured_player_name': match.featured_player.name if match.featured_player else '',
-                'featured_label': match.featured_label,
-                'team_sheet_title': match.team_sheet_title
-            }
-            
-            metadata = {
-                 'kickoff': fixture_info['kickoff'],
-                 'meet_time': fixture_info['meet_time'],
-                 'location': fixture_info['location'],
-                 'notes': match.notes,
-                 'featured_player': match.featured_player.name if match.featured_player else '',
-                 'featured_label': match.featured_label,
-                 'team_sheet_title': match.team_sheet_title
-            }
-                
-            return Response({
-                'success': True, 
-                'periods': formatted_periods,
-                'starters': starters,
-                'finishers': finishers,
-                'fixture_info': fixture_info,
-                'metadata': metadata,
-                'match_name': match.name
-            })
+            count, ids, last = queryset_stamp(TeamSelection.objects.filter(match=match))
+            version = ResourceVersion(
+                request, match.updated_at, count, ids, last,
+                namespace_versions(PLAYERS, TEAM_CONFIG),
+                last_modified=latest(match.updated_at, last)
+            )
+            if version.is_fresh(request):
+                return version.not_modified()
+            return version.apply(Response({'success': True, **team_sheet_payload(match)}))
 
         if request.method == 'POST':
             # Update Team Selection
@@ -140,8 +99,8 @@ class MatchViewSet(viewsets.ModelViewSet):
             data = request.data
             
             try:
-                # Clear existing for this match (Atomic update logic preferred but this matches Flask)
-                TeamSelection.objects.filter(match=match).delete()
+                # Build the desired grid: (period, position_number) -> (player_id, role)
+                desired = {}
                 
                 if data.get('multi_period'):
                     periods_map = data.get('periods', {})
@@ -150,42 +109,119 @@ class MatchViewSet(viewsets.ModelViewSet):
                              if p_id:
                                  pos_int = int(pos)
                                  role = 'Starter' if pos_int <= 15 else 'Finisher'
-                                 
-                                 TeamSelection.objects.create(
-                                     match=match,
-                                     player_id=p_id,
-                                     role=role,
-                                     period=int(p_num),
-                                     position_number=pos_int
-                                 )
+                                 desired[(int(p_num), pos_int)] = (int(p_id), role)
                 else:
                     starters = data.get('starters', [])
                     finishers = data.get('finishers', []) # Or substitutes
                     
                     for i, p_id in enumerate(starters):
                         if p_id:
-                            TeamSelection.objects.create(
-                                match=match,
-                                player_id=p_id,
-                                role='Starter',
-                                period=1,
-                                position_number=i+1
-                            )
+                            desired[(1, i + 1)] = (int(p_id), 'Starter')
                     
                     for i, p_id in enumerate(finishers):
                          if p_id:
-                             TeamSelection.objects.create(
-                                 match=match,
-                                 player_id=p_id,
-                                 role='Finisher',
-                                 period=1,
-                                 position_number=16+i
-                             )
+                             desired[(1, 16 + i)] = (int(p_id), 'Finisher')
+                
+                with transaction.atomic():
+                    counts = self._apply_selection_diff(match, desired)
+                if any(counts.values()):
+                    invalidate_sheets([match.id])
                 
-                return Response({'success': True, 'message': 'Team selection saved'})
+                return Response({'success': True, 'message': 'Team selection saved', **counts})
             except Exception as e:
                 return Response({'success': False, 'error': str(e)}, status=500)
 
+    @action(detail=True, methods=['get'], url_path='sheet', content_negotiation_class=SheetContentNegotiation)
+    def sheet(self, request, pk=None):
+        """
+        Team sheet PNG rendered on the server: GET /matches/{id}/sheet.png
+        ?format=standard|mobile  &scale=0.5|1|2  &names=initial|surname|full  &download=1
+        """
+        match = self.get_object()
+
+        layout = request.query_params.get('format', 'standard').lower()
+        name_format = request.query_params.get('names', 'initial')
+        try:
+            scale = float(request.query_params.get('scale', 1))
+        except ValueError:
+            scale = None
+        if layout not in LAYOUTS or scale not in SCALES or name_format not in NAME_FORMATS:
+            return Response({
+                'success': False,
+                'error': f"Expected format in {list(LAYOUTS)}, scale in {list(SCALES)}, names in {list(NAME_FORMATS)}"
+            }, status=400)
+        scale = int(scale) if scale.is_integer() else scale
+
+        path, digest = match_sheet(match, layout, scale, name_format)
+
+        etag = f'"{digest}"'
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponse(status=304)
+        else:
+            try:
+                png = open(path, 'rb')
+            except FileNotFoundError:
+                # Deleted by a concurrent invalidation since the index lookup
+                path, digest = match_sheet(match, layout, scale, name_format, rerender=True)
+                etag = f'"{digest}"'
+                png = open(path, 'rb')
+            response = FileResponse(png, content_type='image/png')
+            team_name = match.team_season.team.name if match.team_season else 'team'
+            slug = lambda value: re.sub(r'[^a-z0-9]+', '-', (value or '').lower()).strip('-')
+            filename = f"{slug(team_name)}-vs-{slug(match.opponent_name or match.name)}-{match.date or 'date'}-{layout}.png"
+            disposition = 'attachment' if request.query_params.get('download') else 'inline'
+            response['Content-Disposition'] = f'{disposition}; filename="{filename}"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _apply_selection_diff(self, match, desired):
+        """
+        Brings a match's TeamSelection rows in line with `desired`
+        ({(period, position_number): (player_id, role)}) using one bulk_create,
+        one bulk_update and one delete, touching only slots that changed.
+        """
+        existing = {}
+        to_delete = []
+        affected_players = set() # Players whose PlayerSeasonStats need a recount
+        for sel in TeamSelection.objects.filter(match=match).order_by('id'):
+            key = (sel.period, sel.position_number)
+            if key in existing or key not in desired:
+                to_delete.append(sel.id) # Duplicate slot or no longer selected
+                affected_players.add(sel.player_id)
+            else:
+                existing[key] = sel
+        
+        to_create = []
+        to_update = []
+        for (period, position_number), (player_id, role) in desired.items():
+            sel = existing.get((period, position_number))
+            if sel is None:
+                to_create.append(TeamSelection(
+                    match=match,
+                    player_id=player_id,
+                    role=role,
+                    period=period,
+                    position_number=position_number
+                ))
+            elif sel.player_id != player_id or sel.role != role:
+                affected_players.update([sel.player_id, player_id])
+                sel.player_id = player_id
+                sel.role = role
+                to_update.append(sel)
+        affected_players.update(sel.player_id for sel in to_create)
+        
+        if to_delete:
+            TeamSelection.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            bulk_update_touched(TeamSelection, to_update, ['player', 'role'])
+        if to_create:
+            TeamSelection.objects.bulk_create(to_create)
+        if affected_players and match.team_season_id:
+            PlayerSeasonStats.refresh(match.team_season_id, affected_players)
+        
+        return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(to_delete)}
+
     @action(detail=True, methods=['post'], url_path='spond-sync')
     def spond_sync(self, request, pk=None):
         try:
@@ -201,7 +237,9 @@ class MatchViewSet(viewsets.ModelViewSet):
             result = spond_service.sync_match_availability(match)
             
             if result:
-                 return Response({'success': True, 'message': 'Match availability synced from Spond'})
+                 message = (f"Match availability synced from Spond: {result['created']} created, "
+                            f"{result['updated']} updated, {result['unchanged']} unchanged")
+                 return Response({'success': True, 'message': message, **result})
             else:
                  return Response({'success': False, 'message': 'Sync performed but no changes or failed silently.'})
         except Exception as e:
@@ -221,9 +259,10 @@ class MatchViewSet(viewsets.ModelViewSet):
         match.save()
         return Response({'success': True, 'message': 'Spond link updated'})
 
-class MatchFormatViewSet(viewsets.ModelViewSet):
+class MatchFormatViewSet(BumpsVersionMixin, viewsets.ModelViewSet):
     queryset = MatchFormat.objects.all()
     serializer_class = MatchFormatSerializer
+    version_namespace = TEAM_CONFIG # nested in MatchSerializer
 
 class PlayerScoreViewSet(viewsets.ModelViewSet):
     queryset = PlayerScore.objects.all()
@@ -251,6 +290,7 @@ class PlayerScoreViewSet(viewsets.ModelViewSet):
                  instances.append(PlayerScore(**serializer.validated_data))
             
             PlayerScore.objects.bulk_create(instances)
+            self._refresh_player_stats(instances)
             
             # Return custom response or just the first one?
             return Response({'message': f'{quantity} scores recorded', 'success': True}, status=status.HTTP_201_CREATED)
@@ -259,6 +299,29 @@ class PlayerScoreViewSet(viewsets.ModelViewSet):
             headers = self.get_success_headers(serializer.data)
             return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
         
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._refresh_player_stats([serializer.instance])
+
+    def perform_update(self, serializer):
+        before = PlayerScore(match_id=serializer.instance.match_id, player_id=serializer.instance.player_id)
+        super().perform_update(serializer)
+        self._refresh_player_stats([before, serializer.instance])
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self._refresh_player_stats([instance])
+
+    def _refresh_player_stats(self, scores):
+        """Recounts PlayerSeasonStats for the (season, player) pairs these scores belong to"""
+        match_seasons = dict(Match.objects.filter(id__in={s.match_id for s in scores}).values_list('id', 'team_season_id'))
+        by_season = {}
+        for score in scores:
+            by_season.setdefault(match_seasons.get(score.match_id), set()).add(score.player_id)
+        for team_season_id, player_ids in by_season.items():
+            if team_season_id:
+                PlayerSeasonStats.refresh(team_season_id, player_ids)
+
     @action(detail=False, methods=['GET'])
     def types(self, request):
         """Return available score types"""
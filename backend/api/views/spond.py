@@ -3,16 +3,18 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from core.services.spond_service import SpondService
+from core.services.spond_client import SpondAuthError, spond_client
 
 class SpondGroupsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        # Logs in lazily (and again on 401) through the shared Spond client
         service = SpondService()
-        if not service.login():
-             return Response({'error': 'Spond login failed'}, status=500)
-        
-        groups = service.get_groups()
+        try:
+            groups = service.get_groups()
+        except SpondAuthError:
+            return Response({'error': 'Spond login failed'}, status=500)
         return Response({'groups': groups})
 
 class SpondEventsView(APIView):
@@ -23,11 +25,14 @@ class SpondEventsView(APIView):
         if not group_id:
             return Response({'error': 'Missing groupId'}, status=400)
             
+        # ?refresh=1 refetches the whole window instead of only events past the cached cursor
+        refresh = request.query_params.get('refresh') in ['1', 'true']
+        
         service = SpondService()
-        if not service.login():
-             return Response({'error': 'Spond login failed'}, status=500)
-             
-        events = service.get_events(group_id)
+        try:
+            events = service.get_events(group_id, refresh=refresh)
+        except SpondAuthError:
+            return Response({'error': 'Spond login failed'}, status=500)
         return Response({'events': events})
 
 class SpondMembersView(APIView):
@@ -39,8 +44,15 @@ class SpondMembersView(APIView):
             return Response({'error': 'Missing groupId'}, status=400)
             
         service = SpondService()
-        if not service.login():
-             return Response({'error': 'Spond login failed'}, status=500)
-             
-        members = service.get_group_members(group_id)
+        try:
+            members = service.get_group_members(group_id)
+        except SpondAuthError:
+            return Response({'error': 'Spond login failed'}, status=500)
         return Response({'members': members})
+
+class SpondStatusView(APIView):
+    """Spond client metrics for this process: token age, logins performed, last error"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(spond_client.metrics())
@@ -2,13 +2,21 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from ..models import Team, Season, TeamSeason, Player
-from ..serializers import TeamSerializer, SeasonSerializer, TeamSeasonSerializer, PlayerSerializer
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+from ..models import Team, TeamPermission, Season, TeamSeason, Player, Match, PlayerScore, SyncJob, PlayerSeasonStats
+from ..serializers import TeamSerializer, SeasonSerializer, TeamSeasonSerializer, PlayerSerializer, SyncJobSerializer, PlayerSeasonStatsSerializer
 from ..permissions import HasTeamAccess
+from ..conditional import ResourceVersion, BumpsVersionMixin, bump_version, queryset_stamp, namespace_version, latest, PLAYERS, TEAM_CONFIG
+from core.services.spond_roster import invalidate_rosters
+from core.services.team_sheets import invalidate_sheets
 
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(BumpsVersionMixin, viewsets.ModelViewSet):
     serializer_class = TeamSerializer
     permission_classes = [IsAuthenticated, HasTeamAccess]
+    version_namespace = TEAM_CONFIG
 
     def get_queryset(self):
         user = self.request.user
@@ -17,163 +25,133 @@ class TeamViewSet(viewsets.ModelViewSet):
         # Filter teams where the user has a permission entry
         return Team.objects.filter(permissions__user=user).distinct()
 
-class SeasonViewSet(viewsets.ModelViewSet):
+class SeasonViewSet(BumpsVersionMixin, viewsets.ModelViewSet):
     queryset = Season.objects.all()
     serializer_class = SeasonSerializer
     permission_classes = [IsAuthenticated]
+    version_namespace = TEAM_CONFIG
 
-class TeamSeasonViewSet(viewsets.ModelViewSet):
+class TeamSeasonViewSet(BumpsVersionMixin, viewsets.ModelViewSet):
     queryset = TeamSeason.objects.all()
     serializer_class = TeamSeasonSerializer
     permission_classes = [IsAuthenticated]
+    version_namespace = TEAM_CONFIG
     
     def get_queryset(self):
         # Optional: Filter by user's teams? 
-        return TeamSeason.objects.all()
+        # Season totals are joined from TeamSeasonSummary (see TeamSeasonSerializer.get_stats)
+        return TeamSeason.objects.select_related('team', 'season', 'summary').prefetch_related('team__permissions').with_next_fixture()
+
+    def list(self, request, *args, **kwargs):
+        # The payload is team/season config, summary totals, team permissions
+        # and each season's next fixture (which also moves with the date)
+        seasons = TeamSeason.objects.all()
+        count, ids, summaries_at = queryset_stamp(seasons, 'summary__updated_at')
+        _, _, matches_at = queryset_stamp(Match.objects.filter(team_season__in=seasons))
+        permissions = queryset_stamp(TeamPermission.objects.all(), 'id')
+        version = ResourceVersion(
+            request, count, ids, summaries_at, matches_at, permissions,
+            namespace_version(TEAM_CONFIG), timezone.localdate(),
+            last_modified=latest(summaries_at, matches_at)
+        )
+        if version.is_fresh(request):
+            return version.not_modified()
+        return version.apply(super().list(request, *args, **kwargs))
 
     @action(detail=True, methods=['post'])
     def sync(self, request, pk=None):
         team_season = self.get_object()
         
-        # Instantiate services
-        from core.services.sheets_service import SheetsService
-        from core.services.sync_service import SyncService
+        # Sheets sync runs in the background (see core.services.sync_jobs);
+        # poll /sync-jobs/<job_id>/ for progress.
+        from core.services.sync_jobs import enqueue_sync
         
-        # We need OAuth credentials from the request user (if we stored them per user)
-        # OR currently the system uses a shared global/env config for Spond, but Sheets uses OAuth.
-        # SheetsService checks for credentials in database or session.
-        # Existing OAuthService handles this.
+        # Unchanged ranges are skipped unless a full re-import is requested
+        force = str(request.data.get('force', '')).lower() in ['1', 'true', 'yes']
         
-        sheets_service = SheetsService()
-        sync_service = SyncService(sheets_service)
+        job = enqueue_sync(team_season, user=request.user, force=force)
+        return Response({
+            'success': True,
+            'message': 'Sync queued',
+            'job_id': job.id,
+            'status': job.status
+        }, status=202)
+
+    @action(detail=True, methods=['post'], url_path='spond-sync')
+    def spond_sync(self, request, pk=None):
+        """Syncs Spond availability for all upcoming linked matches of this season"""
+        team_season = self.get_object()
+        from core.services.spond_service import SpondService
         
-        # 1. Sync Master Data (Matches, Players, Availability)
-        if not sync_service.sync_master_data(team_season.id):
-             return Response({'success': False, 'error': 'Failed to sync master data'}, status=500)
-             
-        # 2. Sync Team Selections (Grid)
-        sync_service.sync_team_selections(team_season.id) # Optimize: Make async or handle error?
+        try:
+            result = SpondService().sync_season_availability(team_season)
+        except Exception as e:
+            return Response({'success': False, 'error': str(e)}, status=500)
         
-        return Response({'success': True, 'message': 'Sync completed successfully'})
+        synced = len(result['matches']) - result['failed']
+        message = (f"Synced {synced} of {len(result['matches'])} matches from Spond: "
+                   f"{result['created']} created, {result['updated']} updated, {result['unchanged']} unchanged")
+        return Response({'success': result['failed'] == 0, 'message': message, **result})
 
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         team_season = self.get_object()
-        from ..models import Match, PlayerScore
-        from django.db.models import Sum, Count, Q, F
+        totals = PlayerScore.objects.filter(
+            match__team_season=team_season,
+            match__is_cancelled=False
+        ).player_totals(team_season.scoring_type)
 
-        # Get all matches for this season
-        matches = Match.objects.filter(team_season=team_season, is_cancelled=False)
-        
-        # Get all scores for these matches
-        # We need to aggregate by player
-        
-        # Define scoring weights
-        # Standard: Try=5, Con=2, Pen=3, Drop=3
-        # Tries Only: Try=1, others=0
-        
-        is_tries_only = team_season.scoring_type == 'tries_only'
-        
-        TRY_VAL = 1 if is_tries_only else 5
-        CON_VAL = 0 if is_tries_only else 2
-        PEN_VAL = 0 if is_tries_only else 3
-        DROP_VAL = 0 if is_tries_only else 3
+        # Each leaderboard is its own grouped query returning only the top 5
+        # (ties broken by player id).
+        top_tries = totals.filter(tries__gt=0).order_by('-tries', 'player_id')[:5]
+        top_points = totals.filter(points__gt=0).order_by('-points', 'player_id')[:5]
+
+        # Top Goal Kickers (Cons + Pens)
+        top_kickers = totals.filter(kicks_attempts__gt=0).order_by('-kicks_success', 'player_id')[:5]
+
+        # Top Kick Percentage (Min 3 attempts)
+        top_kick_pct = totals.filter(kicks_attempts__gte=3).annotate(
+            percentage=Cast('kicks_success', FloatField()) * 100 / F('kicks_attempts')
+        ).order_by('-percentage', 'player_id')[:5]
+
+        def player_row(p):
+            return {
+                'id': p['player_id'],
+                'name': p['player__name'],
+                **{key: p[key] for key in ['tries', 'cons', 'pens', 'drops', 'points', 'kicks_attempts', 'kicks_success']}
+            }
 
-        # Aggregate data in Python to handle complex logic easily (or use extensive aggregation queries)
-        # Given dataset size is small per team/season, Python aggregation is fine and readable.
-        
-        player_stats = {}
-        
-        scores = PlayerScore.objects.filter(match__in=matches).select_related('player')
-        
-        for score in scores:
-            pid = score.player.id
-            pname = score.player.name
-            
-            if pid not in player_stats:
-                player_stats[pid] = {
-                    'id': pid, 
-                    'name': pname, 
-                    'tries': 0, 
-                    'cons': 0, 
-                    'pens': 0, 
-                    'drops': 0,
-                    'points': 0,
-                    'kicks_attempts': 0,
-                    'kicks_success': 0
-                }
-                
-            stats = player_stats[pid]
-            
-            st_lower = score.score_type.lower()
-            outcome_scored = (score.outcome or '').lower() == 'scored'
-            
-            if st_lower == 'try':
-                stats['tries'] += 1
-                stats['points'] += TRY_VAL
-            elif st_lower in ['conversion', 'con']:
-                stats['kicks_attempts'] += 1
-                if outcome_scored:
-                    stats['cons'] += 1
-                    stats['points'] += CON_VAL
-                    stats['kicks_success'] += 1
-            elif st_lower in ['penalty', 'pen']:
-                stats['kicks_attempts'] += 1
-                if outcome_scored:
-                    stats['pens'] += 1
-                    stats['points'] += PEN_VAL
-                    stats['kicks_success'] += 1
-            elif st_lower in ['drop goal', 'drop']:
-                # Assuming simple drop goal logic if tracked, usually just 'Scored' outcome matter
-                # If outcome is tracked for Drop Goal:
-                if outcome_scored or not score.outcome: # default to scored if not strict
-                     stats['drops'] += 1
-                     stats['points'] += DROP_VAL
-
-        # Convert to list
-        all_stats = list(player_stats.values())
-        
-        # 1. Top Try Scorers
-        top_tries = sorted([p for p in all_stats if p['tries'] > 0], key=lambda x: x['tries'], reverse=True)[:5]
-        
-        # 2. Top Point Scorers
-        top_points = sorted([p for p in all_stats if p['points'] > 0], key=lambda x: x['points'], reverse=True)[:5]
-        
-        # 3. Top Goal Kickers (Cons + Pens)
-        # Sort by total goals, then id (stable sort)
-        top_kickers = sorted(
-            [p for p in all_stats if p['kicks_attempts'] > 0], 
-            key=lambda x: (x['cons'] + x['pens']), 
-            reverse=True
-        )[:5]
-        
-        # 4. Top Kick Percentage (Min 3 attempts)
-        def calc_pct(p):
-            if p['kicks_attempts'] == 0: return 0
-            return (p['kicks_success'] / p['kicks_attempts']) * 100
-            
-        kick_pct_candidates = [p for p in all_stats if p['kicks_attempts'] >= 3]
-        top_kick_pct = sorted(kick_pct_candidates, key=calc_pct, reverse=True)[:5]
-        
         # Format for response
         return Response({
-            'top_try_scorers': top_tries,
-            'top_point_scorers': top_points,
+            'top_try_scorers': [player_row(p) for p in top_tries],
+            'top_point_scorers': [player_row(p) for p in top_points],
             'top_goal_kickers': [{
-                'id': p['id'], 
-                'name': p['name'], 
+                'id': p['player_id'],
+                'name': p['player__name'],
                 'goals': p['cons'] + p['pens'],
                 'details': f"{p['cons']} Cons, {p['pens']} Pens"
             } for p in top_kickers],
             'top_kick_percentage': [{
-                'id': p['id'], 
-                'name': p['name'], 
-                'percentage': round(calc_pct(p), 1),
+                'id': p['player_id'],
+                'name': p['player__name'],
+                'percentage': round((p['kicks_success'] / p['kicks_attempts']) * 100, 1),
                 'attempts': p['kicks_attempts'],
                 'success': p['kicks_success']
             } for p in top_kick_pct]
         })
 
+class SyncJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status/progress of background Sheets syncs"""
+    serializer_class = SyncJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = SyncJob.objects.all().order_by('-id')
+        team_season_id = self.request.query_params.get('team_season_id')
+        if team_season_id:
+            queryset = queryset.filter(team_season_id=team_season_id)
+        return queryset
+
 class PlayerViewSet(viewsets.ModelViewSet):
     queryset = Player.objects.all()
     serializer_class = PlayerSerializer
@@ -187,6 +165,42 @@ class PlayerViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response({'players': serializer.data})
 
+    # Spond availability maps members through a cached roster index keyed on spond_id,
+    # and rendered team sheets show player names
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        invalidate_rosters()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_rosters()
+        invalidate_sheets()
+        bump_version(PLAYERS)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate_rosters()
+        invalidate_sheets()
+        bump_version(PLAYERS)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Per-season appearances, availability and scoring, read from the PlayerSeasonStats rollup"""
+        player = self.get_object()
+        stats = PlayerSeasonStats.objects.filter(player=player).select_related(
+            'team_season__team', 'team_season__season'
+        ).order_by('-team_season__season__start_date', 'team_season_id')
+
+        team_season_id = request.query_params.get('team_season_id')
+        if team_season_id:
+            stats = stats.filter(team_season_id=team_season_id)
+
+        return Response({
+            'success': True,
+            'player_id': player.id,
+            'seasons': PlayerSeasonStatsSerializer(stats, many=True).data
+        })
+
     @action(detail=False, methods=['post'], url_path='merge')
     def merge(self, request):
         source_id = request.data.get('source_id')
@@ -199,21 +213,38 @@ class PlayerViewSet(viewsets.ModelViewSet):
             source_player = Player.objects.get(id=source_id)
             target_player = Player.objects.get(id=target_id)
             
-            # Logic:
-            # 1. Create Alias for source player name pointing to target player
-            from ..models import PlayerAlias
-            PlayerAlias.objects.create(name=source_player.name, player=target_player)
+            from ..models import PlayerAlias, TeamSelection, Availability, PlayerScore
             
-            # 2. Re-link all foreign keys from source to target
-            # Matches/Selections/Availabilities/Scores
-            from ..models import TeamSelection, Availability, PlayerScore
-            
-            TeamSelection.objects.filter(player=source_player).update(player=target_player)
-            Availability.objects.filter(player=source_player).update(player=target_player)
-            PlayerScore.objects.filter(player=source_player).update(player=target_player)
+            with transaction.atomic():
+                # Logic:
+                # 1. Create Alias for source player name pointing to target player
+                PlayerAlias.objects.create(name=source_player.name, player=target_player)
+                
+                # Seasons to recount, from the source's own rows (the rollup may be empty or stale)
+                merged_seasons = set()
+                for model in (TeamSelection, Availability, PlayerScore):
+                    merged_seasons.update(
+                        model.objects.filter(player=source_player, match__team_season__isnull=False)
+                        .values_list('match__team_season_id', flat=True).distinct()
+                    )
+                
+                # 2. Re-link all foreign keys from source to target
+                # Matches/Selections/Availabilities/Scores
+                now = timezone.now()
+                TeamSelection.objects.filter(player=source_player).update(player=target_player, updated_at=now)
+                Availability.objects.filter(player=source_player).update(player=target_player, updated_at=now)
+                PlayerScore.objects.filter(player=source_player).update(player=target_player)
+                
+                # 3. Delete source player
+                source_player.delete()
+                
+                # 4. Recount the target's stats where the source had any
+                for team_season_id in merged_seasons:
+                    PlayerSeasonStats.refresh(team_season_id, [target_player.id])
             
-            # 3. Delete source player
-            source_player.delete()
+            invalidate_rosters()
+            invalidate_sheets()
+            bump_version(PLAYERS)
             
             return Response({'success': True, 'message': f'Merged {source_player.name} into {target_player.name}'})
             
@@ -173,6 +173,22 @@ CSRF_HEADER_NAME = 'HTTP_X_CSRFTOKEN'
 SPOND_USERNAME = os.environ.get('SPOND_USERNAME')
 SPOND_PASSWORD = os.environ.get('SPOND_PASSWORD')
 
+# Background Sync Jobs
+# 'thread': run in the web process on a background thread
+# 'worker': leave queued for `python manage.py run_sync_worker`
+SYNC_JOB_RUNNER = os.environ.get('SYNC_JOB_RUNNER', 'thread')
+SYNC_JOB_TIMEOUT = int(os.environ.get('SYNC_JOB_TIMEOUT', 15 * 60)) # Seconds without stage progress (or unclaimed in the queue) before a job is considered dead
+
+# Parallel Spond event fetches for a season-wide availability sync
+SPOND_SYNC_WORKERS = int(os.environ.get('SPOND_SYNC_WORKERS', '4'))
+
+# Resized player images (see core/services/thumbnails.py)
+THUMBNAIL_CACHE_DIR = os.environ.get('THUMBNAIL_CACHE_DIR', BASE_DIR / '.thumbnail_cache')
+
+# Server-rendered team sheet PNGs (see core/services/sheet_renderer.py)
+SHEET_CACHE_DIR = os.environ.get('SHEET_CACHE_DIR', BASE_DIR / '.sheet_cache')
+SHEET_FONT_PATH = os.environ.get('SHEET_FONT_PATH') # Bold TTF; a system font is picked if unset
+
 # DRF Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
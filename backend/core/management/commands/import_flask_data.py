@@ -8,6 +8,8 @@ from api.models import (
     TeamSeason, Player, PlayerAlias, Match, Availability, TeamSelection
 )
 from django.db import transaction
+from core.services.spond_roster import invalidate_rosters
+from api.conditional import bump_version, PLAYERS, TEAM_CONFIG
 
 # Map legacy table to Django model
 class Command(BaseCommand):
@@ -141,6 +143,9 @@ class Command(BaseCommand):
                     'left_date': row['left_date']
                 }
             )
+        invalidate_rosters() # spond_id links changed
+        bump_version(PLAYERS)
+        bump_version(TEAM_CONFIG)
         
         # Aliases
         cursor.execute("SELECT * FROM player_alias")
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.models import TeamSeason, TeamSeasonSummary, PlayerSeasonStats
+
+class Command(BaseCommand):
+    help = 'Rebuild TeamSeasonSummary and PlayerSeasonStats from matches, and verify the season summaries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--team-season', type=int, action='append', dest='team_seasons', help='Only this TeamSeason id (repeatable)')
+        parser.add_argument('--verify', action='store_true', help='Only check stored summaries against the matches, without rewriting them')
+        parser.add_argument('--players', action='store_true', help='Only rebuild PlayerSeasonStats (e.g. to backfill them after upgrading)')
+
+    def handle(self, *args, **options):
+        team_season_ids = options['team_seasons']
+
+        if options['players']:
+            self._rebuild_player_stats(team_season_ids)
+            return
+
+        if not options['verify']:
+            count = TeamSeasonSummary.rebuild(team_season_ids)
+            self.stdout.write(f'Rebuilt {count} season summaries.')
+            self._rebuild_player_stats(team_season_ids)
+
+        drift = TeamSeasonSummary.find_drift(team_season_ids)
+        for team_season_id, diffs in drift.items():
+            details = ', '.join(f'{field}: stored {stored}, actual {actual}' for field, (stored, actual) in diffs.items())
+            self.stdout.write(self.style.ERROR(f'TeamSeason {team_season_id}: {details}'))
+
+        if drift:
+            raise CommandError(f'{len(drift)} season summaries out of date (run without --verify to rebuild)')
+        self.stdout.write(self.style.SUCCESS('Season summaries verified.'))
+
+    def _rebuild_player_stats(self, team_season_ids):
+        seasons = TeamSeason.objects.all()
+        if team_season_ids:
+            seasons = seasons.filter(id__in=team_season_ids)
+        rows = sum(PlayerSeasonStats.refresh(team_season_id) for team_season_id in seasons.values_list('id', flat=True))
+        self.stdout.write(f'Rebuilt {rows} player season stats.')
@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from core.services.sync_jobs import claim_job, run_job, fail_stale_jobs
+
+class Command(BaseCommand):
+    help = 'Run queued Google Sheets sync jobs (use with SYNC_JOB_RUNNER=worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process queued jobs, then exit')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls when idle')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Sync worker started.')
+
+        while True:
+            fail_stale_jobs()
+            job = claim_job()
+
+            if job:
+                self.stdout.write(f'Running sync job #{job.id} for {job.team_season}...')
+                run_job(job)
+                style = self.style.SUCCESS if job.status == 'succeeded' else self.style.ERROR
+                self.stdout.write(style(f'Sync job #{job.id} {job.status}'))
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
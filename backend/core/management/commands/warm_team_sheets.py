@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from core.services.sheet_renderer import LAYOUTS, SCALES
+from core.services.team_sheets import match_sheet, prune_sheets, upcoming_matches
+
+class Command(BaseCommand):
+    help = 'Pre-render team sheet PNGs for fixtures in the next few days (run e.g. hourly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Fixtures from today through this many days ahead (default 7)')
+        parser.add_argument('--scale', type=float, action='append', dest='scales', help=f'Scale to render, one of {list(SCALES)} (repeatable, default 1)')
+
+    def handle(self, *args, **options):
+        scales = [int(s) if float(s).is_integer() else s for s in (options['scales'] or [1]) if s in SCALES]
+
+        rendered = 0
+        failed = 0
+        matches = upcoming_matches(options['days'])
+        for match in matches:
+            for layout in LAYOUTS:
+                for scale in scales:
+                    try:
+                        match_sheet(match, layout, scale)
+                        rendered += 1
+                    except Exception as e:
+                        failed += 1
+                        self.stdout.write(self.style.ERROR(f'{match.name} ({layout}, x{scale}): {e}'))
+
+        pruned = prune_sheets()
+        self.stdout.write(self.style.SUCCESS(f'Warmed {rendered} sheets for {len(matches)} fixtures ({failed} failed), pruned {pruned} old sheets.'))
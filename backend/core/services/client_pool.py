@@ -0,0 +1,113 @@
+"""
+Process-wide pool for the Google Sheets connection.
+
+Holds the OAuth credentials in memory (reloaded only when token.json changes on
+disk, refreshed only when close to expiry), a single authorized gspread client
+whose HTTP session keeps connections alive, and Spreadsheet handles cached by
+key for a short TTL. One pool exists per worker process.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import gspread
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+# Refresh the access token this long before it actually expires
+REFRESH_MARGIN = timedelta(minutes=5)
+SPREADSHEET_TTL = 300
+
+
+class GoogleClientPool:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Drops credentials, client and cached spreadsheets (e.g. after logout/re-auth)"""
+        with self._lock:
+            self._credentials = None
+            self._token_file = None
+            self._token_mtime = None
+            self._client = None
+            self._spreadsheets = {} # key -> (opened_at, Spreadsheet)
+
+    def get_credentials(self, token_file, scopes):
+        """Returns valid credentials, loading token_file only when it has changed"""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(token_file)
+            except OSError:
+                # Token removed (revoked here or by another worker)
+                if self._credentials is not None:
+                    self.reset()
+                return None
+
+            if self._credentials is None or token_file != self._token_file or mtime != self._token_mtime:
+                try:
+                    credentials = Credentials.from_authorized_user_file(token_file, scopes)
+                except Exception as e:
+                    print(f"Error loading credentials: {e}")
+                    return None
+                self.reset()
+                self._credentials = credentials
+                self._token_file = token_file
+                self._token_mtime = mtime
+
+            credentials = self._credentials
+            if self._needs_refresh(credentials):
+                if not credentials.refresh_token:
+                    return None
+                try:
+                    credentials.refresh(Request())
+                    with open(token_file, 'w') as token:
+                        token.write(credentials.to_json())
+                    self._token_mtime = os.path.getmtime(token_file)
+                except Exception as e:
+                    print(f"Error refreshing credentials: {e}")
+                    return None
+
+            return credentials
+
+    def get_client(self, token_file, scopes):
+        """Returns the shared authorized gspread client, or None if not authenticated"""
+        with self._lock:
+            credentials = self.get_credentials(token_file, scopes)
+            if credentials is None:
+                return None
+            if self._client is None:
+                # The client's AuthorizedSession reuses connections across calls
+                self._client = gspread.authorize(credentials)
+            return self._client
+
+    def open_spreadsheet(self, token_file, scopes, key):
+        """Returns a Spreadsheet handle for key, reusing one opened within SPREADSHEET_TTL"""
+        with self._lock:
+            client = self.get_client(token_file, scopes)
+            if client is None:
+                return None
+
+            cached = self._spreadsheets.get(key)
+            if cached and time.monotonic() - cached[0] < SPREADSHEET_TTL:
+                return cached[1]
+
+        # Open outside the lock so one slow request doesn't block other threads
+        spreadsheet = client.open_by_key(key)
+        with self._lock:
+            self._spreadsheets[key] = (time.monotonic(), spreadsheet)
+        return spreadsheet
+
+    def _needs_refresh(self, credentials):
+        if not credentials.token:
+            return True
+        if not credentials.expiry:
+            return False
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return credentials.expiry - now < REFRESH_MARGIN
+
+
+google_client_pool = GoogleClientPool()
@@ -0,0 +1,77 @@
+from api.models import Match, MatchFormat, bulk_update_touched
+
+DEFAULT_FORMAT_NAME = 'Standard 15s'
+DEFAULT_PERIODS_CONFIG = [[1, "B"]]
+
+
+def col_letter_to_index(col_letter):
+    """Converts a column letter (e.g. 'B', 'AB') to a 0-based index"""
+    num = 0
+    for c in col_letter:
+        if c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+            num = num * 26 + (ord(c) - ord('A')) + 1
+    return num - 1
+
+
+class FormatResolver:
+    """
+    Detects a match worksheet's MatchFormat from its template string (cell B1).
+
+    Built once per sync from a single MatchFormat query, with each format's
+    column_config precomputed to (period, column index) pairs and template
+    lookups memoized. Format changes are queued by apply() and written
+    together by flush(), only for matches whose format actually changed.
+    """
+
+    def __init__(self):
+        self.formats = list(MatchFormat.objects.order_by('id'))
+        self.default = next((fmt for fmt in self.formats if fmt.name == DEFAULT_FORMAT_NAME), None)
+
+        self._periods = {
+            fmt.id: self._periods_for(fmt.column_config or DEFAULT_PERIODS_CONFIG)
+            for fmt in self.formats
+        }
+        self._default_periods = self._periods_for(DEFAULT_PERIODS_CONFIG)
+        self._memo = {}     # template string -> MatchFormat or None
+        self._changed = {}  # match id -> Match with a new format
+
+        # Detection config; part of match digests so config changes force a re-import
+        self.signature = [[fmt.id, fmt.name, fmt.spreadsheet_key, fmt.column_config] for fmt in self.formats]
+
+    def _periods_for(self, column_config):
+        return [(period_num, col_letter_to_index(col_letter)) for period_num, col_letter in column_config]
+
+    def resolve(self, template_type):
+        """Returns the MatchFormat for a template string (falling back to Standard 15s), or None"""
+        if template_type not in self._memo:
+            selected_format = next(
+                (fmt for fmt in self.formats if fmt.spreadsheet_key and fmt.spreadsheet_key in template_type),
+                self.default
+            )
+            self._memo[template_type] = selected_format
+        return self._memo[template_type]
+
+    def periods(self, selected_format):
+        """[(period_num, name column index)] for a format (column B if none)"""
+        if selected_format is None:
+            return self._default_periods
+        return self._periods[selected_format.id]
+
+    def apply(self, match, template_type):
+        """
+        Resolves the format for a match's template and queues a write if it changed.
+        Returns the detected MatchFormat (or None).
+        """
+        selected_format = self.resolve(template_type)
+        if selected_format and match.format_id != selected_format.id:
+            match.format = selected_format
+            self._changed[match.id] = match
+        return selected_format
+
+    def flush(self):
+        """Writes queued format changes in one batch. Returns the number updated."""
+        if not self._changed:
+            return 0
+        count = bulk_update_touched(Match, self._changed.values(), ['format'])
+        self._changed = {}
+        return count
@@ -6,10 +6,8 @@ Handles user authentication flow and token management
 import os
 import json
 from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-import gspread
 from django.conf import settings
+from .client_pool import google_client_pool
 
 class OAuthService:
     def __init__(self):
@@ -47,43 +45,29 @@ class OAuthService:
         )
     
     def get_credentials(self):
-        """Get credentials from token file"""
-        if os.path.exists(self.token_file):
-            try:
-                credentials = Credentials.from_authorized_user_file(self.token_file, self.scopes)
-                if credentials.valid:
-                    return credentials
-                elif credentials.expired and credentials.refresh_token:
-                    try:
-                        credentials.refresh(Request())
-                        with open(self.token_file, 'w') as token:
-                            token.write(credentials.to_json())
-                        return credentials
-                    except Exception as e:
-                        print(f"Error refreshing credentials: {e}")
-                        return None
-            except Exception as e:
-                 print(f"Error loading credentials: {e}")
-                 return None
-        return None
+        """Get credentials (held in memory by the process-wide pool, refreshed near expiry)"""
+        return google_client_pool.get_credentials(self.token_file, self.scopes)
     
     def save_credentials(self, credentials):
         """Save credentials to token file"""
         # Also save to file for persistence
         with open(self.token_file, 'w') as token:
             token.write(credentials.to_json())
+        google_client_pool.reset()
     
     def get_sheets_client(self):
-        """Get authenticated Google Sheets client"""
-        credentials = self.get_credentials()
-        if credentials:
-            return gspread.authorize(credentials)
-        return None
+        """Get authenticated Google Sheets client (shared per process)"""
+        return google_client_pool.get_client(self.token_file, self.scopes)
+    
+    def open_spreadsheet(self, spreadsheet_id):
+        """Get a Spreadsheet handle, reused across requests for a short TTL"""
+        return google_client_pool.open_spreadsheet(self.token_file, self.scopes, spreadsheet_id)
     
     def revoke_credentials(self):
         """Revoke stored credentials"""
         if os.path.exists(self.token_file):
             os.remove(self.token_file)
+        google_client_pool.reset()
     
     def is_authenticated(self):
         """Check if user is authenticated"""
@@ -0,0 +1,128 @@
+"""
+In-memory index of the player headshots in static/players.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+
+SILHOUETTE_PATH = 'pitch-assets/player-silhouette.png'
+
+# Safety net: also rescan periodically, since adding head.png inside an existing
+# player folder doesn't change the players directory's own mtime
+INDEX_MAX_AGE = 300
+# Names are client-supplied, so only hits are memoized and the memo is bounded
+MEMO_MAX_SIZE = 2048
+
+
+def image_candidates(player_name):
+    """Image paths (relative to static/players) to try for a player, in priority order"""
+    clean_name = player_name.lower().replace("'", "")
+    parts = clean_name.split()
+
+    candidates = []
+
+    # Strategy 1: Subdirectories
+    if len(parts) >= 2:
+        surname = parts[-1]
+        forename = parts[0]
+        candidates.append(f"{surname}-{forename}/head.png")
+        candidates.append(f"{forename}-{surname}/head.png")
+
+    # Strategy 2: Flat file
+    slugified = clean_name.replace(' ', '-')
+    candidates.append(f"{slugified}.png")
+    return candidates
+
+
+class PlayerImageIndex:
+    """
+    Lists static/players once and resolves names with dictionary lookups.
+    Keys are lower-cased relative paths (`surname-forename/head.png`,
+    `name.png`), so resolving a squad costs no filesystem probes. The index is
+    rebuilt when the directory's mtime changes (one stat per lookup batch).
+    version() changes whenever a rebuild finds an image added, removed or
+    replaced.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir or os.path.join(settings.BASE_DIR, 'static', 'players')
+        self._lock = threading.Lock()
+        self._paths = None    # lower-cased relative path -> actual relative path
+        self._mtime = None
+        self._built_at = 0
+        self._version = None  # hash of every indexed path and its mtime
+        self._memo = {}       # player name -> 'players/...' (hits only)
+
+    def _scan(self):
+        """({lower-cased path: path}, {path: mtime_ns}) for the images in base_dir"""
+        paths = {}
+        mtimes = {}
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except OSError:
+            return paths, mtimes
+
+        for entry in entries:
+            if entry.is_dir():
+                try:
+                    mtime = os.stat(os.path.join(entry.path, 'head.png')).st_mtime_ns
+                except OSError:
+                    continue
+                rel_path = f"{entry.name}/head.png"
+            elif entry.name.lower().endswith('.png'):
+                rel_path = entry.name
+                mtime = entry.stat().st_mtime_ns
+            else:
+                continue
+            paths[rel_path.lower()] = rel_path
+            mtimes[rel_path] = mtime
+        return paths, mtimes
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.base_dir).st_mtime
+        except OSError:
+            mtime = None
+
+        if self._paths is None or mtime != self._mtime or time.monotonic() - self._built_at > INDEX_MAX_AGE:
+            self._paths, mtimes = self._scan()
+            self._version = hashlib.sha256(repr(sorted(mtimes.items())).encode('utf-8')).hexdigest()[:16]
+            self._mtime = mtime
+            self._built_at = time.monotonic()
+            self._memo = {}
+
+    def resolve_many(self, player_names):
+        """{name: 'players/<relative path>' or None} for each name"""
+        with self._lock:
+            self._refresh()
+            results = {}
+            for name in player_names:
+                found = self._memo.get(name)
+                if found is None:
+                    # A miss is a few dict lookups; don't let unknown names fill the memo
+                    found = next(
+                        (f"players/{self._paths[c]}" for c in image_candidates(name) if c in self._paths),
+                        None
+                    )
+                    if found is not None:
+                        if len(self._memo) >= MEMO_MAX_SIZE:
+                            self._memo.clear()
+                        self._memo[name] = found
+                results[name] = found
+            return results
+
+    def resolve(self, player_name):
+        return self.resolve_many([player_name])[player_name]
+
+    def version(self):
+        """Changes when the set of images, or any image file, changes"""
+        with self._lock:
+            self._refresh()
+            return self._version
+
+
+player_image_index = PlayerImageIndex()
@@ -0,0 +1,58 @@
+from api.models import Player, PlayerAlias
+
+
+def normalize_name(name):
+    """Normalizes a sheet name for lookups: trimmed, single-spaced, case-insensitive"""
+    return ' '.join((name or '').split()).casefold()
+
+
+class PlayerResolver:
+    """
+    Resolves sheet player names to Player IDs from an in-memory index.
+
+    Built once per sync from two queries (players and aliases). Names that are
+    not recognised are queued and created together by flush(), so resolving a
+    whole grid costs O(1) dictionary hits instead of queries per cell.
+    """
+
+    def __init__(self):
+        self._ids = {}      # normalized name -> player id
+        self._pending = {}  # normalized name -> unsaved Player
+
+        # Direct names win over aliases; first by id wins on duplicates
+        for player_id, name in Player.objects.order_by('id').values_list('id', 'name'):
+            self._ids.setdefault(normalize_name(name), player_id)
+
+        for name, player_id in PlayerAlias.objects.order_by('id').values_list('name', 'player_id'):
+            self._ids.setdefault(normalize_name(name), player_id)
+
+    def resolve(self, name, **defaults):
+        """
+        Returns the Player ID for a sheet name, or None if the player is new.
+        New names are queued for creation (with `defaults`) until flush().
+        """
+        key = normalize_name(name)
+        if not key:
+            return None
+
+        player_id = self._ids.get(key)
+        if player_id is None and key not in self._pending:
+            print(f"Creating Player: {name.strip()}")
+            self._pending[key] = Player(name=name.strip(), **defaults)
+        return player_id
+
+    def get_id(self, name):
+        """Returns the Player ID for a name once flush() has run"""
+        return self._ids.get(normalize_name(name))
+
+    def flush(self):
+        """Creates all queued players in one batch. Returns the number created."""
+        if not self._pending:
+            return 0
+
+        created = Player.objects.bulk_create(self._pending.values())
+        for key, player in zip(self._pending.keys(), created):
+            self._ids[key] = player.id
+
+        self._pending = {}
+        return len(created)
@@ -0,0 +1,522 @@
+"""
+Server-side team sheet graphics.
+
+A Pillow port of the Standard (1000x1250) and Mobile (1080x2160) SVG layouts in
+TeamSheetPreview.jsx, drawn from the same payload as `GET /matches/{id}/team/`.
+Rendered PNGs are written to SHEET_CACHE_DIR under a hash of everything that
+affects the pixels (payload, layout, options, player image versions and the
+renderer version), so asking for an unchanged sheet again is a file read.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+
+from django.conf import settings
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from .player_images import player_image_index
+from .thumbnails import get_thumbnail, thumbnail_digest, ThumbnailError
+
+# Bump when the drawing code changes so cached sheets are re-rendered
+RENDERER_VERSION = 1
+
+LAYOUTS = {
+    'standard': (1000, 1250),
+    'mobile': (1080, 2160),
+}
+SCALES = (0.5, 1, 2)
+NAME_FORMATS = ('initial', 'surname', 'full')
+
+# Optional raster crest; the SVG crest used by the browser can't be drawn by Pillow
+CREST_PATH = 'pitch-assets/crest.png'
+
+# Common bold sans-serif fonts, tried in order when SHEET_FONT_PATH isn't set
+FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf',
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf',
+    '/Library/Fonts/Arial Bold.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Bold.ttf',
+    'C:\\Windows\\Fonts\\arialbd.ttf',
+)
+
+POSITIONS = [
+    # (label, role, cx, cy) on the same 0-100 grid as the frontend
+    ('1', 'Loosehead Prop', 30, 18),
+    ('2', 'Hooker', 50, 18),
+    ('3', 'Tighthead Prop', 70, 18),
+    ('4', '2nd Row', 40, 30),
+    ('5', '2nd Row', 60, 30),
+    ('6', 'Blindside Flanker', 25, 40),
+    ('7', 'Openside Flanker', 75, 40),
+    ('8', 'Number 8', 50, 45),
+    ('9', 'Scrum Half', 35, 58),
+    ('10', 'Fly Half', 55, 65),
+    ('11', 'Left Wing', 15, 72),
+    ('12', 'Inside Centre', 40, 75),
+    ('13', 'Outside Centre', 65, 78),
+    ('14', 'Right Wing', 90, 81),
+    ('15', 'Full Back', 50, 92),
+]
+
+# Palette
+BACKGROUND = '#022c22'
+PITCH_TOP = '#064e3b'
+GOLD = '#FFD700'
+RED = '#EE0000'
+GREEN = '#10b981'
+AVATAR_BG = '#0f172a'
+WHITE = (255, 255, 255, 255)
+
+# Legacy kit shortcuts stored in Match.notes
+KIT_TEXT = {
+    'None': '',
+    'Number 1s': "Number 1's post match",
+    'Polos': 'Polos and Chinos post match',
+}
+
+
+def _rgba(color, alpha=1.0):
+    if isinstance(color, tuple):
+        return color[:3] + (int(round(255 * alpha)),)
+    color = color.lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4)) + (int(round(255 * alpha)),)
+
+
+@lru_cache(maxsize=None)
+def _font_path():
+    configured = getattr(settings, 'SHEET_FONT_PATH', None)
+    if configured and os.path.exists(configured):
+        return configured
+    return next((path for path in FONT_CANDIDATES if os.path.exists(path)), None)
+
+
+@lru_cache(maxsize=64)
+def _font(size):
+    path = _font_path()
+    if path:
+        return ImageFont.truetype(path, size)
+    # Pillow's bundled scalable font
+    return ImageFont.load_default(size)
+
+
+def parse_opponent(match_name):
+    """'3: Crewe (H)' -> 'Crewe'"""
+    if not match_name:
+        return ''
+    match = re.match(r'^\d+:\s*(.+?)\s*\([HA]\)$', match_name, re.IGNORECASE)
+    return match.group(1).strip() if match else match_name
+
+
+def format_player_name(name, name_format='initial', is_captain=False):
+    if not name:
+        return 'TBA'
+    parts = name.split(' ')
+    if name_format == 'surname' and len(parts) > 1:
+        formatted = ' '.join(parts[1:])
+    elif name_format == 'initial' and len(parts) > 1:
+        formatted = parts[0][:1] + '. ' + ' '.join(parts[1:])
+    else:
+        formatted = name
+    return formatted.upper() + (' (C)' if is_captain else '')
+
+
+def format_sheet_date(value):
+    """'2025-09-13' -> 'SAT 13 SEP 2025'"""
+    try:
+        date = datetime.strptime(value, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return ''
+    return f"{date:%a} {date.day} {date:%b %Y}".upper()
+
+
+class SheetRenderer:
+    """
+    Draws one team sheet. `data` is the manage_team GET payload.
+    Coordinates below are in SVG user units; `scale` maps them to pixels.
+    """
+
+    def __init__(self, data, layout='standard', scale=1, name_format='initial'):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}'")
+        self.data = data
+        self.layout = layout
+        self.scale = scale
+        self.name_format = name_format
+
+        fixture_info = data.get('fixture_info') or {}
+        metadata = data.get('metadata') or {}
+
+        self.starters = data.get('starters') or []
+        self.finishers = [p for p in (data.get('finishers') or []) if p and p.get('name')]
+        self.featured_player = metadata.get('featured_player') or ''
+        label = metadata.get('featured_label') or 'Captain'
+        self.featured_label = label if self.featured_player else ''
+        self.title = (metadata.get('team_sheet_title') or fixture_info.get('team_name') or 'Match Day').upper()
+        self.opponent = fixture_info.get('opponent_name') or parse_opponent(data.get('match_name') or '') or 'OPPONENT'
+        self.date_text = format_sheet_date(fixture_info.get('match_date'))
+        self.kickoff = metadata.get('kickoff') or 'TBC'
+        self.meet_time = metadata.get('meet_time') or ''
+        self.location = (metadata.get('location') or 'TBC').upper()
+        notes = metadata.get('notes') or ''
+        self.kit_text = KIT_TEXT.get(notes, notes)
+
+        self.images = resolve_sheet_images(data)
+
+    # --- Primitives -------------------------------------------------------
+
+    def _p(self, value):
+        return int(round(value * self.scale))
+
+    def _box(self, x0, y0, x1, y1):
+        return [self._p(x0), self._p(y0), self._p(x1), self._p(y1)]
+
+    def _rect(self, x, y, w, h, fill=None, outline=None, width=1, radius=0):
+        box = self._box(x, y, x + w, y + h)
+        if radius:
+            self.draw.rounded_rectangle(box, radius=self._p(radius), fill=fill, outline=outline, width=max(1, self._p(width)) if outline else 0)
+        else:
+            self.draw.rectangle(box, fill=fill, outline=outline, width=max(1, self._p(width)) if outline else 0)
+
+    def _circle(self, cx, cy, r, fill=None, outline=None, width=1):
+        self.draw.ellipse(
+            self._box(cx - r, cy - r, cx + r, cy + r),
+            fill=fill, outline=outline, width=max(1, self._p(width)) if outline else 0
+        )
+
+    def _line(self, x0, y0, x1, y1, fill, width=1, dash=None):
+        width = max(1, self._p(width))
+        if not dash:
+            self.draw.line(self._box(x0, y0, x1, y1), fill=fill, width=width)
+            return
+
+        # Dashed horizontal/vertical lines (the only kind on the pitch)
+        on, off = dash
+        length = abs(x1 - x0) + abs(y1 - y0)
+        dx = (x1 - x0) / length if length else 0
+        dy = (y1 - y0) / length if length else 0
+        pos = 0
+        while pos < length:
+            end = min(pos + on, length)
+            self.draw.line(self._box(x0 + dx * pos, y0 + dy * pos, x0 + dx * end, y0 + dy * end), fill=fill, width=width)
+            pos += on + off
+
+    def _text_width(self, text, size, spacing=0):
+        font = _font(self._p(size))
+        if not spacing:
+            return font.getlength(text)
+        return sum(font.getlength(ch) for ch in text) + self._p(spacing) * max(0, len(text) - 1)
+
+    def _text(self, x, y, text, size, fill=WHITE, align='left', spacing=0):
+        """Draws text with its baseline at y (like SVG). Returns the end x in SVG units."""
+        if not text:
+            return x
+        font = _font(self._p(size))
+        width = self._text_width(text, size, spacing)
+        px = self._p(x)
+        if align == 'center':
+            px -= width / 2
+        elif align == 'right':
+            px -= width
+
+        if not spacing:
+            self.draw.text((px, self._p(y)), text, font=font, fill=fill, anchor='ls')
+        else:
+            for ch in text:
+                self.draw.text((px, self._p(y)), ch, font=font, fill=fill, anchor='ls')
+                px += font.getlength(ch) + self._p(spacing)
+        return (px + (0 if spacing else width)) / self.scale if align == 'left' else x
+
+    def _wrap(self, text, width, size):
+        """Greedy word wrap measured with the real font"""
+        words = str(text).split()
+        if not words:
+            return []
+        lines = [words[0]]
+        for word in words[1:]:
+            candidate = f"{lines[-1]} {word}"
+            if self._text_width(candidate, size) <= self._p(width):
+                lines[-1] = candidate
+            else:
+                lines.append(word)
+        return lines
+
+    def _wrapped_text(self, x, y, text, width, size, fill=WHITE, align='left', line_height=1.2):
+        lines = self._wrap(text, width, size)
+        for i, line in enumerate(lines):
+            self._text(x, y + i * size * line_height, line, size, fill=fill, align=align)
+        return len(lines)
+
+    def _vertical_gradient(self, x, y, w, h, top, bottom):
+        box = self._box(x, y, x + w, y + h)
+        size = (box[2] - box[0], box[3] - box[1])
+        mask = Image.linear_gradient('L').resize(size)
+        layer = Image.composite(Image.new('RGBA', size, bottom), Image.new('RGBA', size, top), mask)
+        self.image.paste(layer, (box[0], box[1]), layer)
+
+    def _avatar(self, cx, cy, radius, image_path):
+        """Image cropped to a circle ('slice' fit), or the silhouette"""
+        if image_path is None:
+            self._silhouette(cx, cy, radius)
+            return
+
+        diameter = self._p(radius * 2)
+        try:
+            path, _, _ = get_thumbnail(image_path, diameter, 'png')
+            with Image.open(path) as source:
+                avatar = ImageOps.fit(source.convert('RGBA'), (diameter, diameter), Image.Resampling.LANCZOS)
+        except (ThumbnailError, OSError):
+            self._silhouette(cx, cy, radius)
+            return
+
+        mask = Image.new('L', (diameter, diameter), 0)
+        ImageDraw.Draw(mask).ellipse([0, 0, diameter - 1, diameter - 1], fill=255)
+        self.image.paste(avatar, (self._p(cx - radius), self._p(cy - radius)), mask=Image.composite(avatar.getchannel('A'), mask, mask))
+
+    def _silhouette(self, cx, cy, radius):
+        # The frontend's 60x60 silhouette symbol, scaled to the avatar
+        k = radius / 28
+        fill = _rgba(WHITE, 0.15)
+        self._circle(cx, cy - 6 * k, 10 * k, fill=fill)
+        self.draw.pieslice(self._box(cx - 22 * k, cy + 8 * k, cx + 22 * k, cy + 40 * k), 180, 360, fill=fill)
+
+    def _crest(self, x, y, size):
+        path = os.path.join(settings.BASE_DIR, 'static', CREST_PATH)
+        if not os.path.exists(path):
+            return
+        with Image.open(path) as crest:
+            crest = crest.convert('RGBA')
+            crest.thumbnail((self._p(size), self._p(size)), Image.Resampling.LANCZOS)
+            # 'meet': centre inside the box
+            offset = (self._p(x) + (self._p(size) - crest.width) // 2, self._p(y) + (self._p(size) - crest.height) // 2)
+            self.image.paste(crest, offset, crest)
+
+    # --- Shared pieces ----------------------------------------------------
+
+    def _player(self, x, y, k, index):
+        """One starter token centred at (x, y); k scales the token (Mobile draws the pitch at 1.15x)"""
+        label, role, _, _ = POSITIONS[index]
+        starter = self.starters[index] if index < len(self.starters) else None
+        name = starter.get('name') if starter else None
+        is_featured = bool(self.featured_player and name == self.featured_player)
+
+        if is_featured:
+            self._circle(x, y, 38 * k, fill=_rgba(GREEN, 0.4))
+        self._circle(
+            x, y, 32 * k,
+            fill=_rgba(GREEN) if is_featured else _rgba((15, 23, 42), 0.9),
+            outline=WHITE if is_featured else _rgba(WHITE, 0.3), width=2 * k
+        )
+        self._circle(x, y, 28 * k, fill=_rgba(AVATAR_BG))
+        self._avatar(x, y, 28 * k, self.images.get(name) if name else None)
+
+        # Position badge
+        self._circle(x + 26 * k, y - 26 * k, 12 * k, fill=WHITE, outline=_rgba(PITCH_TOP), width=k)
+        self._text(x + 26 * k, y - 22 * k, label, 10 * k, fill=_rgba(PITCH_TOP), align='center')
+
+        # Name plate
+        self._rect(
+            x - 65 * k, y + 32 * k, 130 * k, 32 * k, radius=4 * k, fill=_rgba((0, 0, 0), 0.85),
+            outline=_rgba(GREEN) if is_featured else None, width=k
+        )
+        is_captain = is_featured and self.featured_label == 'Captain'
+        self._text(x, y + 48 * k, format_player_name(name, self.name_format, is_captain), 12 * k, align='center')
+        self._text(x, y + 60 * k, role.upper(), 8 * k, align='center', spacing=k)
+
+    def _header_overlay(self, w, h):
+        # rgba(0,0,0,0.5) fading to transparent
+        self._vertical_gradient(0, 0, w, h, _rgba((0, 0, 0), 0.5), _rgba((0, 0, 0), 0))
+
+    # --- Layouts ----------------------------------------------------------
+
+    def render(self):
+        width, height = LAYOUTS[self.layout]
+        # RGB canvas: Pillow only blends translucent fills when drawing onto RGB
+        self.image = Image.new('RGB', (self._p(width), self._p(height)), _rgba(BACKGROUND)[:3])
+        self.draw = ImageDraw.Draw(self.image, 'RGBA')
+
+        if self.layout == 'mobile':
+            self._render_mobile()
+        else:
+            self._render_standard()
+        return self.image
+
+    def _render_standard(self):
+        # Pitch
+        self._vertical_gradient(0, 0, 750, 1250, _rgba(PITCH_TOP), _rgba(BACKGROUND))
+        line = _rgba(WHITE, 0.25)
+        self._rect(20, 20, 710, 1210, outline=_rgba(WHITE, 0.25 * 0.3), width=1)
+        for y, w in ((80, 1), (1170, 1), (140, 3), (1110, 3), (280, 2), (970, 2), (625, 3)):
+            self._line(20, y, 730, y, line, width=w)
+        for y in (360, 890):
+            self._line(20, y, 730, y, line, width=2, dash=(10, 10))
+        for x in (100, 220, 530, 650):
+            self._line(x, 140, x, 1110, _rgba(WHITE, 0.25 * 0.5), width=2, dash=(5, 15))
+        self._line(355, 190, 395, 190, line, width=2)
+        self._line(355, 1060, 395, 1060, line, width=2)
+
+        # Header
+        self._rect(0, 0, 1000, 150, fill=_rgba(BACKGROUND))
+        self._header_overlay(1000, 150)
+        self._text(40, 45, self.title, 14, fill=_rgba(GOLD), spacing=3)
+        end = self._text(40, 95, 'Vs ', 52, fill=_rgba(RED))
+        self._text(end, 95, self.opponent, 52)
+
+        self._rect(40, 110, 720, 1, fill=_rgba(WHITE, 0.2))
+        self._text(40, 135, self.date_text, 12)
+        self._text(170, 135, f"KO: {self.kickoff}  |  MEET: {self.meet_time or 'TBC'}", 12, fill=_rgba(WHITE, 0.9))
+        # Location pin
+        self._circle(347, 132, 7, fill=_rgba(GREEN))
+        self._circle(347, 132, 3, fill=_rgba(BACKGROUND))
+        self._text(358, 135, self.location, 12, fill=_rgba(WHITE, 0.9))
+
+        # Starters
+        for index, (_, _, cx, cy) in enumerate(POSITIONS):
+            self._player(cx * 7.5 - 25, cy * 10.5 + 100, 1, index)
+
+        # Finishers
+        self._rect(780, 180, 200, 600, radius=8, fill=_rgba(WHITE, 0.05))
+        self._rect(780, 180, 200, 40, radius=8, fill=_rgba(BACKGROUND))
+        self._text(880, 205, 'FINISHERS', 16, align='center', spacing=2)
+        for i, player in enumerate(self.finishers):
+            y = 260 + i * 35
+            self._circle(810, y - 4, 14, fill=_rgba(WHITE, 0.1))
+            self._text(810, y, str(i + 16), 12, fill=_rgba(GREEN), align='center')
+            self._text(835, y, format_player_name(player['name'], self.name_format), 13)
+
+        # Match instructions
+        self._wrapped_text(880, 830, self.kit_text, 200, 12, fill=_rgba(GOLD), align='center', line_height=1.3)
+
+        # Featured player
+        if self.featured_player:
+            self._circle(880, 985, 64, fill=_rgba(GREEN))
+            self._avatar(880, 985, 60, self.images.get(self.featured_player))
+            self._text(780, 1105, self.featured_label.upper(), 12, fill=_rgba(GOLD), spacing=3)
+            self._wrapped_text(780, 1145, self.featured_player.upper(), 200, 32, line_height=1.0)
+            self._line(780, 1230, 980, 1230, _rgba(RED), width=4)
+            self._line(780, 1238, 980, 1238, _rgba(GOLD), width=4)
+
+        self._crest(820, 15, 130)
+
+    def _render_mobile(self):
+        # Header
+        self._text(50, 80, self.title, 24, fill=_rgba(GOLD), spacing=4)
+        end = self._text(50, 150, 'Vs ', 72, fill=_rgba(RED))
+        self._text(end, 150, self.opponent, 72)
+        self._line(50, 180, 1030, 180, _rgba(WHITE, 0.2), width=2)
+        end = self._text(50, 210, f"{self.date_text}  |  " if self.date_text else '  |  ', 20)
+        self._text(end, 210, self.location, 20, fill=_rgba(GREEN))
+        self._text(1030, 210, f"KO: {self.kickoff}", 20, fill=_rgba(WHITE, 0.8), align='right')
+        self._crest(880, 20, 150)
+
+        # Pitch, drawn at 1.15x from (108, 220)
+        k = 1.15
+        ox, oy = 108, 220
+        self._vertical_gradient(ox, oy, 750 * k, 1100 * k, _rgba(PITCH_TOP), _rgba(BACKGROUND))
+        self._rect(ox + 20 * k, oy + 20 * k, 710 * k, 1060 * k, outline=_rgba(WHITE, 0.25 * 0.3), width=k)
+        self._line(ox + 20 * k, oy + 80 * k, ox + 730 * k, oy + 80 * k, _rgba(WHITE, 0.25), width=k)
+        self._text(ox + 375 * k, oy + 60 * k, 'STARTING LINEUP', 24 * k, fill=_rgba(WHITE, 0.7), align='center', spacing=4 * k)
+
+        for index, (_, _, cx, cy) in enumerate(POSITIONS):
+            y_offset = -50 if index <= 7 else (-10 if index <= 9 else 30)
+            self._player(ox + (cx * 7.5 - 25) * k, oy + (cy * 9.5 + y_offset + 50) * k, k, index)
+
+        # Finishers: up to 15 in 4 columns
+        finishers = self.finishers[:15]
+        rows = -(-max(1, len(finishers)) // 4)
+        panel_height = max(100, 60 + rows * 40)
+        self._rect(40, 1530, 1000, panel_height, radius=16, fill=_rgba(WHITE, 0.05))
+        self._rect(60, 1510, 200, 40, radius=8, fill=_rgba(GREEN))
+        self._text(160, 1535, 'FINISHERS', 20, fill=_rgba(BACKGROUND), align='center', spacing=2)
+        for i, player in enumerate(finishers):
+            x = 80 + (i % 4) * 235
+            y = 1580 + (i // 4) * 40
+            self._circle(x + 15, y - 5, 14, fill=_rgba(WHITE, 0.1))
+            self._text(x + 15, y, str(i + 16), 12, fill=_rgba(GREEN), align='center')
+            self._text(x + 38, y, format_player_name(player['name'], self.name_format), 16)
+
+        # Captain's orders
+        top = 1530 + panel_height + 80
+        self._rect(40, top, 1000, 380, radius=16, fill=_rgba(WHITE, 0.05))
+        self._rect(60, top - 20, 300, 40, radius=8, fill=_rgba(GOLD))
+        self._text(210, top + 5, "CAPTAIN'S ORDERS", 20, fill=_rgba(BACKGROUND), align='center', spacing=2)
+
+        if self.featured_player:
+            cx, cy = 220, top + 150
+            self._circle(cx, cy, 85, fill=_rgba(GREEN))
+            self._avatar(cx, cy, 28 * 2.8, self.images.get(self.featured_player))
+            self._text(cx, cy + 110, self.featured_label.upper(), 16, fill=_rgba(GOLD), align='center', spacing=1)
+            self._wrapped_text(cx, cy + 150, self.featured_player.upper(), 300, 36, align='center', line_height=1.0)
+
+        y = top + 65 + 24
+        if self.meet_time:
+            self._text(420, y, f"MEET: {self.meet_time}".upper(), 24, fill=_rgba(GOLD))
+            y += 24 * 1.2 + 10
+        self._wrapped_text(420, y, self.kit_text, 580, 24)
+
+
+def resolve_sheet_images(data):
+    """{player name: static path} for the starters and featured player that have a headshot"""
+    names = [p.get('name') for p in (data.get('starters') or []) if p and p.get('name')]
+    featured = (data.get('metadata') or {}).get('featured_player')
+    if featured:
+        names.append(featured)
+    return {name: path for name, path in player_image_index.resolve_many(names).items() if path}
+
+
+def sheet_cache_dir():
+    return getattr(settings, 'SHEET_CACHE_DIR', None) or os.path.join(settings.BASE_DIR, '.sheet_cache')
+
+
+def sheet_digest(data, layout, scale=1, name_format='initial'):
+    """Hash of everything that affects a rendered sheet"""
+    images = {}
+    for name, path in resolve_sheet_images(data).items():
+        try:
+            images[name] = thumbnail_digest(path, 512, 'png')
+        except ThumbnailError:
+            continue
+
+    key = json.dumps({
+        'version': RENDERER_VERSION,
+        'layout': layout,
+        'scale': scale,
+        'names': name_format,
+        'data': data,
+        'images': images,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def render_sheet(data, layout='standard', scale=1, name_format='initial', prefix='sheet'):
+    """
+    Returns (PNG path, digest) for a team sheet, rendering it only if this exact
+    sheet hasn't been rendered before. `prefix` groups files (e.g. per match).
+    """
+    digest = sheet_digest(data, layout, scale, name_format)
+    target = os.path.join(sheet_cache_dir(), f"{prefix}-{layout}-{digest}.png")
+    try:
+        # Mark it as in use so prune_sheets() keeps it
+        os.utime(target)
+        return target, digest
+    except FileNotFoundError:
+        pass
+
+    image = SheetRenderer(data, layout=layout, scale=scale, name_format=name_format).render()
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            image.save(tmp, 'PNG', optimize=True)
+        os.replace(tmp_path, target)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return target, digest
@@ -5,7 +5,39 @@ Handles data extraction and template detection logic
 
 import gspread
 import os
+import threading
+import time
 from .oauth_service import OAuthService
+from .worksheet_index import WorksheetIndex
+
+SELECTION_TAB = 'Selection'
+MATCH_RANGE = 'A1:AZ60'
+
+# Worksheet indexes cached per spreadsheet id: {id: (fetched_at, WorksheetIndex)}
+WORKSHEET_INDEX_TTL = 300
+_worksheet_indexes = {}
+# Names still unresolved after a refresh: {(spreadsheet id, name): refreshed_at}
+_worksheet_misses = {}
+_worksheet_indexes_lock = threading.Lock()
+
+
+class WorkbookSnapshot:
+    """
+    In-memory values of one spreadsheet fetch: the Selection tab grid plus the
+    A1:AZ60 grid of every match worksheet that was resolved.
+    """
+
+    def __init__(self, spreadsheet_id, index):
+        self.spreadsheet_id = spreadsheet_id
+        self.index = index            # WorksheetIndex from spreadsheet metadata
+        self.selection = None         # Selection tab rows (None if not fetched)
+        self.match_values = {}        # match id -> rows
+        self.match_titles = {}        # match id -> worksheet title
+        self.ambiguities = {}         # match name -> [candidate titles], first one used
+
+    def has_match(self, match):
+        return match.id in self.match_values
+
 
 class SheetsService:
     def __init__(self):
@@ -20,10 +52,12 @@ class SheetsService:
         """Initialize Google Sheets connection"""
         target_id = spreadsheet_id or self.sheet_id
         try:
-            client = self.oauth_service.get_sheets_client()
-            if client and target_id:
-                self.sheet = client.open_by_key(target_id)
-                print(f"Connected to Google Sheet: {target_id}")
+            if target_id:
+                # Handles are pooled per process, so repeat syncs skip open_by_key
+                sheet = self.oauth_service.open_spreadsheet(target_id)
+                if sheet:
+                    self.sheet = sheet
+                    print(f"Connected to Google Sheet: {target_id}")
         except Exception as e:
             error_str = str(e)
             print(f"Warning: Could not initialize Google Sheets ({target_id}): {error_str}")
@@ -63,14 +97,14 @@ class SheetsService:
             except Exception as e:
                 print(f"Warning: Could not fetch MATCH_LIST range: {e}")
                 # Fallback to worksheet names if MATCH_LIST doesn't exist
-                worksheets = [worksheet.title for worksheet in self.sheet.worksheets()]
+                worksheets = list(self.get_worksheet_index().titles)
                 print(f"Falling back to worksheet names: {worksheets}")
                 return worksheets
         except Exception as e:
             print(f"Warning: Could not fetch MATCH_LIST: {e}")
             # Fallback to worksheet names if MATCH_LIST doesn't exist
             try:
-                worksheets = [worksheet.title for worksheet in self.sheet.worksheets()]
+                worksheets = list(self.get_worksheet_index().titles)
                 print(f"Falling back to worksheet names: {worksheets}")
                 return worksheets
             except Exception as e2:
@@ -137,14 +171,16 @@ class SheetsService:
         
         players = []
         
-        for row in range(start_row, end_row + 1):
-            cell_address = f"{column}{row}"
-            player_name = worksheet.acell(cell_address).value
+        # One range read for the whole column slice (rows come back trimmed of trailing blanks)
+        values = worksheet.get(f"{column}{start_row}:{column}{end_row}")
+        
+        for offset, row_values in enumerate(values):
+            player_name = row_values[0] if row_values else ''
             
             if player_name and player_name.strip():  # Skip empty cells
                 players.append({
                     'name': player_name.strip(),
-                    'row': row,
+                    'row': start_row + offset,
                     'position': len(players) + 1  # Position based on order
                 })
         
@@ -155,18 +191,58 @@ class SheetsService:
         if not self.sheet:
             return None
         
-        # Try to find worksheet with exact match name
-        try:
-            return self.sheet.worksheet(match_name)
-        except gspread.exceptions.WorksheetNotFound:
-            pass
+        title = self.resolve_worksheet_title(match_name)
+        if not title:
+            return None
         
-        # If not found, try to find worksheet containing the match name
-        for worksheet in self.sheet.worksheets():
-            if match_name.lower() in worksheet.title.lower() or worksheet.title.lower() in match_name.lower():
-                return worksheet
+        # Build the Worksheet from cached metadata rather than another API call
+        properties = self.get_worksheet_index().properties(title)
+        return gspread.Worksheet(self.sheet, properties, self.sheet.id, self.sheet.client)
+
+    def get_worksheet_index(self, refresh=False):
+        """
+        Returns the WorksheetIndex for the current spreadsheet, cached with its
+        metadata for WORKSHEET_INDEX_TTL seconds and shared across instances.
+        """
+        spreadsheet_id = self.sheet.id
+        now = time.monotonic()
         
-        return None
+        with _worksheet_indexes_lock:
+            cached = _worksheet_indexes.get(spreadsheet_id)
+        if cached and not refresh and now - cached[0] < WORKSHEET_INDEX_TTL:
+            return cached[1]
+        
+        metadata = self.sheet.fetch_sheet_metadata(params={'fields': 'sheets.properties'})
+        index = WorksheetIndex.from_metadata(metadata)
+        with _worksheet_indexes_lock:
+            _worksheet_indexes[spreadsheet_id] = (now, index)
+        return index
+
+    def resolve_worksheet_title(self, match_name):
+        """
+        Resolves a match name via the cached index, refreshing it once on a miss
+        (new/renamed tab). A name that still misses isn't refetched again until
+        WORKSHEET_INDEX_TTL has passed, so fixtures without a tab yet cost one
+        metadata call per TTL rather than one per lookup.
+        """
+        title = self.get_worksheet_index().resolve(match_name)
+        if title is not None:
+            return title
+
+        miss_key = (self.sheet.id, match_name)
+        now = time.monotonic()
+        with _worksheet_indexes_lock:
+            missed_at = _worksheet_misses.get(miss_key)
+        if missed_at is not None and now - missed_at < WORKSHEET_INDEX_TTL:
+            return None
+
+        title = self.get_worksheet_index(refresh=True).resolve(match_name)
+        with _worksheet_indexes_lock:
+            if title is None:
+                _worksheet_misses[miss_key] = now
+            else:
+                _worksheet_misses.pop(miss_key, None)
+        return title
     
     def get_worksheet_metadata(self, worksheet_name):
         """Get metadata like kick-off time, location, etc."""
@@ -185,15 +261,34 @@ class SheetsService:
             raise ValueError(f"Worksheet not found for match: {worksheet_name}")
         
         # TODO: Define actual cell locations for metadata
+        cells = self.read_cells(worksheet, ['B2', 'B3', 'B4', 'B5'])
         metadata = {
-            'kickoff': worksheet.acell('B2').value if worksheet.acell('B2').value else '',
-            'meet_time': worksheet.acell('B3').value if worksheet.acell('B3').value else '',
-            'location': worksheet.acell('B4').value if worksheet.acell('B4').value else '',
-            'custom_title': worksheet.acell('B5').value if worksheet.acell('B5').value else ''
+            'kickoff': cells['B2'],
+            'meet_time': cells['B3'],
+            'location': cells['B4'],
+            'custom_title': cells['B5']
         }
         
         return metadata
 
+    def read_cells(self, worksheet, addresses):
+        """
+        Reads several cells/ranges of a worksheet in one request.
+        Returns {address: value} with '' for empty cells; for multi-cell ranges
+        the value is the list of rows.
+        """
+        if not addresses:
+            return {}
+        
+        value_ranges = worksheet.batch_get(list(addresses))
+        cells = {}
+        for address, rows in zip(addresses, value_ranges):
+            if ':' in address:
+                cells[address] = list(rows)
+            else:
+                cells[address] = rows[0][0] if rows and rows[0] else ''
+        return cells
+
     def get_fixture_info(self, fixture_name):
         """Get fixture info (home/away, date) from Selection tab by finding the column with the fixture name in row 1"""
         if not self.is_authenticated():
@@ -229,8 +324,9 @@ class SheetsService:
             col_letter = self._col_number_to_letter(col_number)
             
             # Get row 2 (home/away) and row 4 (date)
-            home_away = selection_ws.acell(f'{col_letter}2').value or ''
-            match_date = selection_ws.acell(f'{col_letter}4').value or ''
+            cells = self.read_cells(selection_ws, [f'{col_letter}2', f'{col_letter}4'])
+            home_away = cells[f'{col_letter}2']
+            match_date = cells[f'{col_letter}4']
             
             return {
                 'home_away': home_away.strip() if home_away else '',
@@ -248,6 +344,86 @@ class SheetsService:
             result = chr(65 + remainder) + result
         return result
 
+    # --- Fetch planner ---
+
+    def fetch_workbook(self, spreadsheet_id, matches=(), include_selection=True):
+        """
+        Fetches the Selection tab and the worksheets of `matches` for a spreadsheet.
+        Worksheet titles are resolved once from freshly fetched spreadsheet metadata
+        (which also refreshes the cached WorksheetIndex), then every range is pulled
+        in a single values_batch_get. Returns a WorkbookSnapshot, or None if the
+        spreadsheet could not be opened/read.
+        """
+        if not self.is_authenticated():
+            print("Warning: fetch_workbook called without auth")
+            return None
+
+        self._initialize_sheet(spreadsheet_id)
+        if not self.sheet:
+            return None
+
+        try:
+            index = self.get_worksheet_index(refresh=True)
+        except Exception as e:
+            print(f"Failed to read spreadsheet metadata: {e}")
+            return None
+
+        snapshot = WorkbookSnapshot(self.sheet.id, index)
+
+        if not self.extend_workbook(snapshot, matches, include_selection=include_selection):
+            return None
+        return snapshot
+
+    def extend_workbook(self, snapshot, matches, include_selection=False):
+        """
+        Adds the grids of any `matches` not yet in the snapshot (e.g. fixtures the
+        master data sync has just created) with one more values_batch_get.
+        Returns False if the fetch failed.
+        """
+        ranges = []
+        fetch_plan = [] # (match or None for Selection, title)
+
+        if include_selection:
+            ranges.append(self._a1_range(SELECTION_TAB))
+            fetch_plan.append((None, SELECTION_TAB))
+
+        for match in matches:
+            if snapshot.has_match(match):
+                continue
+            title = snapshot.index.resolve(match.name)
+            if title:
+                ranges.append(self._a1_range(title, MATCH_RANGE))
+                fetch_plan.append((match, title))
+                if match.name in snapshot.index.ambiguities:
+                    snapshot.ambiguities[match.name] = snapshot.index.ambiguities[match.name]
+            else:
+                print(f"  - Sheet not found for {match.name}")
+
+        if not ranges:
+            return True
+
+        print(f"Fetching {len(ranges)} ranges in one batch...")
+        try:
+            # Returns list of dicts: {'range': '...', 'majorDimension': 'ROWS', 'values': [...]}
+            results = self.sheet.values_batch_get(ranges).get('valueRanges', [])
+        except Exception as e:
+            print(f"Batch fetch failed: {e}")
+            return False
+
+        for (match, title), result in zip(fetch_plan, results):
+            values = result.get('values', [])
+            if match is None:
+                snapshot.selection = values
+            else:
+                snapshot.match_values[match.id] = values
+                snapshot.match_titles[match.id] = title
+        return True
+
+    def _a1_range(self, title, cells=None):
+        """Builds an A1 range for a worksheet title, quoting it for spaces/apostrophes"""
+        quoted = "'" + title.replace("'", "''") + "'"
+        return f"{quoted}!{cells}" if cells else quoted
+
     def batch_get_values(self, ranges):
         """Batch fetch values for multiple ranges"""
         if not self.is_authenticated():
@@ -0,0 +1,161 @@
+"""
+Process-wide Spond API client.
+
+Keeps one requests.Session with a pooled HTTPAdapter, and the login token in
+memory (shared with other worker processes through the Django cache). A 401
+triggers a single re-login: concurrent requests that hit the same expired
+token wait on one lock and reuse the new token instead of each logging in.
+"""
+
+import os
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "https://api.spond.com/core/v1"
+TOKEN_CACHE_KEY = 'spond_auth'
+TOKEN_CACHE_TTL = 3600
+REQUEST_TIMEOUT = 30
+
+
+class SpondAuthError(Exception):
+    pass
+
+
+class SpondClient:
+    def __init__(self):
+        self._lock = threading.Lock()       # protects token state
+        self._login_lock = threading.Lock() # single-flight login
+        self.session = self._build_session()
+        self._token = None
+        self._token_obtained_at = None # time.time() of the login that issued the token
+        self.refresh_count = 0         # logins performed by this process
+        self.login_failures = 0
+        self.last_error = None
+
+    def _build_session(self):
+        pool_size = getattr(settings, 'SPOND_SYNC_WORKERS', 4) * 2
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=max(pool_size, 10),
+            # Retry idempotent requests on transient gateway errors
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504], allowed_methods=['GET']),
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def reset(self):
+        """Forgets the token in this process and the shared cache"""
+        with self._lock:
+            self._token = None
+            self._token_obtained_at = None
+        cache.delete(TOKEN_CACHE_KEY)
+
+    # --- Auth ---
+
+    def get_token(self):
+        """Returns a token, logging in only if neither memory nor the cache has one"""
+        with self._lock:
+            if self._token:
+                return self._token
+
+        cached = cache.get(TOKEN_CACHE_KEY)
+        if cached:
+            with self._lock:
+                self._token = cached['token']
+                self._token_obtained_at = cached['obtained_at']
+            return cached['token']
+
+        return self._refresh(stale_token=None)
+
+    def _refresh(self, stale_token):
+        """
+        Logs in again unless another thread (or process, via the cache) already
+        replaced `stale_token`. Only one thread per process logs in at a time.
+        """
+        with self._login_lock:
+            with self._lock:
+                if self._token and self._token != stale_token:
+                    return self._token
+
+            cached = cache.get(TOKEN_CACHE_KEY)
+            if cached and cached['token'] != stale_token:
+                with self._lock:
+                    self._token = cached['token']
+                    self._token_obtained_at = cached['obtained_at']
+                return cached['token']
+
+            token = self._login()
+            obtained_at = time.time()
+            with self._lock:
+                self._token = token
+                self._token_obtained_at = obtained_at
+                self.refresh_count += 1
+            cache.set(TOKEN_CACHE_KEY, {'token': token, 'obtained_at': obtained_at}, TOKEN_CACHE_TTL)
+            return token
+
+    def _login(self):
+        username = getattr(settings, 'SPOND_USERNAME', os.environ.get('SPOND_USERNAME'))
+        password = getattr(settings, 'SPOND_PASSWORD', os.environ.get('SPOND_PASSWORD'))
+        if not username or not password:
+            self.login_failures += 1
+            self.last_error = "Spond credentials not configured (SPOND_USERNAME, SPOND_PASSWORD)"
+            raise SpondAuthError(self.last_error)
+
+        print("Logging in to Spond...")
+        try:
+            response = self.session.post(f"{BASE_URL}/login", json={'email': username, 'password': password}, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            token = response.json().get('loginToken')
+            if not token:
+                raise SpondAuthError("Spond login response had no loginToken")
+        except Exception as e:
+            self.login_failures += 1
+            self.last_error = str(e)
+            print(f"Spond Login Failed: {e}")
+            raise SpondAuthError(str(e)) from e
+
+        self.last_error = None
+        return token
+
+    # --- Requests ---
+
+    def request(self, method, path, **kwargs):
+        """Authenticated request to the Spond API; re-logs in once on a 401"""
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        token = self.get_token()
+        response = self._send(method, path, token, **kwargs)
+        if response.status_code == 401:
+            print("Spond token rejected (401), refreshing...")
+            token = self._refresh(stale_token=token)
+            response = self._send(method, path, token, **kwargs)
+        return response
+
+    def _send(self, method, path, token, **kwargs):
+        headers = {**kwargs.pop('headers', {}), 'Authorization': f'Bearer {token}'}
+        return self.session.request(method, f"{BASE_URL}{path}", headers=headers, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def metrics(self):
+        with self._lock:
+            obtained_at = self._token_obtained_at
+            authenticated = bool(self._token)
+        return {
+            'authenticated': authenticated,
+            'token_age_seconds': int(time.time() - obtained_at) if obtained_at else None,
+            'refresh_count': self.refresh_count,
+            'login_failures': self.login_failures,
+            'last_error': self.last_error,
+        }
+
+
+spond_client = SpondClient()
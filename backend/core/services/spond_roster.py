@@ -0,0 +1,77 @@
+"""
+Spond member -> Player lookup for a team, used to map event responses.
+"""
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from api.conditional import bump_version, namespace_version
+from api.models import Player
+
+ROSTER_CACHE_TTL = 600
+ROSTERS = 'spond_rosters' # Version namespace bumped by invalidate_rosters()
+
+
+def invalidate_rosters():
+    """Bumps the roster version so every cached index is rebuilt (call when Player.spond_id changes)"""
+    bump_version(ROSTERS)
+
+
+class SpondRosterIndex:
+    """
+    Maps Spond member ids to Player ids for a match's team.
+
+    Built from the team's Spond group members (team.spond_group_id), or, when
+    the team has no group, from the players already known to the TeamSeason.
+    Indexes are cached per group/season under a version key that
+    invalidate_rosters() bumps, so mapping a response costs a dict lookup
+    instead of a scan of every linked player in the club.
+    """
+
+    def __init__(self, spond_service):
+        self.spond_service = spond_service
+
+    def for_match(self, match):
+        """{spond member id: [player ids]} for the match's team"""
+        team_season = match.team_season
+        group_id = team_season.team.spond_group_id if team_season else None
+
+        if group_id:
+            scope = f"group:{group_id}"
+        elif team_season:
+            scope = f"team_season:{team_season.id}"
+        else:
+            return {}
+
+        key = f"spond_roster:{scope}:{namespace_version(ROSTERS)}"
+        index = cache.get(key)
+        if index is None:
+            if group_id:
+                index = self._build_for_group(group_id)
+                if index is None:
+                    # Member fetch failed (or came back empty): map nothing this
+                    # time, but don't cache it, so the next call retries
+                    return {}
+            else:
+                index = self._build_for_team_season(team_season)
+            cache.set(key, index, ROSTER_CACHE_TTL)
+        return index
+
+    def _build_for_group(self, group_id):
+        """The group's index, or None if no members could be fetched"""
+        member_ids = [m['id'] for m in self.spond_service.get_group_members(group_id) if m.get('id')]
+        if not member_ids:
+            return None
+        return self._index(Player.objects.filter(spond_id__in=member_ids))
+
+    def _build_for_team_season(self, team_season):
+        players = Player.objects.filter(
+            Q(availabilities__match__team_season=team_season) | Q(selections__match__team_season=team_season)
+        ).exclude(spond_id__isnull=True).exclude(spond_id='').distinct()
+        return self._index(players)
+
+    def _index(self, players):
+        index = {}
+        for player_id, spond_id in players.order_by('id').values_list('id', 'spond_id'):
+            index.setdefault(spond_id, []).append(player_id)
+        return index
@@ -1,74 +1,38 @@
 
-import os
-import requests
-import json
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta, timezone as dt_timezone
 from django.conf import settings
+from django.db.models import Q
+from django.db import transaction
+from django.utils import timezone
+from .spond_client import BASE_URL, SpondAuthError, spond_client
+
+# /sponds page size, and how long a group's event list is extended incrementally before a full refetch
+EVENTS_PAGE_SIZE = 50
+EVENTS_CACHE_TTL = 300
 
 class SpondService:
-    BASE_URL = "https://api.spond.com/core/v1"
+    BASE_URL = BASE_URL
     
     def __init__(self):
-        self.username = getattr(settings, 'SPOND_USERNAME', os.environ.get('SPOND_USERNAME'))
-        self.password = getattr(settings, 'SPOND_PASSWORD', os.environ.get('SPOND_PASSWORD'))
-        self.session = requests.Session()
-        
-        # Try to restore session from cache
-        from django.core.cache import cache
-        token = cache.get('spond_token')
-        if token:
-            print("DEBUG: Spond token found in cache.")
-            self.token = token
-            self.session.headers.update({'Authorization': f'Bearer {self.token}'})
-        else:
-            print("DEBUG: Spond token NOT found in cache.")
-            self.token = None
+        # Shared per process: pooled connections and a token that is refreshed on 401
+        self.client = spond_client
 
     def login(self):
-        """Authenticate with Spond and get access token"""
-        if self.token: 
-            print("DEBUG: Already authenticated (memory/cache).")
-            return True # Already authenticated via cache
-        
-        print("DEBUG: Initiating Spond Login via API...")
-        if not self.username or not self.password:
-            raise ValueError("Spond credentials not configured (SPOND_USERNAME, SPOND_PASSWORD)")
-            
-        url = f"{self.BASE_URL}/login"
-        payload = {
-            "email": self.username,
-            "password": self.password
-        }
-        
+        """Make sure we hold a Spond token (logging in only if none is cached)"""
         try:
-            response = self.session.post(url, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            
-            self.token = data.get('loginToken') 
-            if not self.token:
-                 print(f"Spond Login Response: {data.keys()}")
-            
-            self.session.headers.update({'Authorization': f'Bearer {self.token}'})
-            
-            # Cache token for 1 hour (or less than actual expiry)
-            from django.core.cache import cache
-            cache.set('spond_token', self.token, 3600)
-            
+            self.client.get_token()
             return True
         except Exception as e:
             print(f"Spond Login Failed: {e}")
             return False
 
     def ensure_auth(self):
-        if not self.token:
-            return self.login()
-        return True
+        return self.login()
 
     def get_groups(self):
         """Fetch all groups the user is a member of"""
-        if not self.ensure_auth(): return []
-        
         # Cache groups too?
         from django.core.cache import cache
         cached_groups = cache.get('spond_groups')
@@ -76,19 +40,19 @@ class SpondService:
             return cached_groups
 
         try:
-            response = self.session.get(f"{self.BASE_URL}/groups")
+            response = self.client.get("/groups")
             response.raise_for_status()
             groups = response.json()
             cache.set('spond_groups', groups, 300) # Cache for 5 mins
             return groups
+        except SpondAuthError:
+            raise
         except Exception as e:
             print(f"Error fetching Spond groups: {e}")
             return []
 
     def get_group_members(self, group_id):
         """Fetch members of a group"""
-        if not self.ensure_auth(): return []
-        
         try:
             # The /groups/{id}/members endpoint seems to 404 for many groups.
             # However, get_groups() returns the full list with members embedded.
@@ -98,47 +62,97 @@ class SpondService:
             if group and 'members' in group:
                 return group['members']
             return []
+        except SpondAuthError:
+            raise
         except Exception as e:
             print(f"Error fetching Spond members: {e}")
             return []
 
-    def get_events(self, group_id, min_start=None):
-        """Fetch events (sponds) for a group"""
-        if not self.ensure_auth(): return []
-        
+    def get_events(self, group_id, min_start=None, refresh=False):
+        """
+        Fetch events (sponds) for a group starting from min_start (default:
+        yesterday, to allow for timezone slop and post-match admin), soonest first.
+
+        The default window is cached per group with a cursor at the latest start
+        seen, so repeated calls (e.g. the link-event modal) only page through
+        events from the cursor on. The cache is rebuilt from scratch every
+        EVENTS_CACHE_TTL seconds, or on `refresh`, to pick up edits and events
+        added before the cursor.
+        """
+        from django.core.cache import cache
+
+        cutoff = self._spond_timestamp(min_start or timezone.now() - timedelta(days=1))
+        cache_key = f'spond_events:{group_id}'
+        cached = None if (refresh or min_start) else cache.get(cache_key)
+
+        if cached:
+            events, fetch_from, synced_at = cached['events'], cached['cursor'], cached['synced_at']
+        else:
+            events, fetch_from, synced_at = {}, cutoff, time.time()
+
         try:
-            params = {'groupId': group_id, 'max': 50}
-            if min_start:
-                params['minStart'] = min_start.isoformat()
-            else:
-                # Default to showing only future events (or recent past)
-                # Spond API 'minEnd' or 'minStart' can be used.
-                # Let's filter in python to be safe if API varies.
-                pass
-            
-            response = self.session.get(f"{self.BASE_URL}/sponds", params=params)
-            response.raise_for_status()
-            events = response.json()
-            
-            # Filter past events (keep events starting from yesterday onwards)
-            # Use a safe buffer (e.g. yesterday) just in case of timezone issues or post-match admin
-            from datetime import timedelta
-            cutoff = (datetime.now() - timedelta(days=1)).isoformat()
-            events = [e for e in events if e.get('startTimestamp') and e.get('startTimestamp') >= cutoff]
-
-            # Sort by startTimestamp ascending (soonest first)
-            events.sort(key=lambda x: x.get('startTimestamp', ''))
-            return events
+            for event in self.iter_events(group_id, fetch_from):
+                events[event['id']] = event
+        except SpondAuthError:
+            raise
         except Exception as e:
             print(f"Error fetching Spond events: {e}")
-            return []
+            if not cached:
+                return []
+
+        # Drop events that have since passed the cutoff
+        events = {
+            event_id: event for event_id, event in events.items()
+            if event.get('startTimestamp') and event['startTimestamp'] >= cutoff
+        }
+
+        if not min_start:
+            remaining = int(synced_at + EVENTS_CACHE_TTL - time.time())
+            if remaining > 0:
+                cursor = max((event['startTimestamp'] for event in events.values()), default=fetch_from)
+                cache.set(cache_key, {'events': events, 'cursor': cursor, 'synced_at': synced_at}, remaining)
+
+        # Sort by startTimestamp ascending (soonest first)
+        return sorted(events.values(), key=lambda x: x.get('startTimestamp', ''))
+
+    def iter_events(self, group_id, min_start_timestamp):
+        """
+        Yields a group's events starting at or after min_start_timestamp, oldest
+        first, one API page at a time. Pages are keyed on the last start time
+        seen, so nothing is skipped however many events the group has.
+        """
+        cursor = min_start_timestamp
+        seen = set()
+        while True:
+            response = self.client.get("/sponds", params={
+                'groupId': group_id,
+                'minStartTimestamp': cursor,
+                'order': 'asc',
+                'max': EVENTS_PAGE_SIZE,
+            })
+            response.raise_for_status()
+            page = response.json()
+
+            new_events = [event for event in page if event.get('id') not in seen]
+            for event in new_events:
+                seen.add(event.get('id'))
+                yield event
+
+            # A short page is the last one; a page of only repeats means we can't advance
+            if len(page) < EVENTS_PAGE_SIZE or not new_events:
+                break
+            cursor = max(event.get('startTimestamp') or cursor for event in page)
+
+    def _spond_timestamp(self, value):
+        """ISO-8601 UTC timestamp in Spond's format (e.g. 2025-01-31T10:00:00.000Z)"""
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
             
     def get_event(self, event_id):
         """Fetch single event details including attendees"""
-        if not self.ensure_auth(): return None
-        
         try:
-            response = self.session.get(f"{self.BASE_URL}/sponds/{event_id}")
+            response = self.client.get(f"/sponds/{event_id}")
             if response.status_code == 404:
                 print(f"Spond event {event_id} not found (404).")
                 return None
@@ -149,7 +163,11 @@ class SpondService:
             return None
 
     def sync_match_availability(self, match):
-        """Syncs the availability of players for a match from its linked Spond event."""
+        """
+        Syncs the availability of players for a match from its linked Spond event.
+        Only rows whose status changed are written. Returns
+        {'created', 'updated', 'unchanged'} counts, or False on failure.
+        """
         # Prioritize availability ID as per user request, fallback to event ID
         target_id = match.spond_availability_id or match.spond_event_id
         
@@ -162,6 +180,69 @@ class SpondService:
              print(f"Could not fetch event/availability {target_id} for match {match.id}")
              return False
 
+        return self.apply_availability(match, event)
+
+    def sync_season_availability(self, team_season, max_workers=None):
+        """
+        Syncs availability for every upcoming, non-cancelled match of a TeamSeason
+        that is linked to Spond. Events are fetched concurrently on a bounded
+        thread pool sharing this service's session, then applied in a single
+        transaction. Returns {'matches': [per-match report], 'created',
+        'updated', 'unchanged', 'failed'}.
+        """
+        from api.models import Match
+
+        matches = list(
+            Match.objects.filter(team_season=team_season, is_cancelled=False, date__gte=timezone.now().date())
+            .filter(Q(spond_availability_id__gt='') | Q(spond_event_id__gt=''))
+            .select_related('team_season__team')
+            .order_by('date', 'id')
+        )
+        totals = {'matches': [], 'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+        if not matches:
+            return totals
+
+        # Authenticate once up front rather than from every worker
+        if not self.ensure_auth():
+            raise ValueError("Spond login failed")
+
+        def fetch(match):
+            started = time.monotonic()
+            event = self.get_event(match.spond_availability_id or match.spond_event_id)
+            return event, int((time.monotonic() - started) * 1000)
+
+        workers = max_workers or getattr(settings, 'SPOND_SYNC_WORKERS', 4)
+        with ThreadPoolExecutor(max_workers=min(workers, len(matches)), thread_name_prefix='spond-sync') as pool:
+            fetched = list(pool.map(fetch, matches))
+
+        with transaction.atomic():
+            for match, (event, fetch_ms) in zip(matches, fetched):
+                report = {'match_id': match.id, 'name': match.name, 'date': match.date, 'fetch_ms': fetch_ms}
+                started = time.monotonic()
+                if not event:
+                    report.update(status='failed', error='Could not fetch Spond event')
+                else:
+                    try:
+                        # Savepoint per match so one bad event doesn't undo the others
+                        with transaction.atomic():
+                            counts = self.apply_availability(match, event)
+                        report.update(status='succeeded', **counts)
+                        for key in ['created', 'updated', 'unchanged']:
+                            totals[key] += counts[key]
+                    except Exception as e:
+                        report.update(status='failed', error=str(e))
+                report['apply_ms'] = int((time.monotonic() - started) * 1000)
+                if report['status'] == 'failed':
+                    totals['failed'] += 1
+                totals['matches'].append(report)
+
+        return totals
+
+    def apply_availability(self, match, event):
+        """
+        Writes a fetched Spond event's responses to the match's Availability rows,
+        touching only rows whose status changed. Returns {'created', 'updated', 'unchanged'}.
+        """
         # Attendees are in 'responses' object or list?
         # Spond API structure:
         # event['responses'] = { 'acceptedIds': [...], 'declinedIds': [...], 'unansweredIds': [...], 'waitingListIds': [...] }
@@ -174,67 +255,57 @@ class SpondService:
         unanswered = set(responses.get('unansweredIds', [])) # Treat as Unknown/Pending?
         waiting = set(responses.get('waitingListIds', [])) # Treat as Available?
 
-        # Map Spond Member IDs to Players in this TeamSeason
-        # Need to query Players via spond_id (Player model has spond_id from import)
-        from api.models import Availability, Player
+        # Map Spond Member IDs to Players via the team's (cached) roster index,
+        # so this costs one lookup per response rather than a scan of all players
+        from api.models import Availability, PlayerSeasonStats, bulk_update_touched
+        from .spond_roster import SpondRosterIndex
         
-        # Get all players for this team season context
-        # Match -> TeamSeason -> Team -> Players (via Spond ID?)
-        # Actually Players are linked to Team Context? No, Player is linked to Spond ID.
-        # We need players associated with this context?
-        # Availability is for specific match.
+        roster = SpondRosterIndex(self).for_match(match)
         
-        # Strategy: Iterate all players in the team roster for this season.
-        # Check their spond_id against the lists.
-        # Update/Create Availability record.
+        # Desired (status, spond_status) per player, from the response buckets.
+        # Applied lowest priority first, so accepted > declined > waiting > unanswered.
+        # Members not in any bucket (not invited?) are left untouched.
+        desired = {}
+        for member_ids, state in [
+            (unanswered, ('Unknown', 'Unanswered')), # Keep as unknown
+            (waiting, ('Available', 'Waiting List')),
+            (declined, ('Unavailable', 'Declined')),
+            (accepted, ('Available', 'Attending')),
+        ]:
+            for member_id in member_ids:
+                for player_id in roster.get(member_id, []):
+                    desired[player_id] = state
         
-        # Get players in this team context
-        # Roster: Player.objects.filter(team_seasons__id=match.team_season.id)?
-        # Our Player model is simple. 
-        # Using correct relation: Match.team_season -> (Player?)
-        # Actually Availability links Match and Player.
-        # We should iterate all players that *could* be available.
-        # Let's assume all players linked to the Spond Group? Or just try to match by Spond ID globally?
+        # Existing rows for this match in one query (first by id wins on duplicates)
+        existing = {}
+        for availability in Availability.objects.filter(match=match, player_id__in=list(desired)).order_by('id'):
+            existing.setdefault(availability.player_id, availability)
         
-        # Safest: Get all players who have a spond_id
-        players = Player.objects.filter(spond_id__isnull=False).exclude(spond_id='')
+        to_create = []
+        to_update = []
+        for player_id, (status, spond_status) in desired.items():
+            availability = existing.get(player_id)
+            if availability is None:
+                to_create.append(Availability(match=match, player_id=player_id, status=status, spond_status=spond_status))
+            elif (availability.status, availability.spond_status) != (status, spond_status):
+                availability.status = status
+                availability.spond_status = spond_status
+                to_update.append(availability)
         
-        # We can also verify they belong to the team if needed, but spond_id inside the event *implies* membership.
+        if to_create or to_update:
+            with transaction.atomic():
+                if to_create:
+                    Availability.objects.bulk_create(to_create)
+                if to_update:
+                    bulk_update_touched(Availability, to_update, ['status', 'spond_status'])
+                if match.team_season_id:
+                    PlayerSeasonStats.refresh(match.team_season_id, [a.player_id for a in to_create + to_update])
         
-        updated_count = 0
-        
-        for player in players:
-            new_status = 'Unknown'
-            spond_status = 'Unanswered'
-            
-            if player.spond_id in accepted:
-                new_status = 'Available'
-                spond_status = 'Attending'
-            elif player.spond_id in declined:
-                new_status = 'Unavailable'
-                spond_status = 'Declined'
-            elif player.spond_id in waiting:
-                new_status = 'Available'
-                spond_status = 'Waiting List'
-            elif player.spond_id in unanswered:
-                # Keep as unknown
-                pass
-            else:
-                # Not in event list? Maybe not invited?
-                continue 
-            
-            # Update/Create Availability
-            # Note: Availability model needs to be imported inside method to avoid circular imports? Done above.
-            
-            obj, created = Availability.objects.update_or_create(
-                match=match,
-                player=player,
-                defaults={
-                    'status': new_status,
-                    'spond_status': spond_status
-                }
-            )
-            updated_count += 1
-            
-        print(f"Synced availability for {updated_count} players.")
-        return True
+        counts = {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'unchanged': len(desired) - len(to_create) - len(to_update),
+        }
+        print(f"Synced availability for {len(desired)} players: "
+              f"{counts['created']} created, {counts['updated']} updated, {counts['unchanged']} unchanged.")
+        return counts
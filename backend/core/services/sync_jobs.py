@@ -0,0 +1,161 @@
+"""
+Background runner for TeamSeason Google Sheets syncs.
+
+The API only enqueues a SyncJob row; the sync itself runs either on a small
+in-process thread pool (SYNC_JOB_RUNNER='thread', the default) or in a separate
+`manage.py run_sync_worker` process (SYNC_JOB_RUNNER='worker'). Jobs are claimed
+with a conditional UPDATE, so both runners can safely poll the same table.
+"""
+
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from api.models import SyncJob
+
+# One sync at a time per process: SQLite only allows a single writer anyway
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sync-job')
+
+
+def enqueue_sync(team_season, user=None, force=False):
+    """
+    Queues a sync for a TeamSeason and returns the SyncJob.
+    An already queued/running job for the same TeamSeason is reused.
+    """
+    fail_stale_jobs()
+    thread_runner = getattr(settings, 'SYNC_JOB_RUNNER', 'thread') == 'thread'
+
+    try:
+        with transaction.atomic():
+            job = SyncJob.objects.create(
+                team_season=team_season,
+                requested_by=user if user and user.is_authenticated else None,
+                force=force
+            )
+    except IntegrityError:
+        # unique_active_sync_job: a queued/running job already exists (possibly
+        # created by a concurrent request a moment ago)
+        job = SyncJob.objects.filter(team_season=team_season, status__in=['queued', 'running']).order_by('id').first()
+        if job is None:
+            raise # Finished in between; let the caller retry
+        if job.status != 'queued':
+            return job
+        # The process that queued it may have exited before its thread picked
+        # it up; claim_job() ensures only one runner starts it
+
+    if thread_runner:
+        transaction.on_commit(lambda: _executor.submit(_run_in_thread, job.id))
+    return job
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        job = claim_job(job_id)
+        if job:
+            run_job(job)
+    finally:
+        close_old_connections()
+
+
+def claim_job(job_id=None):
+    """
+    Atomically moves a queued job to 'running' and returns it, or None if there
+    is nothing to claim (or another runner got there first).
+    """
+    qs = SyncJob.objects.filter(status='queued')
+    if job_id is not None:
+        qs = qs.filter(id=job_id)
+
+    candidate = qs.order_by('id').values_list('id', flat=True).first()
+    if candidate is None:
+        return None
+
+    now = timezone.now()
+    claimed = SyncJob.objects.filter(id=candidate, status='queued').update(
+        status='running', started_at=now, updated_at=now
+    )
+    if not claimed:
+        return None
+    return SyncJob.objects.select_related('team_season').get(id=candidate)
+
+
+def fail_stale_jobs():
+    """
+    Marks jobs left 'running' by a dead process (no stage progress for
+    SYNC_JOB_TIMEOUT), or never picked up from 'queued' (e.g. no worker
+    running), as failed so a new sync can be queued
+    """
+    timeout = getattr(settings, 'SYNC_JOB_TIMEOUT', 15 * 60)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    running = SyncJob.objects.filter(status='running', updated_at__lt=cutoff).update(
+        status='failed', error='Timed out (worker stopped)', finished_at=timezone.now()
+    )
+    queued = SyncJob.objects.filter(status='queued', created_at__lt=cutoff).update(
+        status='failed', error='Timed out (never started)', finished_at=timezone.now()
+    )
+    return running + queued
+
+
+def run_job(job):
+    """Runs each sync stage for a claimed job, recording per-stage status and timings"""
+    from .sheets_service import SheetsService
+    from .sync_service import SyncService
+
+    sync_service = SyncService(SheetsService())
+    team_season_id = job.team_season_id
+
+    workbook = {}
+
+    def fetch():
+        workbook['snapshot'] = sync_service.fetch_snapshot(team_season_id)
+        return workbook['snapshot'] is not None
+
+    stages = [
+        # (name, callable, error message if it returns False)
+        ('fetch', fetch, 'Failed to fetch spreadsheet'),
+        ('master_data', lambda: sync_service.sync_master_data(team_season_id, force=job.force, snapshot=workbook['snapshot']), 'Failed to sync master data'),
+        ('team_selections', lambda: sync_service.sync_team_selections(team_season_id, force=job.force, snapshot=workbook['snapshot']), 'Failed to sync team selections'),
+    ]
+    job.stages = [{'name': name, 'status': 'pending'} for name, _, _ in stages]
+    job.save(update_fields=['stages', 'updated_at'])
+
+    for index, (name, stage_fn, failure_message) in enumerate(stages):
+        stage = job.stages[index]
+        stage.update(status='running', started_at=timezone.now().isoformat())
+        job.stage = name
+        job.save(update_fields=['stage', 'stages', 'updated_at'])
+
+        started = time.monotonic()
+        try:
+            ok = stage_fn()
+            error = None if ok else failure_message
+        except Exception as e:
+            traceback.print_exc()
+            error = str(e)
+
+        stage['duration_ms'] = int((time.monotonic() - started) * 1000)
+        stage['status'] = 'failed' if error else 'succeeded'
+        if name == 'team_selections' and workbook['snapshot'].ambiguities:
+            # Match names that fit several tabs: {name: [candidates]}, the first was used
+            stage['ambiguities'] = dict(sorted(workbook['snapshot'].ambiguities.items()))
+
+        if error:
+            _finish(job, 'failed', error)
+            return job
+
+    _finish(job, 'succeeded')
+    return job
+
+
+def _finish(job, status, error=None):
+    job.status = status
+    job.error = error
+    job.stage = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'stage', 'stages', 'finished_at', 'updated_at'])
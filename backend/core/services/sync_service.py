@@ -1,17 +1,47 @@
-from api.models import Player, Match, Availability, TeamSelection, TeamSeason, MatchFormat, PlayerAlias
+from api.models import Player, Match, Availability, TeamSelection, TeamSeason, SheetRangeDigest, TeamSeasonSummary, PlayerSeasonStats, bulk_update_touched
 from datetime import datetime
+import hashlib
+import json
 from django.db import transaction
+from .player_resolver import PlayerResolver
+from .format_resolver import FormatResolver
+from .team_sheets import invalidate_sheets
 
 class SyncService:
+    SELECTION_RANGE_KEY = 'Selection'
+
     def __init__(self, sheets_service):
         self.sheets_service = sheets_service
 
-    def sync_master_data(self, team_season_id):
+    def fetch_snapshot(self, team_season_id):
+        """
+        Fetches everything a full TeamSeason sync needs in one planned batch:
+        the Selection tab plus the worksheet of every known match.
+        Returns a WorkbookSnapshot, or None on failure.
+        """
+        try:
+            team_season = TeamSeason.objects.get(id=team_season_id)
+        except TeamSeason.DoesNotExist:
+            print(f"Sync failed: TeamSeason {team_season_id} not found")
+            return None
+
+        if not self.sheets_service.is_authenticated():
+            print("Sync failed: Not authenticated with Google Sheets")
+            return None
+
+        print(f"Fetching workbook for {team_season}...")
+        matches = Match.objects.filter(team_season_id=team_season.id).only('id', 'name')
+        return self.sheets_service.fetch_workbook(team_season.spreadsheet_id, matches)
+
+    def sync_master_data(self, team_season_id, force=False, snapshot=None):
         """
         Synchronizes Master Data from 'Selection' tab for a specific TeamSeason:
         1. Players (Row 5 onwards, Col C) - Global
         2. Matches (Row 1, Cols O:AU) - Scoped to TeamSeason
         3. Availabilities - Scoped to Match
+
+        Uses `snapshot` (see fetch_snapshot) when given, otherwise fetches the tab.
+        Skipped when the tab's content digest matches the last sync, unless `force`.
         """
         # Fetch Context
         try:
@@ -20,141 +50,42 @@ class SyncService:
             print(f"Sync failed: TeamSeason {team_season_id} not found")
             return False
 
-        if not self.sheets_service.is_authenticated():
-            print("Sync failed: Not authenticated with Google Sheets")
-            return False
-
         try:
-            # Initialize for specific spreadsheet
-            self.sheets_service._initialize_sheet(team_season.spreadsheet_id)
-            if not self.sheets_service.sheet:
-                 print(f"Could not open sheet for {team_season}")
-                 return False
-                
-            # 1. Fetch Selection Worksheet
-            ws = self.sheets_service.sheet.worksheet('Selection')
-            print(f"Fetching Selection data for {team_season}...")
-            
-            # Get all data for efficient processing
-            all_values = ws.get_all_values()
+            if snapshot is None:
+                if not self.sheets_service.is_authenticated():
+                    print("Sync failed: Not authenticated with Google Sheets")
+                    return False
+
+                print(f"Fetching Selection data for {team_season}...")
+                snapshot = self.sheets_service.fetch_workbook(team_season.spreadsheet_id)
+                if not snapshot:
+                     print(f"Could not open sheet for {team_season}")
+                     return False
+
+            all_values = snapshot.selection
+            if not all_values or len(all_values) < 4:
+                print(f"Selection tab missing or empty for {team_season}")
+                return False
+
+            digest = self._range_digest(all_values)
+            if not force and self._load_digests(team_season).get(self.SELECTION_RANGE_KEY) == digest:
+                print("Selection tab unchanged since last sync. Skipping.")
+                return True
             
             with transaction.atomic():
                 # --- SYNC MATCHES ---
                 print("Syncing Matches...")
-                
-                fixture_row = all_values[0]
-                home_away_row = all_values[1]
-                status_row = all_values[2] # Row 3: Status
-                date_row = all_values[3]
-                
-                matches_map = {} # Map col_index to match object
-                
-                # Columns O (14) to AU (46)
-                for col_idx in range(14, len(fixture_row)):
-                    fixture_name = fixture_row[col_idx]
-                    if not fixture_name or not fixture_name.strip():
-                        continue
-                        
-                    home_away = home_away_row[col_idx] if col_idx < len(home_away_row) else ''
-                    status_val = status_row[col_idx] if col_idx < len(status_row) else ''
-                    is_cancelled = 'cancelled' in status_val.lower() if status_val else False
-                    date_str = date_row[col_idx] if col_idx < len(date_row) else ''
-                    
-                    # Parse date
-                    match_date = None
-                    if date_str:
-                        try:
-                            if '/' in date_str:
-                                day, month, year = map(int, date_str.split('/'))
-                                match_date = datetime(year, month, day).date()
-                            elif '-' in date_str:
-                                 match_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        except ValueError:
-                            pass
-
-                    # Create or Update Match (Scoped to TeamSeason)
-                    match, created = Match.objects.get_or_create(
-                        name=fixture_name, 
-                        team_season_id=team_season.id,
-                        defaults={'date': match_date, 'source': 'Imported'}
-                    )
-                    
-                    if created:
-                        print(f"Creating Match: {fixture_name}")
-                    else:
-                        match.source = 'Imported' # Ensure existing matches update source
-                    
-                    match.home_away = home_away
-                    match.date = match_date
-                    match.is_cancelled = is_cancelled
-                    match.sheet_col = str(col_idx)
-
-                    # Parse Opponent Name
-                    op_name = fixture_name
-                    if ':' in op_name:
-                        op_name = op_name.split(':', 1)[1].strip()
-                    
-                    if op_name.upper().endswith(('(H)', '(A)', '(H/A)')):
-                         op_name = op_name.rsplit('(', 1)[0].strip()
-                    
-                    if op_name.lower().startswith('vs '):
-                         op_name = op_name[3:].strip()
-
-                    match.opponent_name = op_name
-
-                    # Auto-populate location
-                    if not match.location and home_away:
-                         clean_ha = home_away.strip().lower()
-                         if clean_ha == 'home' or clean_ha == 'h':
-                             match.location = 'Sandbach RUFC, Bradwall Road, Sandbach. CW11 1RA'
-                    
-                    match.save()
-                    matches_map[col_idx] = match
-                
+                matches_map = self._upsert_matches(team_season, all_values)
                 print("Matches Synced.")
 
                 # --- SYNC PLAYERS & AVAILABILITY ---
                 print("Syncing Players...")
-                
-                for row_idx in range(4, len(all_values)):
-                    row_data = all_values[row_idx]
-                    if len(row_data) < 3: 
-                        continue
-                        
-                    player_name = row_data[2]
-                    if not player_name or not player_name.strip():
-                        continue
-                    
-                    # Create or Update Player (Global)
-                    player = Player.objects.filter(name=player_name).first()
-                    
-                    # Check for Alias if direct match not found
-                    if not player:
-                        alias = PlayerAlias.objects.filter(name=player_name).first()
-                        if alias:
-                            player = alias.player
-
-                    if not player:
-                        player = Player.objects.create(name=player_name)
-                        print(f"Creating Player: {player_name}")
-                    
-                    player.sheet_row = row_idx + 1 
-                    player.save()
-                    
-                    # Sync Availability
-                    for col_idx, match in matches_map.items():
-                        status = row_data[col_idx] if col_idx < len(row_data) else ''
-                        
-                        if not status:
-                            continue
-                            
-                        availability, _ = Availability.objects.get_or_create(
-                            player=player, 
-                            match=match
-                        )
-                        
-                        availability.status = status
-                        availability.save()
+                self._upsert_players_and_availability(team_season, all_values, matches_map, PlayerResolver())
+
+                # Availability and cancellations may have changed for anyone: recount the season
+                PlayerSeasonStats.refresh(team_season.id)
+
+                self._save_digests(team_season, {self.SELECTION_RANGE_KEY: digest})
             
             print("Players and Availabilities Synced.")
             return True
@@ -163,10 +94,192 @@ class SyncService:
             print(f"Error syncing master data: {e}")
             return False
 
-    def sync_team_selections(self, team_season_id):
+    # Fields written back to existing matches by the master data sync.
+    # Result fields are included because calculate_score() depends on home_away
+    # and bulk_update() bypasses Match.save().
+    MATCH_SYNC_FIELDS = [
+        'source', 'home_away', 'date', 'is_cancelled', 'sheet_col', 'opponent_name', 'location',
+        'result_home_score', 'result_away_score', 'result',
+    ]
+
+    def _upsert_matches(self, team_season, all_values):
+        """
+        Creates/updates the fixtures listed in the Selection tab header rows.
+        Existing matches are preloaded once and diffed in memory; changes are
+        applied with bulk_create/bulk_update. Returns {col_idx: Match}.
+        """
+        fixture_row = all_values[0]
+        home_away_row = all_values[1]
+        status_row = all_values[2] # Row 3: Status
+        date_row = all_values[3]
+
+        # Preload existing matches for this TeamSeason (first by id wins on duplicate names)
+        existing = {}
+        for match in Match.objects.filter(team_season_id=team_season.id).order_by('id'):
+            existing.setdefault(match.name, match)
+
+        matches_map = {} # Map col_index to match object
+        to_create = {}
+        to_update = {}
+
+        # Columns O (14) to AU (46)
+        for col_idx in range(14, len(fixture_row)):
+            fixture_name = fixture_row[col_idx]
+            if not fixture_name or not fixture_name.strip():
+                continue
+
+            home_away = home_away_row[col_idx] if col_idx < len(home_away_row) else ''
+            status_val = status_row[col_idx] if col_idx < len(status_row) else ''
+            is_cancelled = 'cancelled' in status_val.lower() if status_val else False
+            date_str = date_row[col_idx] if col_idx < len(date_row) else ''
+
+            match = existing.get(fixture_name) or to_create.get(fixture_name)
+            if match is None:
+                print(f"Creating Match: {fixture_name}")
+                match = Match(name=fixture_name, team_season=team_season)
+                to_create[fixture_name] = match
+
+            # Avoid a lazy TeamSeason fetch in calculate_score()
+            match.team_season = team_season
+
+            before = [getattr(match, f) for f in self.MATCH_SYNC_FIELDS]
+
+            match.source = 'Imported' # Ensure existing matches update source
+            match.home_away = home_away
+            match.date = self._parse_sheet_date(date_str)
+            match.is_cancelled = is_cancelled
+            match.sheet_col = str(col_idx)
+            match.opponent_name = self._parse_opponent_name(fixture_name)
+
+            # Auto-populate location
+            if not match.location and home_away:
+                 clean_ha = home_away.strip().lower()
+                 if clean_ha == 'home' or clean_ha == 'h':
+                     match.location = 'Sandbach RUFC, Bradwall Road, Sandbach. CW11 1RA'
+
+            match.calculate_score()
+
+            if match.pk and before != [getattr(match, f) for f in self.MATCH_SYNC_FIELDS]:
+                to_update[match.pk] = match
+
+            matches_map[col_idx] = match
+
+        if to_create:
+            Match.objects.bulk_create(to_create.values())
+        if to_update:
+            bulk_update_touched(Match, to_update.values(), self.MATCH_SYNC_FIELDS)
+            invalidate_sheets(to_update.keys())
+        if to_create or to_update:
+            # Bulk writes bypass Match.save(), so refresh the season totals here
+            TeamSeasonSummary.rebuild([team_season.id])
+
+        print(f"  - {len(to_create)} created, {len(to_update)} updated, "
+              f"{len(matches_map) - len(to_create) - len(to_update)} unchanged")
+        return matches_map
+
+    def _upsert_players_and_availability(self, team_season, all_values, matches_map, resolver):
         """
-        Syncs detailed team selections using Batch API to avoid Rate Limits.
+        Creates/updates players (Row 5 onwards, Col C) and their availability
+        cells for the synced matches. Names are resolved through the shared
+        PlayerResolver and the TeamSeason's availabilities are loaded with a
+        single query, so the number of queries does not grow with the roster
+        or the fixture list.
+        """
+        # Resolve each sheet row to a Player, queueing unknown names for creation
+        player_rows = [] # (player_name, sheet_row, row_data)
+
+        for row_idx in range(4, len(all_values)):
+            row_data = all_values[row_idx]
+            if len(row_data) < 3:
+                continue
+
+            player_name = row_data[2]
+            if not player_name or not player_name.strip():
+                continue
+
+            resolver.resolve(player_name, sheet_row=row_idx + 1)
+            player_rows.append((player_name, row_idx + 1, row_data))
+
+        new_players = resolver.flush()
+        player_rows = [(resolver.get_id(name), sheet_row, row_data) for name, sheet_row, row_data in player_rows]
+
+        # Keep Player.sheet_row in step with the tab, writing only rows that moved
+        sheet_rows = {player_id: sheet_row for player_id, sheet_row, _ in player_rows}
+        changed_players = [
+            Player(id=player_id, sheet_row=sheet_rows[player_id])
+            for player_id, current_row in Player.objects.filter(id__in=sheet_rows).values_list('id', 'sheet_row')
+            if current_row != sheet_rows[player_id]
+        ]
+        if changed_players:
+            Player.objects.bulk_update(changed_players, ['sheet_row'])
+
+        # Preload existing availabilities for this TeamSeason's matches
+        existing = {}
+        for availability in Availability.objects.filter(match__team_season_id=team_season.id).order_by('id'):
+            existing.setdefault((availability.match_id, availability.player_id), availability)
+
+        to_create = {}
+        to_update = {}
+
+        for player_id, _, row_data in player_rows:
+            for col_idx, match in matches_map.items():
+                status = row_data[col_idx] if col_idx < len(row_data) else ''
+
+                if not status:
+                    continue
+
+                key = (match.id, player_id)
+                availability = existing.get(key)
+                if availability is None:
+                    to_create[key] = Availability(match=match, player_id=player_id, status=status)
+                elif availability.status != status:
+                    availability.status = status
+                    to_update[availability.pk] = availability
+
+        if to_create:
+            Availability.objects.bulk_create(to_create.values())
+        if to_update:
+            bulk_update_touched(Availability, to_update.values(), ['status'])
+
+        print(f"  - Players: {new_players} created, {len(changed_players)} updated")
+        print(f"  - Availabilities: {len(to_create)} created, {len(to_update)} updated")
+
+    def _parse_sheet_date(self, date_str):
+        """Parses a Selection tab date cell (DD/MM/YYYY or YYYY-MM-DD)"""
+        if not date_str:
+            return None
+        try:
+            if '/' in date_str:
+                day, month, year = map(int, date_str.split('/'))
+                return datetime(year, month, day).date()
+            elif '-' in date_str:
+                 return datetime.strptime(date_str, '%Y-%m-%d').date()
+        except ValueError:
+            pass
+        return None
+
+    def _parse_opponent_name(self, fixture_name):
+        """Derives the opponent from a fixture header, e.g. 'Game 3: vs Crewe (H)' -> 'Crewe'"""
+        op_name = fixture_name
+        if ':' in op_name:
+            op_name = op_name.split(':', 1)[1].strip()
+
+        if op_name.upper().endswith(('(H)', '(A)', '(H/A)')):
+             op_name = op_name.rsplit('(', 1)[0].strip()
+
+        if op_name.lower().startswith('vs '):
+             op_name = op_name[3:].strip()
+
+        return op_name
+
+    def sync_team_selections(self, team_season_id, force=False, snapshot=None):
+        """
+        Syncs detailed team selections from each match worksheet.
         Scopes to the specific TeamSeason.
+
+        Uses `snapshot` (see fetch_snapshot) when given, fetching only worksheets of
+        matches it doesn't cover yet; otherwise fetches all of them in one batch.
+        Matches whose worksheet digest matches the last sync are skipped, unless `force`.
         """
         print(f"Syncing Team Selections (Batch Mode) for Context {team_season_id}...")
         
@@ -174,161 +287,61 @@ class SyncService:
         try:
             team_season = TeamSeason.objects.get(id=team_season_id)
         except TeamSeason.DoesNotExist:
-            return
+            return False
         
         # Filter matches by this context
-        matches = Match.objects.filter(team_season_id=team_season.id)
-        
-        # Initialize proper sheet
-        self.sheets_service._initialize_sheet(team_season.spreadsheet_id)
-        
-        try:
-             all_ws = self.sheets_service.sheet.worksheets()
-        except Exception as e:
-             print(f"Failed to list worksheets: {e}")
-             return
+        matches = list(Match.objects.filter(team_season_id=team_season.id))
 
-        # 2. Map Match -> Worksheet Title & Build Ranges
-        match_ws_map = {}
-        ranges = []
-        ordered_matches = [] 
-        
-        for match in matches:
-             # Find matching worksheet (same logic as find_worksheet_for_match)
-             found_ws = None
-             for ws in all_ws:
-                 if match.name.lower() in ws.title.lower() or ws.title.lower() in match.name.lower():
-                     found_ws = ws
-                     break
-             
-             if found_ws:
-                 # Quote title to handle spaces, get generous range A1:AZ60
-                 ranges.append(f"'{found_ws.title}'!A1:AZ60")
-                 ordered_matches.append(match)
-             else:
-                 print(f"  - Sheet not found for {match.name}")
-
-        if not ranges:
-              print("No matching worksheets found.")
-              return
+        if snapshot is None:
+            snapshot = self.sheets_service.fetch_workbook(team_season.spreadsheet_id, matches, include_selection=False)
+            if snapshot is None:
+                return False
+        elif not self.sheets_service.extend_workbook(snapshot, matches):
+            return False
 
-        # 3. Batch Fetch Data (ONE API CALL)
-        print(f"Fetching data for {len(ranges)} matches in one batch...")
-        try:
-             # Returns list of dicts: {'range': '...', 'majorDimension': 'ROWS', 'values': [...]}
-             results = self.sheets_service.batch_get_values(ranges)
-        except Exception as e:
-             print(f"Batch fetch failed: {e}")
-             return
+        ordered_matches = [match for match in matches if snapshot.has_match(match)]
+        if not ordered_matches:
+              print("No matching worksheets found.")
+              return True
 
         # 4. Process Results
-        with transaction.atomic():
-            for i, result in enumerate(results):
-                 if i >= len(ordered_matches): break
-                 match = ordered_matches[i]
-                 all_values = result.get('values', [])
-                 
-                 if not all_values:
-                     print(f"  - No data for {match.name}")
-                     continue
-
-                 print(f"Syncing Selection for: {match.name}")
-                 try:
-                     # Clear existing selections
-                     TeamSelection.objects.filter(match=match).delete()
-                     
-                     # Identify Format from DB
-                     template_type = all_values[0][1] if len(all_values) > 0 and len(all_values[0]) > 1 else ""
-                     t_type = str(template_type).strip() if template_type else ""
-                     
-                     # Fetch all formats to check against keys
-                     formats = MatchFormat.objects.all()
-                     selected_format = None
-                     
-                     # Find matching format by key
-                     for fmt in formats:
-                         if fmt.spreadsheet_key and fmt.spreadsheet_key in t_type:
-                             selected_format = fmt
-                             break
-                     
-                     # Fallback to Standard
-                     if not selected_format:
-                         selected_format = MatchFormat.objects.filter(name="Standard 15s").first()
-                     
-                     if selected_format:
-                         match.format = selected_format
-                         match.save()
-                         periods_config = selected_format.column_config or [[1, "B"]]
-                     else:
-                         periods_config = [[1, "B"]]
-
-                     def col_letter_to_index(col_letter):
-                        num = 0
-                        for c in col_letter:
-                            if c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-                                num = num * 26 + (ord(c) - ord('A')) + 1
-                        return num - 1
-                     
-                     for period_num, col_letter in periods_config:
-                         name_col_idx = col_letter_to_index(col_letter)
-                         
-                         # Sync Starters (Rows 5-19 -> indices 4-18)
-                         for pos_idx in range(4, 19):
-                             if pos_idx >= len(all_values): break
-                             row = all_values[pos_idx]
-                             player_name = row[name_col_idx] if len(row) > name_col_idx else ''
-                             
-                             if player_name and player_name.strip():
-                                 player = Player.objects.filter(name=player_name.strip()).first()
-                                 
-                                 if not player:
-                                     alias = PlayerAlias.objects.filter(name=player_name.strip()).first()
-                                     if alias: player = alias.player
-
-                                 if not player:
-                                     player = Player.objects.create(name=player_name.strip())
-
-                                 TeamSelection.objects.create(
-                                     match=match,
-                                     player=player,
-                                     position_number=pos_idx - 4 + 1,
-                                     role='Starter',
-                                     period=period_num
-                                 )
-
-                         # Sync Finishers (Rows 20-34 -> indices 19-33)
-                         for pos_idx in range(19, 34):
-                             if pos_idx >= len(all_values): break
-                             row = all_values[pos_idx]
-                             player_name = row[name_col_idx] if len(row) > name_col_idx else ''
-                             
-                             if player_name and player_name.strip():
-                                 player = Player.objects.filter(name=player_name.strip()).first()
-                                 
-                                 if not player:
-                                     alias = PlayerAlias.objects.filter(name=player_name.strip()).first()
-                                     if alias: player = alias.player
-
-                                 if not player:
-                                     player = Player.objects.create(name=player_name.strip())
-
-                                 TeamSelection.objects.create(
-                                     match=match,
-                                     player=player,
-                                     position_number=pos_idx - 19 + 16,
-                                     role='Finisher',
-                                     period=period_num
-                                 )
-
-                 except Exception as e:
-                     print(f"  - Error syncing {match.name}: {e}")
-                     # In batch mode, maybe we don't rollback everything?
-                     # But we are in a transaction block. 
-                     # Let's catch and continue for other matches if one fails?
-                     # But atomic exits on error.
-                     pass 
+        resolver = PlayerResolver()
+        match_selections = {}
+        stored_digests = {} if force else self._load_digests(team_season)
+        new_digests = {}
+        formats = FormatResolver()
+
+        for match in ordered_matches:
+             all_values = snapshot.match_values[match.id]
+             
+             if not all_values:
+                 print(f"  - No data for {match.name}")
+                 continue
+
+             range_key = self._match_range_key(match)
+             digest = self._range_digest(all_values, formats.signature)
+             if stored_digests.get(range_key) == digest:
+                 continue
+
+             print(f"Syncing Selection for: {match.name}")
+             try:
+                 match_selections[match] = self._read_match_selections(match, all_values, resolver, formats)
+                 new_digests[range_key] = digest
+             except Exception as e:
+                 print(f"  - Error syncing {match.name}: {e}")
+
+        print(f"{len(match_selections)} changed, {len(ordered_matches) - len(match_selections)} unchanged or skipped.")
+
+        if match_selections:
+            with transaction.atomic():
+                affected_players = self._replace_selections(match_selections, resolver)
+                PlayerSeasonStats.refresh(team_season.id, affected_players)
+                invalidate_sheets(match.id for match in match_selections)
+                formats.flush()
+                self._save_digests(team_season, new_digests)
         
         print("Database Sync Complete!")
+        return True
 
     def sync_single_match(self, match):
         """
@@ -342,129 +355,130 @@ class SyncService:
              return False
 
         # Ensure we are using the correct sheet for this match
-        if match.team_season:
-             self.sheets_service._initialize_sheet(match.team_season.spreadsheet_id)
-        else:
-             self.sheets_service._initialize_sheet()
-        
-        if not self.sheets_service.sheet:
-             print("Could not initialize sheet for match")
-             return False
+        spreadsheet_id = match.team_season.spreadsheet_id if match.team_season else None
         
         try:
-             # Find matching worksheet
-             all_ws = self.sheets_service.sheet.worksheets()
-             found_ws = None
-             for ws in all_ws:
-                 if match.name.lower() in ws.title.lower() or ws.title.lower() in match.name.lower():
-                     found_ws = ws
-                     break
-             
-             if not found_ws:
+             # Resolve the worksheet and fetch its data (A1:AZ60 is plenty) in one batch
+             snapshot = self.sheets_service.fetch_workbook(spreadsheet_id, [match], include_selection=False)
+             if not snapshot:
+                 print("Could not initialize sheet for match")
+                 return False
+
+             if not snapshot.has_match(match):
                  print(f"  - Worksheet not found for {match.name}")
                  return False
 
-             # Fetch data (A1:AZ60 is plenty)
-             data = found_ws.get('A1:AZ60')
+             data = snapshot.match_values[match.id]
              if not data:
                   print("  - No data found in sheet")
                   return False
              
+             resolver = PlayerResolver()
+             formats = FormatResolver()
+             selections = self._read_match_selections(match, data, resolver, formats)
+
              with transaction.atomic():
-                 # Process Data (Logic refined for multi-period)
-                 
-                 # Clear existing
-                 TeamSelection.objects.filter(match=match).delete()
-                 
-                 # Identify Format from DB
-                 template_type = data[0][1] if len(data) > 0 and len(data[0]) > 1 else ""
-                 t_type = str(template_type).strip() if template_type else ""
-                 
-                 print(f"  - Template Type: {t_type}")
-                 
-                 # Fetch all formats to check against keys
-                 formats = MatchFormat.objects.all()
-                 selected_format = None
+                 affected_players = self._replace_selections({match: selections}, resolver)
+                 if match.team_season_id:
+                     PlayerSeasonStats.refresh(match.team_season_id, affected_players)
+                 invalidate_sheets([match.id])
+                 formats.flush()
+
+                 # Record the digest so the next season sync can skip this match
+                 if match.team_season:
+                     digest = self._range_digest(data, formats.signature)
+                     self._save_digests(match.team_season, {self._match_range_key(match): digest})
                  
-                 # Find matching format by key
-                 for fmt in formats:
-                     if fmt.spreadsheet_key and fmt.spreadsheet_key in t_type:
-                         selected_format = fmt
-                         break
-                 
-                 # Fallback to Standard if not found
-                 if not selected_format:
-                     selected_format = MatchFormat.objects.filter(name="Standard 15s").first()
-                     
-                 if selected_format:
-                     match.format = selected_format
-                     match.save()
-                     periods_config = selected_format.column_config or [[1, "B"]]
-                     print(f"  - Detected Format: {selected_format.name}")
-                 else:
-                     print("  - WARNING: No matching or default format found. Defaulting to B col.")
-                     periods_config = [[1, "B"]]
-
-                 def col_letter_to_index(col_letter):
-                    num = 0
-                    for c in col_letter:
-                        if c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-                            num = num * 26 + (ord(c) - ord('A')) + 1
-                    return num - 1
-                 
-                 for period_num, col_letter in periods_config:
-                     name_col_idx = col_letter_to_index(col_letter)
-                     print(f"  - Syncing Period {period_num} from Column {col_letter}")
-
-                     # Sync Starters (Rows 5-19 -> indices 4-18)
-                     for pos_idx in range(4, 19):
-                         if pos_idx >= len(data): break
-                         row = data[pos_idx]
-                         player_name = row[name_col_idx] if len(row) > name_col_idx else ''
-                         
-                         if player_name and player_name.strip():
-                             player = Player.objects.filter(name=player_name.strip()).first()
-                             if not player:
-                                 alias = PlayerAlias.objects.filter(name=player_name.strip()).first()
-                                 if alias: player = alias.player
-
-                             if not player:
-                                 player = Player.objects.create(name=player_name.strip())
-                                 
-                             TeamSelection.objects.create(
-                                 match=match,
-                                 player=player,
-                                 position_number=pos_idx - 4 + 1,
-                                 role='Starter',
-                                 period=period_num
-                             )
-
-                     # Sync Finishers (Rows 20-34 -> indices 19-33)
-                     for pos_idx in range(19, 34):
-                         if pos_idx >= len(data): break
-                         row = data[pos_idx]
-                         player_name = row[name_col_idx] if len(row) > name_col_idx else ''
-                         
-                         if player_name and player_name.strip():
-                             player = Player.objects.filter(name=player_name.strip()).first()
-                             if not player:
-                                 alias = PlayerAlias.objects.filter(name=player_name.strip()).first()
-                                 if alias: player = alias.player
-
-                             if not player:
-                                 player = Player.objects.create(name=player_name.strip())
-
-                             TeamSelection.objects.create(
-                                 match=match,
-                                 player=player,
-                                 position_number=pos_idx - 19 + 16,
-                                 role='Finisher',
-                                 period=period_num
-                             )
-                 
-                 print(f"Match {match.name} Synced Successfully.")
-                 return True
+             print(f"Match {match.name} Synced Successfully.")
+             return True
 
         except Exception as e:
              print(f"Error syncing single match: {e}")
              return False
+
+    def _read_match_selections(self, match, all_values, resolver, formats):
+        """
+        Reads the lineup grid of a match worksheet. Detects the MatchFormat from
+        the template cell (B1) and returns a list of
+        (player_name, position_number, role, period) for every filled slot.
+        Player names and format changes are queued on the resolvers; nothing is
+        written here.
+        """
+        # Identify Format from template key
+        template_type = all_values[0][1] if len(all_values) > 0 and len(all_values[0]) > 1 else ""
+        t_type = str(template_type).strip() if template_type else ""
+        
+        selected_format = formats.apply(match, t_type)
+        if selected_format:
+            print(f"  - Template Type: {t_type} -> {selected_format.name}")
+        else:
+            print(f"  - Template Type: {t_type} -> WARNING: No matching or default format found. Defaulting to B col.")
+        
+        selections = []
+        for period_num, name_col_idx in formats.periods(selected_format):
+            # Starters: Rows 5-19 -> indices 4-18 (positions 1-15)
+            # Finishers: Rows 20-34 -> indices 19-33 (positions 16-30)
+            for pos_idx in range(4, 34):
+                if pos_idx >= len(all_values): break
+                row = all_values[pos_idx]
+                player_name = row[name_col_idx] if len(row) > name_col_idx else ''
+                
+                if player_name and player_name.strip():
+                    resolver.resolve(player_name)
+                    role = 'Starter' if pos_idx < 19 else 'Finisher'
+                    selections.append((player_name, pos_idx - 4 + 1, role, period_num))
+
+        return selections
+
+    def _replace_selections(self, match_selections, resolver):
+        """
+        Replaces the TeamSelection rows of the given matches in one delete and
+        one bulk insert. Creates any new players queued on the resolver first.
+        Returns the ids of players selected before or after (for PlayerSeasonStats).
+        """
+        if not match_selections:
+            return set()
+
+        resolver.flush()
+
+        old_selections = TeamSelection.objects.filter(match__in=list(match_selections))
+        affected_players = set(old_selections.values_list('player_id', flat=True).distinct())
+        old_selections.delete()
+
+        new_selections = [
+            TeamSelection(
+                match=match,
+                player_id=resolver.get_id(player_name),
+                position_number=position_number,
+                role=role,
+                period=period_num
+            )
+            for match, selections in match_selections.items()
+            for player_name, position_number, role, period_num in selections
+        ]
+        TeamSelection.objects.bulk_create(new_selections)
+        affected_players.update(sel.player_id for sel in new_selections)
+        return affected_players
+
+    # --- Range digests (incremental sync) ---
+
+    def _range_digest(self, values, *extra):
+        """SHA-256 of a fetched range's values (plus any extra inputs that affect the import)"""
+        payload = json.dumps([values, extra], separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _match_range_key(self, match):
+        return f"match:{match.id}"
+
+    def _load_digests(self, team_season):
+        return dict(SheetRangeDigest.objects.filter(team_season=team_season).values_list('range_key', 'digest'))
+
+    def _save_digests(self, team_season, digests):
+        if not digests:
+            return
+        SheetRangeDigest.objects.bulk_create(
+            [SheetRangeDigest(team_season=team_season, range_key=key, digest=digest) for key, digest in digests.items()],
+            update_conflicts=True,
+            unique_fields=['team_season', 'range_key'],
+            update_fields=['digest', 'updated_at'],
+        )
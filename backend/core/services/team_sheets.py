@@ -0,0 +1,234 @@
+"""
+Team sheet payloads and the per-match render index in front of sheet_renderer.
+
+render_sheet() already stores PNGs under a content hash, but computing that
+hash means rebuilding the payload. The index remembers the last rendered file
+for each (match, layout, scale, name format) in the Django cache, so repeat
+downloads skip the database entirely. Entries are dropped by
+invalidate_sheets() whenever a sheet input changes: the lineup, the Match
+fields below, or (globally) player names. Team config and headshot changes
+move the index key instead.
+"""
+
+import glob
+import os
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from api.conditional import bump_version, namespace_versions, TEAM_CONFIG
+from api.models import Match, TeamSelection
+from .player_images import player_image_index
+from .sheet_renderer import render_sheet, sheet_cache_dir, LAYOUTS, SCALES, NAME_FORMATS
+
+SHEET_INDEX_TTL = 24 * 60 * 60
+TEAM_SHEETS = 'team_sheets' # Version namespace bumped by invalidate_sheets()
+
+# Match fields drawn on the sheet; a PATCH touching any of them invalidates it
+SHEET_MATCH_FIELDS = (
+    'name', 'date', 'kickoff_time', 'meet_time', 'location', 'opponent_name', 'home_away',
+    'notes', 'featured_player_id', 'featured_label', 'team_sheet_title', 'team_season_id',
+)
+
+
+def team_sheet_payload(match):
+    """
+    Selection and sheet metadata for a match, as returned by `GET /matches/{id}/team/`
+    and drawn by the server-side sheet renderer.
+    """
+    # Identify current selections
+    selections = TeamSelection.objects.filter(match=match).select_related('player')
+
+    # Use serializer for raw data access if needed, but we can access obj directly
+    # Frontend expects: { periods: { <pNum>: { starters: [{id: 1...}, ...], finishers: [...] } } }
+
+    formatted_periods = {}
+
+    # Group by Period
+    for sel in selections:
+        p_num = str(sel.period)
+        if p_num not in formatted_periods:
+            formatted_periods[p_num] = {'starters': [], 'finishers': []}
+
+        # We need to reconstruct the array where index matches position-1 effectively
+        # But frontend LineupBuilder iterates array: array[index] corresponds to position index+1
+
+        # Determine target array
+        target_key = 'starters' if sel.role == 'Starter' else 'finishers'
+        target_list = formatted_periods[p_num][target_key]
+
+        # Position Number (1-based)
+        # Map to 0-based index
+        # Starters: 1-15 -> 0-14
+        # Finishers: 16+ -> 0+ ?
+        # LineupBuilder.jsx:
+        # pData.starters.forEach((player, index) => newGrid[pNum][index + 1] = player.id)
+        # This implies index 0 -> Pos 1.
+
+        if sel.role == 'Starter':
+             idx = sel.position_number - 1
+        else:
+             idx = sel.position_number - 16 # Assuming finishers start at 16
+
+        # Ensure list is big enough
+        if idx < 0: idx = 0 # Safety
+        while len(target_list) <= idx:
+            target_list.append(None)
+
+        # Store simple player dict or just id? Frontend expects object with .id
+        # LineupBuilder: if (player && player.id) -> assumes object
+        target_list[idx] = {'id': sel.player.id, 'name': sel.player.name}
+
+    # Populate flattened starters/finishers for Period 1 (Legacy/Preview support)
+    period_1 = formatted_periods.get('1', {'starters': [], 'finishers': []})
+    starters = period_1.get('starters', [])
+    finishers = period_1.get('finishers', [])
+
+    # Ensure starters array is padded to 15 for specific UI consumers if needed, 
+    # though the loop above creates sparse arrays or dicts?
+    # actually strict list with None is safer?
+    # The loop above does: target_list.append(None) so it's a list.
+
+    # Helper to safely format time
+    def format_time(t):
+        if not t: return ''
+        if isinstance(t, str):
+            # Should be HH:MM:SS or HH:MM
+            return t[:5] 
+        return t.strftime('%H:%M')
+
+    fixture_info = {
+        'match_date': match.date.strftime('%Y-%m-%d') if match.date else '',
+        'kickoff': format_time(match.kickoff_time),
+        'meet_time': format_time(match.meet_time),
+        'location': match.location,
+        'opponent_name': match.opponent_name,
+        'home_away': match.home_away,
+        'team_name': match.team_season.team.name if match.team_season else 'Team',
+        'notes': match.notes,
+        'featured_player_id': match.featured_player_id,
+        'featured_player_name': match.featured_player.name if match.featured_player else '',
+        'featured_label': match.featured_label,
+        'team_sheet_title': match.team_sheet_title
+    }
+
+    metadata = {
+         'kickoff': fixture_info['kickoff'],
+         'meet_time': fixture_info['meet_time'],
+         'location': fixture_info['location'],
+         'notes': match.notes,
+         'featured_player': match.featured_player.name if match.featured_player else '',
+         'featured_label': match.featured_label,
+         'team_sheet_title': match.team_sheet_title
+    }
+
+    return {
+        'periods': formatted_periods,
+        'starters': starters,
+        'finishers': finishers,
+        'fixture_info': fixture_info,
+        'metadata': metadata,
+        'match_name': match.name
+    }
+
+
+def sheet_inputs(match):
+    """Snapshot of the Match fields a sheet depends on (compare before/after a save)"""
+    return tuple(getattr(match, field) for field in SHEET_MATCH_FIELDS)
+
+
+def _index_version():
+    # Team/season names and headshots are drawn too, but their writes don't
+    # know which matches they touch: key on their versions instead
+    sheets, team_config = namespace_versions(TEAM_SHEETS, TEAM_CONFIG)
+    return f"{sheets}.{team_config}.{player_image_index.version()}"
+
+
+def _index_key(match_id, layout, scale, name_format, version=None):
+    return f"team_sheet:{version or _index_version()}:{match_id}:{layout}:{scale}:{name_format}"
+
+
+def _all_index_keys(match_id):
+    version = _index_version()
+    return [
+        _index_key(match_id, layout, scale, name_format, version)
+        for layout in LAYOUTS for scale in SCALES for name_format in NAME_FORMATS
+    ]
+
+
+def invalidate_sheets(match_ids=None):
+    """
+    Drops rendered sheets for the given matches (index entries and PNGs), or
+    bumps the global version when match_ids is None (e.g. a player was renamed).
+
+    Inside a transaction this runs on commit: dropping the index earlier would
+    let a concurrent request re-render and re-index the old lineup.
+    """
+    if match_ids is not None:
+        match_ids = set(match_ids)
+    transaction.on_commit(lambda: _drop_sheets(match_ids))
+
+
+def _drop_sheets(match_ids):
+    if match_ids is None:
+        bump_version(TEAM_SHEETS)
+        # Files whose sheets didn't change are reused by the next render, so
+        # only clear out ones nothing can still point at
+        prune_sheets()
+        return
+
+    for match_id in match_ids:
+        cache.delete_many(_all_index_keys(match_id))
+        for path in glob.glob(os.path.join(sheet_cache_dir(), f"match-{match_id}-*.png")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass # Already removed by another worker
+
+
+def prune_sheets(max_age=SHEET_INDEX_TTL):
+    """
+    Deletes rendered sheets not written or reused for `max_age` seconds. Index
+    entries live for SHEET_INDEX_TTL from the same moment, so none refers to
+    them any more. Returns the number removed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in glob.glob(os.path.join(sheet_cache_dir(), "match-*.png")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass # Already removed by another worker
+    return removed
+
+
+def match_sheet(match, layout='standard', scale=1, name_format='initial', rerender=False):
+    """
+    Returns (PNG path, digest) for a match's team sheet, rendering only on an
+    index miss (or when `rerender`, e.g. the indexed file was just deleted)
+    """
+    key = _index_key(match.id, layout, scale, name_format)
+    cached = None if rerender else cache.get(key)
+    if cached and os.path.exists(cached[0]):
+        return cached
+
+    path, digest = render_sheet(team_sheet_payload(match), layout, scale, name_format, prefix=f"match-{match.id}")
+    cache.set(key, (path, digest), SHEET_INDEX_TTL)
+    return path, digest
+
+
+def upcoming_matches(days=7):
+    """Uncancelled fixtures from today through the next `days` days that have a lineup"""
+    today = timezone.localdate()
+    return (
+        Match.objects
+        .filter(date__gte=today, date__lte=today + timedelta(days=days), is_cancelled=False, team_selections__isnull=False)
+        .select_related('team_season__team', 'featured_player')
+        .distinct()
+        .order_by('date', 'id')
+    )
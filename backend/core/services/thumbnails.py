@@ -0,0 +1,106 @@
+"""
+Resized player image variants, generated on demand with Pillow.
+
+Sizes are snapped up to a fixed set of buckets so only a handful of variants
+exist per image. Variants are stored in THUMBNAIL_CACHE_DIR under a digest of
+(source path, source mtime, size, format): a changed source gets a new digest,
+so a cached file never goes stale and can be served as immutable.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+THUMBNAIL_SIZES = (64, 128, 256, 512)
+THUMBNAIL_FORMATS = {
+    # format -> (Pillow format, save options, content type)
+    'webp': ('WEBP', {'quality': 82, 'method': 4}, 'image/webp'),
+    'png': ('PNG', {'optimize': True}, 'image/png'),
+}
+DEFAULT_FORMAT = 'webp'
+
+
+class ThumbnailError(Exception):
+    pass
+
+
+def size_bucket(size):
+    """Smallest bucket that fits the requested edge length (capped at the largest)"""
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise ThumbnailError('size must be an integer')
+    return next((bucket for bucket in THUMBNAIL_SIZES if bucket >= size), THUMBNAIL_SIZES[-1])
+
+
+def _static_dir():
+    return os.path.join(settings.BASE_DIR, 'static')
+
+
+def _cache_dir():
+    return getattr(settings, 'THUMBNAIL_CACHE_DIR', None) or os.path.join(settings.BASE_DIR, '.thumbnail_cache')
+
+
+def thumbnail_digest(filepath, size, fmt=DEFAULT_FORMAT):
+    """
+    Content address of a variant. Only needs a stat of the source, so image
+    URLs can carry it without generating anything.
+    """
+    if fmt not in THUMBNAIL_FORMATS:
+        raise ThumbnailError(f"Unsupported format '{fmt}'")
+
+    try:
+        source = safe_join(_static_dir(), filepath)
+        mtime_ns = os.stat(source).st_mtime_ns
+    except (SuspiciousFileOperation, OSError):
+        raise ThumbnailError(f"Image not found: {filepath}")
+
+    key = f"{filepath}:{mtime_ns}:{size_bucket(size)}:{fmt}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def get_thumbnail(filepath, size, fmt=DEFAULT_FORMAT):
+    """
+    Returns (cache file path, digest, content type) for a variant of a static
+    image, generating it on first use.
+    """
+    digest = thumbnail_digest(filepath, size, fmt)
+    pil_format, options, content_type = THUMBNAIL_FORMATS[fmt]
+
+    cache_dir = _cache_dir()
+    # Shard by digest prefix to keep directories small
+    target = os.path.join(cache_dir, digest[:2], f"{digest}.{fmt}")
+    if os.path.exists(target):
+        return target, digest, content_type
+
+    edge = size_bucket(size)
+    try:
+        source = Image.open(safe_join(_static_dir(), filepath))
+    except (UnidentifiedImageError, OSError):
+        raise ThumbnailError(f"Not an image: {filepath}")
+
+    with source as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        # Never upscale: a bucket larger than the source keeps the source size
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Write then rename so concurrent requests never serve a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                image.save(tmp, pil_format, **options)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    return target, digest, content_type
@@ -0,0 +1,80 @@
+"""
+Worksheet title index for resolving match names to spreadsheet tabs.
+"""
+
+
+def normalize_title(title):
+    """Case-insensitive, whitespace-collapsed form of a worksheet title or match name"""
+    return ' '.join((title or '').split()).casefold()
+
+
+class WorksheetIndex:
+    """
+    Precomputed lookup of a spreadsheet's worksheets, built from its metadata.
+
+    resolve() tries, in order: exact title, normalized title, then a substring
+    match either way (tab title inside the match name or vice versa). When more
+    than one tab qualifies the pick is deterministic (closest title length, then
+    sheet order) and the candidates are recorded in `ambiguities`.
+    """
+
+    def __init__(self, sheet_properties):
+        # sheet_properties: [{'title': ..., 'sheetId': ..., 'index': ...}, ...] from spreadsheet metadata
+        self._properties = sorted(sheet_properties, key=lambda p: p.get('index', 0))
+        self.titles = [p['title'] for p in self._properties]
+
+        self._by_title = {p['title']: p for p in self._properties}
+        self._by_normalized = {}
+        for props in self._properties:
+            self._by_normalized.setdefault(normalize_title(props['title']), []).append(props['title'])
+
+        self._normalized_titles = [(normalize_title(t), t) for t in self.titles]
+        self._memo = {}
+        self.ambiguities = {} # name -> [candidate titles]
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        return cls([s['properties'] for s in metadata.get('sheets', [])])
+
+    def properties(self, title):
+        """Worksheet properties (sheetId, index, gridProperties...) for an exact title"""
+        return self._by_title.get(title)
+
+    def resolve(self, name):
+        """Returns the worksheet title for a match name, or None"""
+        if name in self._memo:
+            return self._memo[name]
+
+        title = self._resolve(name)
+        self._memo[name] = title
+        return title
+
+    def _resolve(self, name):
+        if not name:
+            return None
+
+        if name in self._by_title:
+            return name
+
+        key = normalize_title(name)
+        normalized = self._by_normalized.get(key)
+        if normalized:
+            return self._pick(name, normalized)
+
+        candidates = [
+            title for norm, title in self._normalized_titles
+            if norm and (key in norm or norm in key)
+        ]
+        if not candidates:
+            return None
+
+        # Prefer the tab whose title is closest in length to the match name
+        # (i.e. the most specific overlap); sheet order breaks ties.
+        candidates.sort(key=lambda t: abs(len(normalize_title(t)) - len(key)))
+        return self._pick(name, candidates)
+
+    def _pick(self, name, candidates):
+        if len(candidates) > 1:
+            self.ambiguities[name] = list(candidates)
+            print(f"  - Ambiguous worksheet for '{name}': {candidates}. Using '{candidates[0]}'.")
+        return candidates[0]
@@ -92,22 +92,20 @@ export default function TeamSheetPreview({ matchId, isOpen, onClose }) {
         
         let isMounted = true;
         const fetchImages = async () => {
-             const newImages = {};
-             // We only care about starters for the pitch view
-             const promises = teamData.starters.map(async (p) => {
-                 if (p && p.name) {
-                     try {
-                         const res = await api.get(`/player-image/${encodeURIComponent(p.name)}`);
-                         if (res.success && res.image_url && !res.image_url.includes('player-silhouette.png')) {
-                             newImages[p.name] = res.image_url;
-                         }
-                     } catch(err) {
-                         // ignore
-                     }
-                 }
-             });
-             await Promise.all(promises);
-             if (isMounted) setPlayerImages(prev => ({...prev, ...newImages}));
+             // We only care about starters for the pitch view; resolve them in one call
+             const names = teamData.starters.filter(p => p && p.name).map(p => p.name);
+             if (names.length === 0) return;
+             try {
+                 // Heads are drawn at 60px; a 128px thumbnail keeps exports sharp
+                 const res = await api.post('/player-images/', { names, size: 128 });
+                 const newImages = {};
+                 Object.entries(res.images || {}).forEach(([name, image]) => {
+                     if (image.found) newImages[name] = image.thumb_url || image.image_url;
+                 });
+                 if (isMounted) setPlayerImages(prev => ({...prev, ...newImages}));
+             } catch(err) {
+                 // ignore
+             }
         };
         
         fetchImages();
@@ -123,10 +121,10 @@ export default function TeamSheetPreview({ matchId, isOpen, onClose }) {
         let isMounted = true;
         const loadFeatured = async () => {
             try {
-                const res = await api.get(`/player-image/${encodeURIComponent(featuredPlayer)}`);
+                const res = await api.get(`/player-image/${encodeURIComponent(featuredPlayer)}`, { params: { size: 256 } });
                 if (res.success && res.image_url && !res.image_url.includes('player-silhouette.png')) {
                     // Fetch as blob to convert to DataURL (for html-to-image compatibility)
-                    const imgRes = await fetch(res.image_url);
+                    const imgRes = await fetch(res.thumb_url || res.image_url);
                     const blob = await imgRes.blob();
                     
                     if (!blob.type.startsWith('image/') || blob.type.includes('svg')) throw new Error('Invalid image');
@@ -184,6 +182,34 @@ export default function TeamSheetPreview({ matchId, isOpen, onClose }) {
         }
     };
     
+    // Quick download: rendered on the server from the saved selection, so it skips
+    // loading every image in the browser (preview-only edits aren't included)
+    const [isServerExporting, setIsServerExporting] = useState(false);
+    const handleServerExport = async () => {
+        setIsServerExporting(true);
+        try {
+            const blob = await playerService.getMatchSheet(matchId, {
+                format: template.toLowerCase(),
+                scale: downloadSize,
+                names: nameFormat
+            });
+            const meta = teamData?.fixture_info || {};
+            const teamName = (meta.team_name || 'Team').replace(/[^a-z0-9]/gi, '-').toLowerCase();
+            const opponentName = (meta.opponent_name || 'Opponent').replace(/[^a-z0-9]/gi, '-').toLowerCase();
+            const url = URL.createObjectURL(blob);
+            const link = document.createElement('a');
+            link.download = `${teamName}-vs-${opponentName}-${meta.match_date || 'date'}.png`;
+            link.href = url;
+            link.click();
+            URL.revokeObjectURL(url);
+        } catch (err) {
+            console.error('Server export failed', err);
+            alert('Failed to generate image');
+        } finally {
+            setIsServerExporting(false);
+        }
+    };
+
     // Validation for Export
     const isExportReady = featuredPlayer && kitText;
 
@@ -247,6 +273,13 @@ export default function TeamSheetPreview({ matchId, isOpen, onClose }) {
                             >
                                 <Download size={20} /> Download PNG
                             </button>
+                            <button 
+                                onClick={handleServerExport}
+                                disabled={isServerExporting}
+                                className="w-full font-semibold py-2 px-4 rounded-lg border border-slate-300 text-slate-700 hover:bg-slate-100 flex items-center justify-center gap-2 disabled:opacity-50"
+                            >
+                                <Download size={16} /> {isServerExporting ? 'Rendering...' : 'Quick Download (saved sheet)'}
+                            </button>
                         </div>
                     ) : (
                         <div className="text-red-500 text-sm">Failed to load data</div>
@@ -26,8 +26,17 @@ const adminService = {
         return res;
     },
     syncContext: async (id) => {
+        // Sync runs as a background job: queue it, then poll until it finishes
         const res = await api.post(`/team-seasons/${id}/sync/`);
-        return res;
+        let job = await api.get(`/sync-jobs/${res.job_id}/`);
+        while (job.status === 'queued' || job.status === 'running') {
+            await new Promise((resolve) => setTimeout(resolve, 2000));
+            job = await api.get(`/sync-jobs/${res.job_id}/`);
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Sync failed');
+        }
+        return job;
     },
     getTeams: async () => {
         const res = await api.get('/teams/');
@@ -77,8 +86,14 @@ export default function AdminSettings() {
         mutationFn: (id) => adminService.syncContext(id),
         onMutate: (id) => setSyncingId(id),
         onSettled: () => setSyncingId(null),
-        onSuccess: () => {
-            alert("Sync Complete!");
+        onSuccess: (job) => {
+            // Match names that fit more than one worksheet (the first candidate was used)
+            const ambiguous = Object.entries(
+                Object.assign({}, ...(job.stages || []).map((stage) => stage.ambiguities || {}))
+            ).map(([name, candidates]) => `${name}: ${candidates.join(', ')}`);
+            alert(ambiguous.length
+                ? `Sync Complete!\n\nAmbiguous worksheets (first tab used):\n${ambiguous.join('\n')}`
+                : "Sync Complete!");
             queryClient.invalidateQueries(['matches']);
         },
         onError: (err) => {
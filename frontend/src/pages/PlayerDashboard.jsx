@@ -4,7 +4,7 @@ import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { playerService } from '../services/players';
 import { spondService } from '../services/spond';
 import api from '../services/api';
-import { ArrowLeft, Save, Trash2, Calendar, Link as LinkIcon } from 'lucide-react';
+import { ArrowLeft, Save, Trash2, Calendar, Link as LinkIcon, BarChart3 } from 'lucide-react';
 
 export default function PlayerDashboard() {
     const { playerId } = useParams();
@@ -17,6 +17,13 @@ export default function PlayerDashboard() {
         queryFn: () => playerService.getById(playerId)
     });
 
+    // Fetch per-season stats
+    const { data: statsData } = useQuery({
+        queryKey: ['player-stats', playerId],
+        queryFn: () => playerService.getStats(playerId)
+    });
+    const seasonStats = statsData?.seasons || [];
+
     const [formData, setFormData] = useState({
         name: '',
         position: '',
@@ -124,6 +131,47 @@ export default function PlayerDashboard() {
                     <ArrowLeft size={18} /> Back
                 </button>
 
+                {seasonStats.length > 0 && (
+                    <div className="bg-slate-800 rounded-xl border border-slate-700 p-6 shadow-xl">
+                        <div className="flex items-center gap-2 mb-4">
+                            <BarChart3 className="text-blue-500" size={20} />
+                            <h3 className="font-bold text-lg text-white">Season Stats</h3>
+                        </div>
+                        <div className="overflow-x-auto">
+                            <table className="w-full text-sm">
+                                <thead>
+                                    <tr className="text-slate-400 text-left border-b border-slate-700">
+                                        <th className="py-2 pr-4">Season</th>
+                                        <th className="py-2 pr-4">Apps</th>
+                                        <th className="py-2 pr-4">Starts</th>
+                                        <th className="py-2 pr-4">Finishes</th>
+                                        <th className="py-2 pr-4">Avail %</th>
+                                        <th className="py-2 pr-4">Tries</th>
+                                        <th className="py-2 pr-4">Points</th>
+                                        <th className="py-2">Kicking</th>
+                                    </tr>
+                                </thead>
+                                <tbody>
+                                    {seasonStats.map(s => (
+                                        <tr key={s.team_season_id} className="border-b border-slate-700/50 text-slate-200">
+                                            <td className="py-2 pr-4">{s.team_season_name}</td>
+                                            <td className="py-2 pr-4">{s.appearances}</td>
+                                            <td className="py-2 pr-4">{s.starts}</td>
+                                            <td className="py-2 pr-4">{s.finishes}</td>
+                                            <td className="py-2 pr-4">{s.availability_rate ?? '-'}{s.availability_rate != null && '%'}</td>
+                                            <td className="py-2 pr-4">{s.tries}</td>
+                                            <td className="py-2 pr-4">{s.points}</td>
+                                            <td className="py-2">
+                                                {s.kicks_attempts > 0 ? `${s.kicks_success}/${s.kicks_attempts} (${s.kick_percentage}%)` : '-'}
+                                            </td>
+                                        </tr>
+                                    ))}
+                                </tbody>
+                            </table>
+                        </div>
+                    </div>
+                )}
+
                 <div className="bg-slate-800 rounded-xl border border-slate-700 p-6 shadow-xl">
                     <h1 className="text-2xl font-bold mb-6 flex items-center gap-3">
                         Edit Player
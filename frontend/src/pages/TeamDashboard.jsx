@@ -5,7 +5,7 @@ import { teamService } from '../services/teams';
 import { seasonService, fixtureService } from '../services/fixtures';
 import { playerService } from '../services/players';
 import { spondService } from '../services/spond';
-import { Calendar, Users, Settings, ChevronDown, ListFilter, Shield, GitMerge, Link as LinkIcon, AlertCircle, Search } from 'lucide-react';
+import { Calendar, Users, Settings, ChevronDown, ListFilter, Shield, GitMerge, Link as LinkIcon, AlertCircle, Search, RefreshCw } from 'lucide-react';
 import { format } from 'date-fns';
 import AddFixtureModal from '../components/AddFixtureModal';
 import MergePlayersModal from '../components/MergePlayersModal';
@@ -23,6 +23,7 @@ export default function TeamDashboard() {
   const [isMergeModalOpen, setIsMergeModalOpen] = useState(false);
   const [isEditTeamOpen, setIsEditTeamOpen] = useState(false);
   const [isLinkPlayersOpen, setIsLinkPlayersOpen] = useState(false);
+  const [isSpondSyncing, setIsSpondSyncing] = useState(false);
   
   const view = searchParams.get('view') || 'overview';
   const showLeft = searchParams.get('showLeft') === 'true';
@@ -65,6 +66,20 @@ export default function TeamDashboard() {
   const team = teamData;
   const selectedContext = activeSeason; // Driven by context now
 
+  const handleSpondSeasonSync = async () => {
+      if (!selectedContext) return;
+      setIsSpondSyncing(true);
+      try {
+          const result = await spondService.syncSeason(selectedContext.id);
+          const failed = (result.matches || []).filter(m => m.status === 'failed');
+          alert(result.message + (failed.length ? `\n\nFailed: ${failed.map(m => `${m.name} (${m.error})`).join(', ')}` : ''));
+      } catch (err) {
+          alert("Failed to sync: " + (err.response?.data?.error || err.message));
+      } finally {
+          setIsSpondSyncing(false);
+      }
+  };
+
   // New: Fetch Stats Leaderboards
   const { data: statsData } = useQuery({
       queryKey: ['team-stats', selectedContext?.id],
@@ -334,12 +349,24 @@ export default function TeamDashboard() {
                                 <h2 className="font-bold flex items-center gap-2">
                                     <Calendar size={18} className="text-blue-400" /> Fixtures ({filteredFixtures.length})
                                 </h2>
-                                <button 
-                                    onClick={() => setIsAddFixtureOpen(true)}
-                                    className="text-xs bg-blue-600 hover:bg-blue-500 px-3 py-1.5 rounded text-white font-medium flex items-center gap-1"
-                                >
-                                    + Add Fixture
-                                </button>
+                                <div className="flex items-center gap-2">
+                                    {team?.spond_group_id && (
+                                        <button 
+                                            onClick={handleSpondSeasonSync}
+                                            disabled={isSpondSyncing}
+                                            className="text-xs bg-blue-900/30 hover:bg-blue-900/50 text-blue-300 border border-blue-800/50 px-3 py-1.5 rounded font-medium flex items-center gap-1.5 transition-colors disabled:opacity-50"
+                                            title="Sync availability for all upcoming linked fixtures"
+                                        >
+                                            <RefreshCw size={14} className={isSpondSyncing ? 'animate-spin' : ''} /> Sync Spond
+                                        </button>
+                                    )}
+                                    <button 
+                                        onClick={() => setIsAddFixtureOpen(true)}
+                                        className="text-xs bg-blue-600 hover:bg-blue-500 px-3 py-1.5 rounded text-white font-medium flex items-center gap-1"
+                                    >
+                                        + Add Fixture
+                                    </button>
+                                </div>
                             </div>
                             
                             {/* Filters Toolbar */}
@@ -12,8 +12,11 @@ export const seasonService = {
 };
 
 export const fixtureService = {
-  // Get fixtures, optionally filtered by team_season_id
-  getFixtures: (teamSeasonId) => api.get('/matches', { params: { team_season_id: teamSeasonId } }),
+  // Get fixtures, optionally filtered by team_season_id.
+  // Pass fields (e.g. ['id', 'name', 'date']) for a slim payload.
+  getFixtures: (teamSeasonId, fields) => api.get('/matches', {
+    params: { team_season_id: teamSeasonId, ...(fields ? { fields: fields.join(',') } : {}) }
+  }),
   
   // Get DB Matches specific endpoint (Legacy alias -> same as getFixtures)
   getDbMatches: (teamSeasonId) => api.get('/matches', { params: { team_season_id: teamSeasonId } }),
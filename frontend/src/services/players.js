@@ -14,11 +14,18 @@ export const playerService = {
   }, 
 
   getById: (id) => api.get(`/players/${id}`),
+
+  // Per-season appearances, availability and scoring for a player
+  getStats: (id) => api.get(`/players/${id}/stats/`),
  
 
   // Get specific team selection for a match
   getMatchSelection: (matchId) => api.get(`/matches/${matchId}/team`),
 
+  // Server-rendered team sheet PNG for the saved selection (resolves to a Blob)
+  getMatchSheet: (matchId, { format = 'standard', scale = 1, names = 'initial' } = {}) =>
+    api.get(`/matches/${matchId}/sheet.png`, { params: { format, scale, names }, responseType: 'blob' }),
+
   // Update match selection (save lineup)
   saveMatchSelection: (matchId, selectionData) => api.post(`/matches/${matchId}/team`, selectionData),
 
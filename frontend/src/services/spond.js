@@ -19,5 +19,8 @@ export const spondService = {
   linkMatch: (matchId, data) => api.post(`/matches/${matchId}/link-spond/`, data),
 
   // Sync Match Availability
-  syncMatch: (matchId) => api.post(`/matches/${matchId}/spond-sync/`)
+  syncMatch: (matchId) => api.post(`/matches/${matchId}/spond-sync/`),
+
+  // Sync availability for every upcoming linked match in a team season
+  syncSeason: (teamSeasonId) => api.post(`/team-seasons/${teamSeasonId}/spond-sync/`)
 };